@@ -0,0 +1,6 @@
+"""
+Микробенчмарки клиента.
+
+Запуск из корня репозитория: python -m benchmarks.<имя_модуля>.
+Бенчмарки не обращаются к Api.
+"""
@@ -0,0 +1,88 @@
+"""
+Хранение последних свечей по большому набору инструментов.
+
+Для SYMBOLS инструментов хранится WINDOW последних свечей M1.
+Каждый тик - ответ get_candles из одной свечи по каждому
+инструменту: в половине случаев обновляется формирующаяся
+свеча, в половине добавляется новая. После записи стратегия
+считает среднюю цену закрытия по последним PERIOD свечам.
+
+Сравниваются список IntraDayCandle, копируемый при каждом
+обновлении, и кольцевые буферы BarBuffers.
+Требуется numpy: poetry install --with frames.
+"""
+
+import time
+from datetime import UTC, datetime, timedelta
+
+from finam_rest_client.clients.bars import BarBuffers
+from finam_rest_client.models.response_models import IntraDayCandle
+
+SYMBOLS = 2_000
+WINDOW = 500
+TICKS = 20
+PERIOD = 100
+
+
+def make_candle(minute: int) -> IntraDayCandle:
+    """Свеча M1 с началом через minute минут."""
+    price = {"num": 25065 + minute, "scale": 2}
+    moment = datetime(2024, 1, 2, 7, tzinfo=UTC) + timedelta(minutes=minute)
+    return IntraDayCandle.model_validate(
+        {
+            "timestamp": moment.isoformat(),
+            "open": price,
+            "close": price,
+            "high": price,
+            "low": price,
+            "volume": minute,
+        }
+    )
+
+
+def with_lists(ticks: list[list[IntraDayCandle]]) -> float:
+    """Списки свечей с копированием при обновлении (секунды)."""
+    history = [make_candle(minute) for minute in range(WINDOW)]
+    series = {symbol: list(history) for symbol in range(SYMBOLS)}
+    started = time.perf_counter()
+    for tick in ticks:
+        for symbol in range(SYMBOLS):
+            bars = list(series[symbol])
+            if bars[-1].timestamp == tick[0].timestamp:
+                bars[-1] = tick[0]
+            else:
+                bars = bars[1:] + tick
+            series[symbol] = bars
+            closes = [
+                bar.close.num / 10**bar.close.scale for bar in bars[-PERIOD:]
+            ]
+            sum(closes) / PERIOD
+    return time.perf_counter() - started
+
+
+def with_buffers(ticks: list[list[IntraDayCandle]]) -> float:
+    """Кольцевые буферы (секунды)."""
+    history = [make_candle(minute) for minute in range(WINDOW)]
+    buffers = BarBuffers(WINDOW)
+    for symbol in range(SYMBOLS):
+        buffers.buffer("TQBR", str(symbol), "M1").extend(history)
+    started = time.perf_counter()
+    for tick in ticks:
+        for symbol in range(SYMBOLS):
+            buffer = buffers.buffer("TQBR", str(symbol), "M1")
+            buffer.extend(tick)
+            buffer.window(PERIOD)["close"].mean()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    ticks = [[make_candle(WINDOW - 1 + (i + 1) // 2)] for i in range(TICKS)]
+    total = SYMBOLS * TICKS
+    for title, run in (("списки", with_lists), ("BarBuffers", with_buffers)):
+        duration = run(ticks)
+        print(f"{title:>10}: {duration / total * 1e6:8.2f} мкс на обновление")
+
+
+if __name__ == "__main__":
+    main()
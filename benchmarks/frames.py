@@ -0,0 +1,87 @@
+"""
+Преобразование ответов в таблицы pandas и Polars.
+
+Сравнивается построение таблицы из словарей model_dump
+(по строке на модель) и по столбцам (to_pandas, to_polars)
+для CANDLES дневных свечей и SECURITIES инструментов.
+Требуются pandas и polars: poetry install --with frames.
+"""
+
+import json
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+
+import pandas as pd
+import polars as pl
+
+from finam_rest_client.models.response_models import DayCandles, Securities
+
+from .validation_offload import make_response
+
+CANDLES = 100_000
+SECURITIES = 20_000
+REPEAT = 5
+
+
+def make_candles() -> DayCandles:
+    """Ответ DayCandles."""
+    price = {"num": 25065, "scale": 2}
+    start = date(2000, 1, 1)
+    candles = [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "open": price,
+            "close": price,
+            "high": price,
+            "low": price,
+            "volume": i,
+        }
+        for i in range(CANDLES)
+    ]
+    return DayCandles.model_validate_json(
+        json.dumps({"data": {"candles": candles}})
+    )
+
+
+def measure(convert: Callable[[], object]) -> float:
+    """Минимальная длительность преобразования (мс)."""
+    durations = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        convert()
+        durations.append(time.perf_counter() - started)
+    return min(durations) * 1e3
+
+
+def cases(response, rows: list) -> list[tuple[str, Callable[[], object]]]:
+    """Способы преобразования ответа."""
+    return [
+        (
+            "pandas, model_dump",
+            lambda: pd.DataFrame([row.model_dump() for row in rows]),
+        ),
+        ("pandas, to_pandas", response.to_pandas),
+        (
+            "polars, model_dump",
+            lambda: pl.DataFrame([row.model_dump() for row in rows]),
+        ),
+        ("polars, to_polars", response.to_polars),
+    ]
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    candles = make_candles()
+    securities = Securities.model_validate_json(make_response(SECURITIES))
+    for name, response, rows in (
+        (f"{CANDLES} свечей", candles, candles.data.candles),
+        (f"{SECURITIES} инструментов", securities, securities.data.securities),
+    ):
+        print(name)
+        for title, convert in cases(response, rows):
+            print(f"{title:>20}: {measure(convert):8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
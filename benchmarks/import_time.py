@@ -0,0 +1,66 @@
+"""
+Время импорта пакета.
+
+Каждый импорт выполняется в отдельном интерпретаторе, берется
+лучшее время из нескольких запусков. Если время превышает
+бюджет, бенчмарк завершается с кодом 1, что позволяет
+использовать его для защиты от регрессий.
+"""
+
+import subprocess
+import sys
+
+REPEAT = 7
+
+# Импорт и бюджет на него в миллисекундах.
+BUDGETS = {
+    "import finam_rest_client": 50,
+    "from finam_rest_client import FinamRestClient": 350,
+    "from finam_rest_client.models.response_models import Securities": 250,
+}
+
+SCRIPT = """
+import time
+started = time.perf_counter()
+{statement}
+print(time.perf_counter() - started)
+"""
+
+
+def measure(statement: str) -> float:
+    """
+    Время импорта в свежем интерпретаторе.
+
+    :param statement: Инструкция импорта.
+
+    :return: Лучшее время в миллисекундах.
+    """
+    script = SCRIPT.format(statement=statement)
+    timings = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", script],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(REPEAT)
+    ]
+    return min(timings) * 1000
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    failed = False
+    for statement, budget in BUDGETS.items():
+        elapsed = measure(statement)
+        status = "ok" if elapsed <= budget else "превышен бюджет"
+        failed |= elapsed > budget
+        print(f"{elapsed:8.1f} мс (бюджет {budget} мс) {status}: {statement}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
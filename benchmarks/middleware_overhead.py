@@ -0,0 +1,90 @@
+"""
+Накладные расходы цепочки middleware.
+
+Измеряется BaseObjClient._execute_request с пустой цепочкой
+и с цепочками из обработчиков, которые только передают запрос
+дальше. Для сравнения приводится вызов execute_request с разбором
+ответа без BaseObjClient. Запросы не отправляются в сеть:
+execute_request возвращает готовый ответ.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+
+from finam_rest_client import FinamRestClient
+from finam_rest_client.clients.middleware import (
+    ApiRequest,
+    ApiResponse,
+    Handler,
+    Middleware,
+)
+from finam_rest_client.clients.orders.base import GetOrders
+from finam_rest_client.models.response_models import Stops
+
+NUMBER = 50_000
+RESPONSE = '{"data": {"clientId": "C1", "stops": []}}'
+PARAMS = {"ClientId": "C1"}
+
+
+class OfflineClient(FinamRestClient):
+    """Клиент, возвращающий готовый ответ без запроса к Api."""
+
+    async def execute_request(self, *args, **kwargs) -> tuple[str, bool]:
+        """Готовый ответ."""
+        return RESPONSE, True
+
+
+class PassThrough(Middleware):
+    """Обработчик, передающий запрос дальше без изменений."""
+
+    async def __call__(
+        self, request: ApiRequest, call_next: Handler
+    ) -> ApiResponse:
+        """Передача запроса следующему обработчику."""
+        return await call_next(request)
+
+
+async def measure(func: Callable[[], Awaitable[object]]) -> float:
+    """Лучшее из пяти измерений, микросекунды на запрос."""
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(NUMBER):
+            await func()
+        best = min(best, time.perf_counter() - started)
+    return best / NUMBER * 1e6
+
+
+async def main() -> None:
+    """Запуск бенчмарка."""
+    client = OfflineClient("token")
+
+    async def direct() -> None:
+        response, _ = await client.execute_request(
+            "get", "/stops", params=PARAMS
+        )
+        Stops.model_validate_json(response)
+
+    cases: list[tuple[str, Callable[[], Awaitable[object]]]] = [
+        ("execute_request", direct)
+    ]
+    for size in (0, 1, 5):
+        chained = OfflineClient(
+            "token", middlewares=[PassThrough() for _ in range(size)]
+        )
+        obj = GetOrders(chained, chained._stops, Stops)
+        func = partial(obj._execute_request, Stops, params=PARAMS)
+        cases.append((f"обработчиков: {size}", func))
+    results = {name: await measure(func) for name, func in cases}
+    empty = results["обработчиков: 0"]
+    for name, result in results.items():
+        print(
+            f"{name:>16}: {result:8.2f} мкс/запрос "
+            f"({result - empty:+.2f} к пустой цепочке)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
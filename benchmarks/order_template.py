@@ -0,0 +1,59 @@
+"""
+Сравнение подготовки тела запроса на создание заявки.
+
+Измеряется время от получения цены до готового тела запроса
+(без сети): путь FinamRestClient.create_order (model_validate,
+create_data и json.dumps в aiohttp) и OrderTemplate.build_body.
+"""
+
+import json
+import timeit
+from decimal import Decimal
+
+from finam_rest_client import FinamRestClient
+from finam_rest_client.clients.orders.base import CreateOrder
+from finam_rest_client.models.request_models import CreateOrderRequest
+
+NUMBER = 20_000
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    client = FinamRestClient("token")
+    template = client.create_order_template(
+        client_id="CLIENT",
+        security_board="TQBR",
+        security_code="SBER",
+        buy_sell="Buy",
+        use_condition=True,
+        condition_type="LastUp",
+        condition_price="250.5",
+    )
+    price = Decimal("250.55")
+
+    def full() -> bytes:
+        data = dict(
+            client_id="CLIENT",
+            security_board="TQBR",
+            security_code="SBER",
+            buy_sell="Buy",
+            quantity=10,
+            use_credit=True,
+            price=price,
+            property="PutInQueue",
+        )
+        data["condition"] = dict(type="LastUp", price="250.5", time=None)
+        model = CreateOrderRequest.model_validate(data)
+        return json.dumps(CreateOrder.create_data(model)).encode()
+
+    def prepared() -> bytes:
+        return template.build_body(10, price)
+
+    assert json.loads(full()) == json.loads(prepared())
+    for name, func in (("create_order", full), ("template", prepared)):
+        best = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:>14}: {best / NUMBER * 1e6:8.2f} мкс/заявка")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Сравнение подготовки параметров запроса свечей.
+
+Сравнивается путь FinamRestClient.get_candles (model_validate
+и create_data на каждый запрос) с PreparedCandlesQuery.build_params.
+"""
+
+import timeit
+from datetime import UTC, datetime, timedelta
+
+from finam_rest_client import FinamRestClient
+from finam_rest_client.clients.candles import Candles
+from finam_rest_client.models.request_models import IntraDayCandlesRequest
+
+NUMBER = 20_000
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    client = FinamRestClient("token")
+    candles = Candles(client)
+    query = client.prepare_candles("SBER", "TQBR", "M1")
+    to = datetime.now(UTC)
+    from_ = to - timedelta(hours=1)
+
+    def full() -> None:
+        params = dict(
+            security_board="TQBR",
+            security_code="SBER",
+            count=None,
+            time_frame="M1",
+            from_=from_,
+            to=to,
+        )
+        model = IntraDayCandlesRequest.model_validate(params)
+        candles.create_data(model)
+
+    def prepared() -> None:
+        query.build_params(from_=from_, to=to)
+
+    assert query.build_params(from_=from_, to=to) == candles.create_data(
+        IntraDayCandlesRequest(
+            security_board="TQBR",
+            security_code="SBER",
+            time_frame="M1",
+            from_=from_,
+            to=to,
+        )
+    )
+    for name, func in (("model_validate", full), ("prepared", prepared)):
+        best = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:>16}: {best / NUMBER * 1e6:8.2f} мкс/запрос")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Воспроизведение записанной нагрузки.
+
+Запросы из файла записи (FinamRestClient(record_to=...))
+отправляются через клиента в записанные моменты, ответы
+выдает ReplayTransport без обращения к Api. Выводятся
+процентили длительности запросов, то есть накладные расходы
+клиента и его middleware при реальной форме нагрузки.
+
+Запуск: python -m benchmarks.replay <файл записи> [скорость]
+Скорость 0 - отправить все запросы сразу и отвечать без задержки.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from finam_rest_client import FinamRestClient
+from finam_rest_client.clients.recording import ReplayTransport, replay_traffic
+
+
+async def main(path: str, speed: float | None) -> None:
+    """Запуск бенчмарка."""
+    client = FinamRestClient("", middlewares=[ReplayTransport(path, speed)])
+    started = time.perf_counter()
+    results = await replay_traffic(client, path, speed)
+    elapsed = time.perf_counter() - started
+    durations = sorted(duration * 1e3 for duration, _ in results)
+    errors = sum(error is not None for _, error in results)
+    print(f"запросов: {len(results)}, ошибок: {errors}, за {elapsed:.3f} с")
+    if len(durations) > 1:
+        quantiles = statistics.quantiles(durations, n=100, method="inclusive")
+        for name, value in (
+            ("p50", quantiles[49]),
+            ("p95", quantiles[94]),
+            ("p99", quantiles[98]),
+            ("max", durations[-1]),
+        ):
+            print(f"{name:>4}: {value:8.3f} мс")
+
+
+if __name__ == "__main__":
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    asyncio.run(main(sys.argv[1], speed or None))
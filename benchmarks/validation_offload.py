@@ -0,0 +1,94 @@
+"""
+Остановка событийного цикла при разборе большого ответа.
+
+Ответ Securities из SECURITIES инструментов разбирается в цикле,
+в пуле потоков и в пуле процессов (ValidationOffload). Параллельно
+работает задача, которая каждую миллисекунду отмечает время:
+максимальный интервал между отметками показывает, насколько
+долго цикл не мог выполнять другие корутины (например, заявки).
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from finam_rest_client.clients.validation import ValidationOffload
+from finam_rest_client.models.response_models import Securities
+
+SECURITIES = 20_000
+REPEAT = 5
+
+
+def make_response(count: int = SECURITIES) -> str:
+    """Текст ответа Securities из count инструментов."""
+    security = {
+        "code": "SBER",
+        "board": "TQBR",
+        "market": "Stock",
+        "decimals": 2,
+        "lotSize": 10,
+        "minStep": 1,
+        "currency": "RUB",
+        "shortName": "Сбербанк",
+        "properties": 0,
+        "timeZoneName": "Russian Standard Time",
+        "bpCost": 1,
+        "accruedInterest": 0,
+        "priceSign": "Positive",
+        "ticker": "SBER",
+        "lotDivider": 1,
+    }
+    return json.dumps({"data": {"securities": [security] * count}})
+
+
+async def heartbeat(gaps: list[float], stop: asyncio.Event) -> None:
+    """Отметки времени каждую миллисекунду."""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def measure(validation: ValidationOffload, text: str) -> tuple:
+    """Длительность разбора и максимальная остановка цикла (мс)."""
+    durations, stalls = [], []
+    for _ in range(REPEAT):
+        gaps: list[float] = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(heartbeat(gaps, stop))
+        await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        await validation.validate(Securities, text)
+        durations.append(time.perf_counter() - started)
+        stop.set()
+        await task
+        stalls.append(max(gaps))
+    return min(durations) * 1e3, min(stalls) * 1e3
+
+
+async def main() -> None:
+    """Запуск бенчмарка."""
+    text = make_response()
+    print(f"размер ответа: {len(text) / 1e6:.1f} млн символов")
+    with (
+        ThreadPoolExecutor(1) as threads,
+        ProcessPoolExecutor(1) as processes,
+    ):
+        processes.submit(int).result()
+        for name, validation in (
+            ("в цикле", ValidationOffload(threads, len(text) + 1)),
+            ("пул потоков", ValidationOffload(threads)),
+            ("пул процессов", ValidationOffload(processes)),
+        ):
+            duration, stall = await measure(validation, text)
+            print(
+                f"{name:>14}: разбор {duration:8.1f} мс, "
+                f"остановка цикла {stall:8.1f} мс"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
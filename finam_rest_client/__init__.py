@@ -2,6 +2,29 @@
 Клиент для взаимодействия с RestApi Finam.
 
 https://finamweb.github.io/trade-api-docs/category/rest-api
+
+Клиенты импортируются лениво, при первом обращении к ним.
 """
 
-from .clients import FinamRestClient
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .clients import FinamRestClient, SyncFinamRestClient
+
+__all__ = ["FinamRestClient", "SyncFinamRestClient"]
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый импорт клиентов."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import clients
+
+    value = getattr(clients, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Список атрибутов модуля с учетом ленивых."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,5 @@
+"""Запуск консольных команд: python -m finam_rest_client."""
+
+from finam_rest_client.cli import main
+
+raise SystemExit(main())
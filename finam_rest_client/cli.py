@@ -0,0 +1,522 @@
+"""
+Консольные команды клиента.
+
+Запуск: python -m finam_rest_client <команда> [параметры].
+Токен передается параметром --token или переменной окружения
+FINAM_TOKEN.
+
+Команды выгрузки (candles, securities, snapshot) пишут таблицы
+в каталог --output в формате --format по мере получения данных,
+поэтому в памяти одновременно находятся только ответы
+обрабатываемых запросов. В форматах arrow и parquet свечи
+и инструменты записываются колоночными пакетами (см. columnar),
+цены - столбцами мантиссы <поле>_num и степени <поле>_scale.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from collections.abc import Sequence
+from datetime import date
+
+from pydantic import BaseModel
+
+from finam_rest_client.clients import FinamRestClient, RateLimiter
+from finam_rest_client.clients.calendar import SessionCalendars
+from finam_rest_client.clients.columnar import (
+    COLUMNAR_FORMATS,
+    candles_batch,
+    securities_batch,
+)
+from finam_rest_client.clients.export import (
+    FORMATS,
+    Column,
+    Row,
+    ShardedWriter,
+    format_decimal,
+    model_columns,
+    model_row,
+)
+from finam_rest_client.clients.history import (
+    BulkHistoryJob,
+    Candle,
+    HistoryWindow,
+    JsonLinesWriter,
+)
+from finam_rest_client.clients.windows import INTRADAY_FRAMES
+from finam_rest_client.exceptions import BaseApiException
+from finam_rest_client.models.response_models.candles import DayCandle
+from finam_rest_client.models.response_models.orders.orders import Order
+from finam_rest_client.models.response_models.orders.stops._stops import Stop
+from finam_rest_client.models.response_models.portfolio.content import Content
+from finam_rest_client.models.response_models.portfolio.currencies import (
+    Currency,
+)
+from finam_rest_client.models.response_models.portfolio.money import Money
+from finam_rest_client.models.response_models.portfolio.positions import (
+    Position,
+)
+from finam_rest_client.models.response_models.securities import Security
+
+logger = logging.getLogger("finam_rest_client.cli")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Разбор параметров командной строки."""
+    parser = argparse.ArgumentParser(
+        prog="finam_rest_client", description="Клиент Finam Trade API."
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("FINAM_TOKEN"),
+        help="токен доступа (по умолчанию FINAM_TOKEN)",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="подробный журнал"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    history = commands.add_parser(
+        "history",
+        help="загрузка дневных свечей по всем инструментам",
+        description=(
+            "Загрузка свечей D1 или W1 по инструментам get_securities "
+            "в файлы <board>_<code>.jsonl. Прогресс сохраняется в "
+            "контрольной точке, повторный запуск продолжает загрузку."
+        ),
+    )
+    history.add_argument(
+        "--from", dest="from_", type=date.fromisoformat, required=True
+    )
+    history.add_argument("--to", type=date.fromisoformat, default=None)
+    history.add_argument("--time-frame", choices=("D1", "W1"), default="D1")
+    history.add_argument(
+        "--board", action="append", dest="boards", help="режим торгов"
+    )
+    history.add_argument(
+        "--market", action="append", dest="markets", help="рынок"
+    )
+    history.add_argument("--output", required=True, help="каталог файлов")
+    history.add_argument(
+        "--checkpoint",
+        help="файл контрольной точки (по умолчанию в каталоге --output)",
+    )
+    history.add_argument("--concurrency", type=int, default=8)
+    history.add_argument(
+        "--rate", type=float, default=5.0, help="запросов в секунду"
+    )
+    history.add_argument("--retries", type=int, default=3)
+    history.set_defaults(handler=history_command)
+
+    candles = commands.add_parser(
+        "candles",
+        help="выгрузка свечей",
+        description=(
+            "Выгрузка свечей любого тайм-фрейма по инструментам "
+            "--security или по всем инструментам --board/--market "
+            "в таблицу candles."
+        ),
+    )
+    candles.add_argument(
+        "--from", dest="from_", type=date.fromisoformat, required=True
+    )
+    candles.add_argument("--to", type=date.fromisoformat, default=None)
+    candles.add_argument(
+        "--time-frame",
+        choices=(*INTRADAY_FRAMES, "D1", "W1"),
+        default="D1",
+    )
+    candles.add_argument(
+        "--security",
+        action="append",
+        dest="securities",
+        type=_security,
+        metavar="BOARD:CODE",
+        help="инструмент",
+    )
+    candles.add_argument(
+        "--board", action="append", dest="boards", help="режим торгов"
+    )
+    candles.add_argument(
+        "--market", action="append", dest="markets", help="рынок"
+    )
+    candles.add_argument(
+        "--checkpoint",
+        help=(
+            "файл контрольной точки для продолжения; только для "
+            "форматов csv и jsonl: окно отмечается после записи "
+            "его строк в файл"
+        ),
+    )
+    candles.add_argument("--retries", type=int, default=3)
+    candles.add_argument(
+        "--skip-closed",
+        action="store_true",
+        help=(
+            "не запрашивать внутридневные окна вне торговых дней и "
+            "сессий (календарь строится по истории D1 и H1)"
+        ),
+    )
+    _add_export_arguments(candles)
+    candles.set_defaults(handler=candles_command)
+
+    securities = commands.add_parser(
+        "securities",
+        help="выгрузка справочника инструментов",
+        description="Выгрузка инструментов в таблицу securities.",
+    )
+    securities.add_argument(
+        "--board", action="append", dest="boards", help="режим торгов"
+    )
+    securities.add_argument(
+        "--market", action="append", dest="markets", help="рынок"
+    )
+    _add_export_arguments(securities)
+    securities.set_defaults(handler=securities_command)
+
+    snapshot = commands.add_parser(
+        "snapshot",
+        help="снимок портфелей и заявок",
+        description=(
+            "Выгрузка портфелей, заявок и стоп-заявок счетов в таблицы "
+            "portfolio, positions, currencies, money, orders и stops."
+        ),
+    )
+    snapshot.add_argument(
+        "--client-id",
+        action="append",
+        dest="client_ids",
+        required=True,
+        help="торговый код клиента",
+    )
+    _add_export_arguments(snapshot)
+    snapshot.set_defaults(handler=snapshot_command)
+    return parser
+
+
+def _security(value: str) -> tuple[str, str]:
+    board, sep, code = value.partition(":")
+    if not sep or not board or not code:
+        raise argparse.ArgumentTypeError("ожидается BOARD:CODE")
+    return board, code
+
+
+def _add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", required=True, help="каталог файлов")
+    parser.add_argument("--format", choices=tuple(FORMATS), default="csv")
+    parser.add_argument(
+        "--shard-by",
+        metavar="FIELD",
+        help="поле, по значению которого строки делятся на файлы",
+    )
+    parser.add_argument(
+        "--max-rows", type=int, help="максимальное количество строк в файле"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10_000,
+        help="строк в пакете форматов arrow и parquet",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--rate", type=float, default=5.0, help="запросов в секунду"
+    )
+
+
+#: Столбцы таблицы candles (candle_rows).
+CANDLE_COLUMNS: list[Column] = [
+    ("board", str),
+    ("code", str),
+    ("time", str),
+    ("open", str),
+    ("high", str),
+    ("low", str),
+    ("close", str),
+    ("volume", int),
+]
+
+
+def _account_columns(model: type[BaseModel]) -> list[Column]:
+    columns = model_columns(model)
+    if any(name == "client_id" for name, _ in columns):
+        return columns
+    return [("client_id", str), *columns]
+
+
+#: Столбцы таблиц команды snapshot.
+SNAPSHOT_COLUMNS: dict[str, list[Column]] = {
+    "portfolio": [
+        ("client_id", str),
+        ("equity", str),
+        ("balance", str),
+        *model_columns(Content, "content."),
+    ],
+    **{
+        name: _account_columns(model)
+        for name, model in (
+            ("positions", Position),
+            ("currencies", Currency),
+            ("money", Money),
+            ("orders", Order),
+            ("stops", Stop),
+        )
+    },
+}
+
+
+def _writer(
+    args: argparse.Namespace, name: str, columns: list[Column]
+) -> ShardedWriter:
+    return ShardedWriter(
+        args.output,
+        name,
+        args.format,
+        shard_by=args.shard_by,
+        max_rows=args.max_rows,
+        batch_size=args.batch_size,
+        columns=columns,
+    )
+
+
+def _client(args: argparse.Namespace) -> FinamRestClient:
+    return FinamRestClient(args.token, rate_limiter=RateLimiter(args.rate))
+
+
+async def history_command(args: argparse.Namespace) -> int:
+    """Команда history."""
+    checkpoint = args.checkpoint or os.path.join(args.output, "checkpoint.txt")
+    async with FinamRestClient(
+        args.token, rate_limiter=RateLimiter(args.rate)
+    ) as client:
+        job = BulkHistoryJob(
+            client,
+            args.from_,
+            args.to or date.today(),
+            JsonLinesWriter(args.output),
+            time_frame=args.time_frame,
+            boards=args.boards,
+            markets=args.markets,
+            checkpoint=checkpoint,
+            concurrency=args.concurrency,
+            retries=args.retries,
+        )
+        result = await job.run()
+    print(
+        f"окон: {result.windows}, загружено: {result.done}, "
+        f"пропущено: {result.skipped}, ошибок: {len(result.failed)}"
+    )
+    for window, error in result.failed:
+        print(f"  {window.key}: {error}", file=sys.stderr)
+    return 1 if result.failed else 0
+
+
+def candle_rows(window: HistoryWindow, candles: list[Candle]) -> list[Row]:
+    """
+    Строки таблицы candles.
+
+    :param window: Окно загрузки;
+    :param candles: свечи окна.
+    """
+    return [
+        {
+            "board": window.board,
+            "code": window.code,
+            "time": (
+                candle.date
+                if isinstance(candle, DayCandle)
+                else candle.timestamp
+            ).isoformat(),
+            "open": format_decimal(candle.open),
+            "high": format_decimal(candle.high),
+            "low": format_decimal(candle.low),
+            "close": format_decimal(candle.close),
+            "volume": candle.volume,
+        }
+        for candle in candles
+    ]
+
+
+async def candles_command(args: argparse.Namespace) -> int:
+    """Команда candles."""
+    selected = None if args.securities is None else set(args.securities)
+    columnar = args.format in COLUMNAR_FORMATS
+    with _writer(args, "candles", CANDLE_COLUMNS) as writer:
+
+        def save(window: HistoryWindow, candles: list[Candle]) -> None:
+            if columnar:
+                writer.write_batch(
+                    candles_batch(
+                        candles,
+                        intraday=args.time_frame in INTRADAY_FRAMES,
+                        board=window.board,
+                        code=window.code,
+                    )
+                )
+            else:
+                writer.write(candle_rows(window, candles))
+                # Окно отмечается в контрольной точке после возврата
+                # из save, поэтому его строки должны быть в файле.
+                writer.flush()
+
+        async with _client(args) as client:
+            job = BulkHistoryJob(
+                client,
+                args.from_,
+                args.to or date.today(),
+                save,
+                time_frame=args.time_frame,
+                boards=args.boards,
+                markets=args.markets,
+                security_filter=(
+                    None
+                    if selected is None
+                    else lambda s: (s.board, s.code) in selected
+                ),
+                checkpoint=args.checkpoint,
+                concurrency=args.concurrency,
+                retries=args.retries,
+                calendars=SessionCalendars() if args.skip_closed else None,
+            )
+            result = await job.run()
+    print(
+        f"окон: {result.windows}, загружено: {result.done}, "
+        f"пропущено: {result.skipped}, ошибок: {len(result.failed)}, "
+        f"строк: {writer.rows}, файлов: {len(writer.files)}"
+    )
+    for window, error in result.failed:
+        print(f"  {window.key}: {error}", file=sys.stderr)
+    return 1 if result.failed else 0
+
+
+async def securities_command(args: argparse.Namespace) -> int:
+    """Команда securities."""
+    async with _client(args) as client:
+        response = await client.get_securities(from_api=True)
+    if response.data is None:
+        raise BaseApiException(
+            f"Не удалось получить инструменты: {response.error}."
+        )
+    boards = None if args.boards is None else set(args.boards)
+    markets = None if args.markets is None else set(args.markets)
+    securities = [
+        security
+        for security in response.data.securities
+        if (boards is None or security.board in boards)
+        and (markets is None or security.market.value in markets)
+    ]
+    with _writer(args, "securities", model_columns(Security)) as writer:
+        for start in range(0, len(securities), args.batch_size):
+            chunk = securities[start : start + args.batch_size]
+            if args.format in COLUMNAR_FORMATS:
+                writer.write_batch(securities_batch(chunk))
+            else:
+                writer.write(model_row(security) for security in chunk)
+    print(f"инструментов: {writer.rows}, файлов: {len(writer.files)}")
+    return 0
+
+
+async def snapshot_command(args: argparse.Namespace) -> int:
+    """Команда snapshot."""
+    writers = {
+        name: _writer(args, name, columns)
+        for name, columns in SNAPSHOT_COLUMNS.items()
+    }
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failed = 0
+
+    async def save(client: FinamRestClient, client_id: str) -> None:
+        nonlocal failed
+        async with semaphore:
+            portfolio, orders, stops = await asyncio.gather(
+                client.get_portfolio(client_id),
+                client.get_orders(client_id),
+                client.get_stops(client_id),
+            )
+        for name, response in (
+            ("portfolio", portfolio),
+            ("orders", orders),
+            ("stops", stops),
+        ):
+            if response.data is None:
+                failed += 1
+                logger.error(
+                    "Счет %s, %s: %s.", client_id, name, response.error
+                )
+        if portfolio.data is not None:
+            data = portfolio.data
+            writers["portfolio"].write(
+                [
+                    {
+                        "client_id": client_id,
+                        "equity": f"{data.equity:f}",
+                        "balance": f"{data.balance:f}",
+                        **model_row(data.content, "content."),
+                    }
+                ]
+            )
+            for name in ("positions", "currencies", "money"):
+                writers[name].write(
+                    {"client_id": client_id, **model_row(item)}
+                    for item in getattr(data, name)
+                )
+        if orders.data is not None:
+            writers["orders"].write(
+                {"client_id": client_id, **model_row(order)}
+                for order in orders.data.orders
+            )
+        if stops.data is not None:
+            writers["stops"].write(
+                {"client_id": client_id, **model_row(stop)}
+                for stop in stops.data.stops
+            )
+
+    try:
+        async with _client(args) as client:
+            await asyncio.gather(
+                *(save(client, client_id) for client_id in args.client_ids)
+            )
+    finally:
+        for writer in writers.values():
+            writer.close()
+    print(
+        ", ".join(f"{name}: {writer.rows}" for name, writer in writers.items())
+    )
+    return 1 if failed else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Запуск консольной команды.
+
+    :param argv: Параметры командной строки. По умолчанию sys.argv.
+
+    :return: Код завершения.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error("не указан токен: --token или FINAM_TOKEN")
+    if (
+        args.handler is candles_command
+        and args.checkpoint
+        and args.format in COLUMNAR_FORMATS
+    ):
+        # Файлы Arrow и Parquet читаемы только после закрытия,
+        # отмеченные окна могли бы пропасть при аварийной остановке.
+        parser.error("--checkpoint поддерживается только для csv и jsonl")
+    if args.verbose:
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+        )
+        root = logging.getLogger("finam_rest_client")
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    try:
+        return asyncio.run(args.handler(args))
+    except KeyboardInterrupt:
+        logger.warning("Прервано пользователем.")
+        return 130
@@ -5,6 +5,107 @@
 
 В подмодулях содержатся классы клиентов для доступа к отдельным
 сущностям и базовый класс клиента.
+
+Классы импортируются лениво, при первом обращении к ним:
+импорт пакета не загружает aiohttp и модели.
 """
 
-from ._client import FinamRestClient
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._client import FinamRestClient
+    from .access_token import TokenCache, TokenCheckMode
+    from .bars import BarBuffer, BarBuffers
+    from .base import Lane, LaneOptions
+    from .calendar import SessionCalendar, SessionCalendars
+    from .circuit_breaker import BreakerState, CircuitBreaker, CircuitBreakers
+    from .columnar import ColumnarWriter, candles_batch, securities_batch
+    from .concurrency import AdaptiveConcurrencyLimiter
+    from .export import ShardedWriter, model_columns, model_row
+    from .gaps import find_gaps, plan_gap_requests, repair_gaps
+    from .health import HealthMonitor
+    from .hedging import HedgePolicy
+    from .history import BulkHistoryJob, HistoryCheckpoint
+    from .middleware import (
+        ApiRequest,
+        ApiResponse,
+        CacheMiddleware,
+        MetricsMiddleware,
+        Middleware,
+        RetryMiddleware,
+    )
+    from .pool import ClientPool
+    from .rate_limit import RateLimiter
+    from .recording import ReplayTransport, TrafficRecorder, replay_traffic
+    from .scheduler import PollingScheduler, TradingSession
+    from .sync import SyncFinamRestClient
+    from .universe import BarKey, LastBarTable, UniversePoller
+    from .validation import ValidationOffload
+    from .windows import plan_intraday_windows, plan_windows
+
+_EXPORTS = {
+    "FinamRestClient": "._client",
+    "TokenCache": ".access_token",
+    "TokenCheckMode": ".access_token",
+    "Lane": ".base",
+    "LaneOptions": ".base",
+    "ClientPool": ".pool",
+    "ReplayTransport": ".recording",
+    "TrafficRecorder": ".recording",
+    "replay_traffic": ".recording",
+    "BreakerState": ".circuit_breaker",
+    "CircuitBreaker": ".circuit_breaker",
+    "CircuitBreakers": ".circuit_breaker",
+    "AdaptiveConcurrencyLimiter": ".concurrency",
+    "HealthMonitor": ".health",
+    "HedgePolicy": ".hedging",
+    "BulkHistoryJob": ".history",
+    "HistoryCheckpoint": ".history",
+    "plan_windows": ".windows",
+    "plan_intraday_windows": ".windows",
+    "ShardedWriter": ".export",
+    "SessionCalendar": ".calendar",
+    "SessionCalendars": ".calendar",
+    "ColumnarWriter": ".columnar",
+    "candles_batch": ".columnar",
+    "securities_batch": ".columnar",
+    "model_row": ".export",
+    "model_columns": ".export",
+    "find_gaps": ".gaps",
+    "plan_gap_requests": ".gaps",
+    "repair_gaps": ".gaps",
+    "ApiRequest": ".middleware",
+    "ApiResponse": ".middleware",
+    "Middleware": ".middleware",
+    "CacheMiddleware": ".middleware",
+    "MetricsMiddleware": ".middleware",
+    "RetryMiddleware": ".middleware",
+    "RateLimiter": ".rate_limit",
+    "PollingScheduler": ".scheduler",
+    "TradingSession": ".scheduler",
+    "SyncFinamRestClient": ".sync",
+    "ValidationOffload": ".validation",
+    "BarKey": ".universe",
+    "BarBuffer": ".bars",
+    "BarBuffers": ".bars",
+    "LastBarTable": ".universe",
+    "UniversePoller": ".universe",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый импорт экспортируемых классов."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Список атрибутов модуля с учетом ленивых."""
+    return sorted({*globals(), *__all__})
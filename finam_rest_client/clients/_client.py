@@ -1,9 +1,13 @@
 import asyncio
 import logging
+import os
+import time
+from collections.abc import Iterable
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Literal, Self
 
+from finam_rest_client.exceptions import AuthenticationException
 from finam_rest_client.models.request_models import (
     CancelOrderRequest,
     CancelStopRequest,
@@ -29,12 +33,26 @@ from finam_rest_client.models.response_models import Portfolio as Pf
 from finam_rest_client.models.response_models import Securities as Sec
 from finam_rest_client.models.response_models import Stops as GetStops
 
-from .access_token import AccessToken
-from .base import BaseApiClient
-from .candles import Candles
-from .orders import Orders, Stops
+from .access_token import (
+    DEFAULT_TOKEN_CACHE,
+    AccessToken,
+    TokenCache,
+    TokenCheckMode,
+)
+from .base import BaseApiClient, Lane, LaneOptions
+from .candles import Candles, PreparedCandlesQuery
+from .circuit_breaker import CircuitBreakers
+from .concurrency import AdaptiveConcurrencyLimiter
+from .health import HealthMonitor
+from .hedging import HedgePolicy
+from .middleware import Middleware
+from .orders import Orders, OrderTemplate, Stops
 from .portfolio import Portfolio
+from .rate_limit import RateLimiter
+from .recording import TrafficRecorder
+from .scheduler import PollingScheduler
 from .securities import Securities
+from .validation import ValidationOffload
 
 
 class FinamRestClient(BaseApiClient):
@@ -47,15 +65,85 @@ class FinamRestClient(BaseApiClient):
     Либо можно воспользоваться асинхронным менеджером контекста.
 
     :param token: Токен доступа к Api.
+    :param rate_limiter: Общий ограничитель частоты запросов. Запросы
+      заявок и стоп-заявок обслуживаются в нем в первую очередь.
+    :param lanes: Настройки пулов соединений для полос trading
+      (заявки и стоп-заявки) и data (остальные запросы).
+    :param token_check: Способ проверки токена при входе
+      в менеджер контекста. См. TokenCheckMode.
+    :param token_ttl: Время (секунды), в течение которого успешная
+      проверка токена считается действительной. Пока запись в
+      token_cache действует, проверка при входе пропускается.
+      0 - не использовать кэш.
+    :param token_cache: Кэш проверок токенов. По умолчанию общий
+      для процесса.
+    :param transport: Клиент, сессии которого используются для
+      запросов. См. BaseApiClient и ClientPool.
+    :param timeouts: Время ожидания ответа (секунды) по путям
+      запросов, например {"/public/api/v1/day-candles": 3}.
+      По умолчанию у каждого объекта клиента свое значение.
+    :param circuit_breakers: Автоматические выключатели по семействам
+      запросов (candles, securities, portfolio, orders, stops).
+      Пока выключатель разомкнут, запросы семейства завершаются
+      CircuitOpenException без отправки.
+    :param hedge_policy: Политика дублирующих GET запросов
+      (например, get_portfolio и get_orders перед отправкой заявки).
+      None - запросы не дублируются.
+    :param concurrency_limiter: Адаптивный ограничитель одновременных
+      запросов. Окно уменьшается при ответах 429 и Retry-After
+      и растет при успешных ответах. Текущее окно - его limit.
+    :param middlewares: Цепочка промежуточных обработчиков запросов,
+      например RetryMiddleware, CacheMiddleware, MetricsMiddleware.
+      Первый обработчик выполняется первым.
+    :param record_to: Путь к файлу для записи запросов и ответов
+      (см. TrafficRecorder). Запись ведется после всех обработчиков
+      middlewares. None - не записывать.
+    :param validation: Политика разбора больших ответов
+      (например, get_securities) в пуле потоков или процессов,
+      чтобы не останавливать событийный цикл.
     """
 
     logger = logging.getLogger("finam_rest_client")
     logger.propagate = False
+    warmup_path = AccessToken.path
 
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        lanes: dict[Lane, LaneOptions] | None = None,
+        token_check: TokenCheckMode = TokenCheckMode.separate,
+        token_ttl: float = 0,
+        token_cache: TokenCache | None = None,
+        transport: BaseApiClient | None = None,
+        timeouts: dict[str, float] | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        middlewares: Iterable[Middleware] = (),
+        record_to: str | os.PathLike | None = None,
+        validation: ValidationOffload | None = None,
+    ):
+        self._recorder: TrafficRecorder | None = None
+        if record_to is not None:
+            self._recorder = TrafficRecorder(record_to)
+            middlewares = (*middlewares, self._recorder)
         url = "https://trade-api.finam.ru"
         headers = {"X-Api-Key": token}
-        super().__init__(url, headers)
+        super().__init__(
+            url,
+            headers,
+            rate_limiter=rate_limiter,
+            lanes=lanes,
+            transport=transport,
+            timeouts=timeouts,
+            circuit_breakers=circuit_breakers,
+            hedge_policy=hedge_policy,
+            concurrency_limiter=concurrency_limiter,
+            middlewares=middlewares,
+            validation=validation,
+        )
 
         self._access_token = AccessToken(self)
         self._candles = Candles(self)
@@ -63,15 +151,140 @@ class FinamRestClient(BaseApiClient):
         self._portfolio = Portfolio(self)
         self._orders = Orders(self)
         self._stops = Stops(self)
+        self._scheduler: PollingScheduler | None = None
+        self._health_monitor: HealthMonitor | None = None
+        self._token_check = TokenCheckMode(token_check)
+        self._token_ttl = token_ttl
+        self._token_cache = token_cache or DEFAULT_TOKEN_CACHE
+        self._token_task: asyncio.Task | None = None
 
     async def __aenter__(self) -> Self:
         """Вход в менеджер контекста."""
-        await asyncio.gather(
-            self._access_token.check_token(),
-            super().__aenter__(),
-        )
+        started = time.perf_counter()
+        mode = self._token_check
+        token = self.headers["X-Api-Key"]
+        if self._token_ttl and self._token_cache.is_valid(token):
+            self.logger.info("Токен найден в кэше, проверка пропущена.")
+            mode = TokenCheckMode.skip
+        check_time = 0.0
+        try:
+            if mode == TokenCheckMode.separate:
+                check_time, _ = await asyncio.gather(
+                    self.__timed_check_token(pooled=False),
+                    super().__aenter__(),
+                )
+            else:
+                await super().__aenter__()
+                if mode == TokenCheckMode.pooled:
+                    check_time = await self.__timed_check_token(pooled=True)
+                elif mode == TokenCheckMode.deferred:
+                    self.__start_token_check()
+        except BaseException:
+            await self.session_end()
+            raise
+        self.startup_timings["check_token"] = check_time
+        self.startup_timings["total"] = time.perf_counter() - started
+        self.logger.info("Клиент запущен: %s.", self.startup_timings)
         return self
 
+    async def execute_request(self, *args, **kwargs) -> tuple[str, bool]:
+        """
+        Метод для отправки запросов к Api.
+
+        Если токен не прошел отложенную проверку, запрос
+        не отправляется. Если проверка не выполнена из-за
+        другой ошибки (сеть, таймаут), запрос отправляется,
+        а проверка запускается повторно. Остальные параметры
+        описаны в BaseApiClient.execute_request.
+
+        :raise AuthenticationException: Если токен не прошел
+          отложенную проверку.
+        """
+        task = self._token_task
+        if task and task.done() and not task.cancelled():
+            exc = task.exception()
+            if isinstance(exc, AuthenticationException):
+                raise exc
+            if exc is not None:
+                self.__start_token_check()
+        return await super().execute_request(*args, **kwargs)
+
+    def __start_token_check(self) -> None:
+        self._token_task = asyncio.create_task(
+            self.__timed_check_token(pooled=True)
+        )
+        self._token_task.add_done_callback(self.__token_checked)
+
+    async def __timed_check_token(self, pooled: bool) -> float:
+        started = time.perf_counter()
+        await self._access_token.check_token(pooled=pooled)
+        if self._token_ttl:
+            self._token_cache.store(self.headers["X-Api-Key"], self._token_ttl)
+        return time.perf_counter() - started
+
+    def __token_checked(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc:
+            self.logger.error("Отложенная проверка токена: %s.", exc)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Выход из менеджера контекста."""
+        if self._scheduler:
+            await self._scheduler.stop()
+        if self._health_monitor:
+            await self._health_monitor.stop()
+        if self._token_task:
+            self._token_task.cancel()
+        if self._recorder:
+            self._recorder.close()
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+
+    @property
+    def recorder(self) -> TrafficRecorder | None:
+        """Запись запросов и ответов, если задан record_to."""
+        return self._recorder
+
+    @property
+    def scheduler(self) -> PollingScheduler:
+        """
+        Планировщик опроса портфеля, заявок и стоп-заявок.
+
+        Создается при первом обращении с настройками по умолчанию.
+        Для изменения настроек можно присвоить свой экземпляр.
+        """
+        if self._scheduler is None:
+            self._scheduler = PollingScheduler(self)
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler: PollingScheduler) -> None:
+        self._scheduler = scheduler
+
+    @property
+    def health_monitor(self) -> HealthMonitor:
+        """
+        Мониторинг задержки цикла, пулов соединений и запросов.
+
+        Создается при первом обращении с настройками по умолчанию
+        и не запускается: задача стартует методом start().
+        Для изменения настроек можно присвоить свой экземпляр.
+        Останавливается при выходе из менеджера контекста.
+        """
+        if self._health_monitor is None:
+            self._health_monitor = HealthMonitor(self)
+        return self._health_monitor
+
+    @health_monitor.setter
+    def health_monitor(self, monitor: HealthMonitor) -> None:
+        self._health_monitor = monitor
+
+    def _notify_activity(self, client_id: str) -> None:
+        """Сообщает планировщику об отправке заявки."""
+        if self._scheduler:
+            self._scheduler.notify_activity(client_id)
+
     async def check_token(self) -> None:
         """
         Асинхронный метод, проверяет токен на валидность.
@@ -92,6 +305,8 @@ class FinamRestClient(BaseApiClient):
         from_: date | datetime | None = None,
         to: date | datetime | None = None,
         count: int | None = None,
+        *,
+        deadline: float | None = None,
     ) -> DayCandles | IntraDayCandles:
         """
         Получение свечей.
@@ -104,6 +319,8 @@ class FinamRestClient(BaseApiClient):
         :param to: конец интервала, datetime для внутридневных,
           для остальных date;
         :param count: количество свечей.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Свечи.
         """
@@ -117,6 +334,69 @@ class FinamRestClient(BaseApiClient):
             to,
             count,
         )
+        model = self.__candles_request(
+            security_code, security_board, time_frame, from_, to, count
+        )
+        if isinstance(model, DayCandlesRequest):
+            result = await self._candles.get_day_candles(
+                req_candles=model, deadline=deadline
+            )
+        else:
+            result = await self._candles.get_intraday_candles(  # type: ignore
+                req_candles=model, deadline=deadline
+            )
+        self.logger.info("Получены свечи: %s.", result)
+        return result
+
+    def prepare_candles(
+        self,
+        security_code: str,
+        security_board: str,
+        time_frame: Literal["M1", "M5", "M15", "H1", "D1", "W1"],
+        from_: date | datetime | None = None,
+        to: date | datetime | None = None,
+        count: int | None = None,
+    ) -> PreparedCandlesQuery:
+        """
+        Подготовка повторно используемого запроса свечей.
+
+        Параметры инструмента и тайм-фрейма проверяются один раз.
+        При вызове PreparedCandlesQuery.fetch передаются только
+        from_, to и count.
+
+        :param security_code: Код инструмента;
+        :param security_board: код площадки;
+        :param time_frame: тайм-фрейм;
+        :param from_: начало интервала по умолчанию;
+        :param to: конец интервала по умолчанию;
+        :param count: количество свечей по умолчанию.
+
+        :return: Подготовленный запрос свечей.
+        """
+        self.logger.info(
+            "Метод запущен с параметрами: security_code=%s, "
+            "security_board=%s, time_frame=%s, from_=%s, to=%s, count=%s.",
+            security_code,
+            security_board,
+            time_frame,
+            from_,
+            to,
+            count,
+        )
+        model = self.__candles_request(
+            security_code, security_board, time_frame, from_, to, count
+        )
+        return self._candles.prepare(req_candles=model)
+
+    @staticmethod
+    def __candles_request(
+        security_code: str,
+        security_board: str,
+        time_frame: str,
+        from_: date | datetime | None,
+        to: date | datetime | None,
+        count: int | None,
+    ) -> DayCandlesRequest | IntraDayCandlesRequest:
         params = dict(
             security_board=security_board,
             security_code=security_code,
@@ -126,15 +406,8 @@ class FinamRestClient(BaseApiClient):
             to=to,
         )
         if time_frame in ("D1", "W1"):
-            model_type = DayCandlesRequest
-            func = self._candles.get_day_candles
-        else:
-            model_type = IntraDayCandlesRequest  # type: ignore
-            func = self._candles.get_intraday_candles  # type: ignore
-        model = model_type.model_validate(params)
-        result = await func(req_candles=model)
-        self.logger.info("Получены свечи: %s.", result)
-        return result
+            return DayCandlesRequest.model_validate(params)
+        return IntraDayCandlesRequest.model_validate(params)
 
     async def get_securities(
         self,
@@ -142,6 +415,7 @@ class FinamRestClient(BaseApiClient):
         seccode: str | None = None,
         *,
         from_api: bool = False,
+        deadline: float | None = None,
     ) -> Sec:
         """
         Получение списка инструментов.
@@ -150,6 +424,8 @@ class FinamRestClient(BaseApiClient):
         :param seccode: тикер инструмента (необязательное поле для фильтрации).
         :param from_api: Запросить данные из api. Если False,
           то данные сперва запрашиваются в БД. Только при with_db=True.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель инструментов.
         """
@@ -160,7 +436,9 @@ class FinamRestClient(BaseApiClient):
             from_api,
         )
         model = SecuritiesRequest(board=board, seccode=seccode)
-        result = await self._securities.get_securities(req_securities=model)
+        result = await self._securities.get_securities(
+            req_securities=model, deadline=deadline
+        )
         self.logger.info("Метод вернул: %s.", result)
         return result
 
@@ -171,6 +449,8 @@ class FinamRestClient(BaseApiClient):
         include_money: bool = True,
         include_positions: bool = True,
         include_max_buy_sell: bool = True,
+        *,
+        deadline: float | None = None,
     ) -> Pf:
         """
         Получение портфеля.
@@ -183,6 +463,8 @@ class FinamRestClient(BaseApiClient):
         :param include_positions: запросить информацию по позициям портфеля;
         :param include_max_buy_sell: запросить информацию о максимальном
           доступном объеме на покупку/продажу.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель портфеля.
         """
@@ -203,7 +485,9 @@ class FinamRestClient(BaseApiClient):
             include_positions=include_positions,
             include_max_buy_sell=include_max_buy_sell,
         )
-        result = await self._portfolio.get_portfolio(req_portfolio=model)
+        result = await self._portfolio.get_portfolio(
+            req_portfolio=model, deadline=deadline
+        )
         self.logger.info("Получена информация о портфеле: %s.", result)
         return result
 
@@ -213,6 +497,8 @@ class FinamRestClient(BaseApiClient):
         include_matched: bool = True,
         include_canceled: bool = True,
         include_active: bool = True,
+        *,
+        deadline: float | None = None,
     ) -> GetOrders:
         """
         Получение списка ордеров.
@@ -221,6 +507,8 @@ class FinamRestClient(BaseApiClient):
         :param include_matched: вернуть исполненные заявки;
         :param include_canceled: вернуть отмененные заявки;
         :param include_active: вернуть активные заявки.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель Ответа на запрос списка ордеров.
         """
@@ -238,7 +526,9 @@ class FinamRestClient(BaseApiClient):
             include_active=include_active,
             include_matched=include_matched,
         )
-        result = await self._orders.get_orders(req_orders=model)
+        result = await self._orders.get_orders(
+            req_orders=model, deadline=deadline
+        )
         self.logger.info("Получена информация о заявках: %s.", result)
         return result
 
@@ -248,6 +538,8 @@ class FinamRestClient(BaseApiClient):
         include_executed: bool = True,
         include_canceled: bool = True,
         include_active: bool = True,
+        *,
+        deadline: float | None = None,
     ) -> GetStops:
         """
         Получение списка стоп-ордеров.
@@ -256,6 +548,8 @@ class FinamRestClient(BaseApiClient):
         :param include_executed: вернуть исполненные стоп-заявки;
         :param include_canceled: вернуть отмененные заявки;
         :param include_active: вернуть активные заявки.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на запрос списка стоп-ордеров.
         """
@@ -273,7 +567,9 @@ class FinamRestClient(BaseApiClient):
             include_active=include_active,
             include_executed=include_executed,
         )
-        result = await self._stops.get_stops(req_stops=model)
+        result = await self._stops.get_stops(
+            req_stops=model, deadline=deadline
+        )
         self.logger.info("Получена информация о стоп-заявках: %s.", result)
         return result
 
@@ -308,6 +604,8 @@ class FinamRestClient(BaseApiClient):
             "TillEndSession", "TillCancelled", "ExactTime"
         ] = "TillEndSession",
         valid_before_time: datetime | None = None,
+        *,
+        deadline: float | None = None,
     ) -> NewOrder:
         """
         Создание нового ордера.
@@ -351,6 +649,8 @@ class FinamRestClient(BaseApiClient):
              (Параметр valid_before_time должен быть задан.)
         :param valid_before_time: время, когда заявка будет отменена на
           сервере. В UTC.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на создание нового ордера.
         """
@@ -395,10 +695,96 @@ class FinamRestClient(BaseApiClient):
                 type=valid_before_type, time=valid_before_time
             )
         model = CreateOrderRequest.model_validate(data)
-        result = await self._orders.create_order(req_order=model)
+        result = await self._orders.create_order(
+            req_order=model, deadline=deadline
+        )
+        self._notify_activity(client_id)
         self.logger.info("Получена информация о новой заявке: %s.", result)
         return result
 
+    def create_order_template(
+        self,
+        client_id: str,
+        security_board: str,
+        security_code: str,
+        buy_sell: Literal["Buy", "Sell"],
+        use_credit: bool = True,
+        property: Literal[
+            "PutInQueue", "CancelBalance", "ImmOrCancel"
+        ] = "PutInQueue",
+        use_condition: bool = False,
+        condition_type: Literal[
+            "Bid",
+            "BidOrLast",
+            "Ask",
+            "AskOrLast",
+            "Time",
+            "CovDown",
+            "CovUp",
+            "LastUp",
+            "LastDown",
+        ] = "Bid",
+        condition_price: Decimal | str = "0",
+        condition_time: datetime | None = None,
+        use_valid_before: bool = False,
+        valid_before_type: Literal[
+            "TillEndSession", "TillCancelled", "ExactTime"
+        ] = "TillEndSession",
+        valid_before_time: datetime | None = None,
+    ) -> OrderTemplate:
+        """
+        Создание шаблона заявки.
+
+        Постоянные поля заявки проверяются и сериализуются один раз.
+        При вызове OrderTemplate.send передаются только количество
+        и цена. Параметры совпадают с create_order.
+
+        :return: Шаблон заявки.
+        """
+        self.logger.info(
+            "Метод запущен с параметрами: client_id=%s, security_board=%s, "
+            "security_code=%s, buy_sell=%s, use_credit=%s, property=%s, "
+            "use_condition=%s, condition_type=%s, condition_price=%s, "
+            "condition_time=%s, use_valid_before=%s, valid_before_type=%s, "
+            "valid_before_time=%s.",
+            client_id,
+            security_board,
+            security_code,
+            buy_sell,
+            use_credit,
+            property,
+            use_condition,
+            condition_type,
+            condition_price,
+            condition_time,
+            use_valid_before,
+            valid_before_type,
+            valid_before_time,
+        )
+        data = dict(
+            client_id=client_id,
+            security_board=security_board,
+            security_code=security_code,
+            buy_sell=buy_sell,
+            quantity=0,
+            use_credit=use_credit,
+            price=None,
+            property=property,
+        )
+        if use_condition:
+            data["condition"] = dict(
+                type=condition_type, price=condition_price, time=condition_time
+            )
+        if use_valid_before:
+            data["valid_before"] = dict(
+                type=valid_before_type, time=valid_before_time
+            )
+        model = CreateOrderRequest.model_validate(data)
+        return self._orders.template(
+            req_order=model,
+            on_send=lambda: self._notify_activity(client_id),
+        )
+
     async def create_stop(
         self,
         client_id: str,
@@ -433,6 +819,8 @@ class FinamRestClient(BaseApiClient):
             "TillEndSession", "TillCancelled", "ExactTime"
         ] = "TillEndSession",
         valid_before_time: datetime | None = None,
+        *,
+        deadline: float | None = None,
     ) -> NewStop:
         """
         Создание нового стоп-ордера.
@@ -483,6 +871,8 @@ class FinamRestClient(BaseApiClient):
              (Параметр valid_before_time должен быть задан.)
         :param valid_before_time: время, когда заявка будет отменена на
           сервере. В UTC.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на создание нового стоп-ордера.
         """
@@ -573,14 +963,21 @@ class FinamRestClient(BaseApiClient):
                 type=valid_before_type, time=valid_before_time
             )
         model = CreateStopRequest.model_validate(data)
-        result = await self._stops.create_stop(req_stop=model)
+        result = await self._stops.create_stop(
+            req_stop=model, deadline=deadline
+        )
+        self._notify_activity(client_id)
         self.logger.info(
             "Получена информация о новой стоп-заявке: %s.", result
         )
         return result
 
     async def cancel_order(
-        self, client_id: str, transaction_id: int
+        self,
+        client_id: str,
+        transaction_id: int,
+        *,
+        deadline: float | None = None,
     ) -> CancelOrder:
         """
         Отмена ордера.
@@ -591,6 +988,8 @@ class FinamRestClient(BaseApiClient):
 
         :param client_id: Торговый код клиента;
         :param transaction_id: идентификатор отменяемой заявки.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на отмену ордера.
         """
@@ -602,16 +1001,23 @@ class FinamRestClient(BaseApiClient):
         model = CancelOrderRequest(
             client_id=client_id, transaction_id=transaction_id
         )
-        result = await self._orders.cancel_order(req_order=model)
+        result = await self._orders.cancel_order(
+            req_order=model, deadline=deadline
+        )
+        self._notify_activity(client_id)
         self.logger.info("Получена информация об отмене заявки: %s.", result)
         return result
 
-    async def cancel_stop(self, client_id: str, stop_id: int) -> CancelStop:
+    async def cancel_stop(
+        self, client_id: str, stop_id: int, *, deadline: float | None = None
+    ) -> CancelStop:
         """
         Отмена стоп-ордера.
 
         :param client_id: Торговый код клиента;
         :param stop_id: идентификатор отменяемой стоп-заявки.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на отмену стоп-ордера.
         """
@@ -621,7 +1027,10 @@ class FinamRestClient(BaseApiClient):
             stop_id,
         )
         model = CancelStopRequest(client_id=client_id, stop_id=stop_id)
-        result = await self._stops.cancel_stop(req_stop=model)
+        result = await self._stops.cancel_stop(
+            req_stop=model, deadline=deadline
+        )
+        self._notify_activity(client_id)
         self.logger.info(
             "Получена информация об отмене стоп-заявки: %s.", result
         )
@@ -1,12 +1,104 @@
 """Логика работы с токеном."""
 
+import hashlib
+import json
 import logging
-
-from aiohttp import ClientSession
+import time
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from finam_rest_client.exceptions import AuthenticationException
 
-from .base import BaseObjClient
+from .base import BaseObjClient, Lane
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+class TokenCheckMode(str, Enum):
+    """
+    Способ проверки токена при входе в менеджер контекста.
+
+    Принимает следующие значения:
+
+    - separate - проверка в отдельной сессии параллельно
+      с созданием основной;
+    - pooled - проверка через пул соединений полосы trading
+      после создания сессии. Соединение остается в пуле;
+    - deferred - как pooled, но в фоне. Если токен не прошел
+      проверку, следующий запрос вызовет AuthenticationException;
+    - skip - не проверять.
+    """
+
+    separate = "separate"
+    pooled = "pooled"
+    deferred = "deferred"
+    skip = "skip"
+
+
+class TokenCache:
+    """
+    Кэш успешных проверок токенов.
+
+    Хранятся только хэши токенов и время окончания действия
+    проверки. Если задан path, кэш сохраняется в файл и доступен
+    другим процессам.
+
+    :param path: Путь к файлу кэша.
+    """
+
+    __slots__ = "__path", "__entries"
+    logger = logging.getLogger("finam_rest_client.TokenCache")
+
+    def __init__(self, path: str | Path | None = None):
+        self.__path = Path(path) if path else None
+        self.__entries: dict[str, float] = {}
+
+    def is_valid(self, token: str) -> bool:
+        """
+        Проверка наличия в кэше действующей записи о токене.
+
+        :param token: Токен доступа.
+        """
+        if self.__path:
+            self.__load()
+        return self.__entries.get(self.__key(token), 0) > time.time()
+
+    def store(self, token: str, ttl: float) -> None:
+        """
+        Запись успешной проверки токена.
+
+        :param token: Токен доступа;
+        :param ttl: время действия записи (секунды).
+        """
+        now = time.time()
+        if self.__path:
+            self.__load()
+        self.__entries = {
+            key: expires
+            for key, expires in self.__entries.items()
+            if expires > now
+        }
+        self.__entries[self.__key(token)] = now + ttl
+        if self.__path:
+            tmp = self.__path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.__entries))
+            tmp.replace(self.__path)
+
+    def __load(self) -> None:
+        try:
+            self.__entries = json.loads(self.__path.read_text())  # type: ignore
+        except (OSError, ValueError) as exc:
+            self.logger.debug("Кэш токенов не прочитан: %s.", exc)
+            self.__entries = {}
+
+    @staticmethod
+    def __key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+
+DEFAULT_TOKEN_CACHE = TokenCache()
 
 
 class AccessToken(BaseObjClient):
@@ -15,23 +107,39 @@ class AccessToken(BaseObjClient):
     path = "/public/api/v1/access-tokens/check"
     method = "get"
     logger = logging.getLogger("finam_rest_client.AccessToken")
+    timeout = 5.0
 
-    async def check_token(self):
+    async def check_token(self, pooled: bool = False):
         """
         Асинхронный метод, проверяет токен на валидность.
 
         Для проверки создается новый, отдельный экземпляр сессии.
 
+        :param pooled: Использовать сессию полосы trading клиента
+          вместо отдельной.
+
         :raise AuthenticationError: Если токен не прошел проверку.
         """
         self.logger.debug("Запущена проверка токена.")
+        if pooled:
+            await self.__check(self.client.get_session(Lane.trading))
+            return
+        from aiohttp import ClientSession
+
         async with ClientSession(
             base_url=self.client.url, headers=self.client.headers
         ) as session:
-            response, ok = await self.client.execute_request(
-                self.method, self.path, another_session=session
-            )
-            if not ok:
-                self.logger.warning("Токен провалил проверку.")
-                raise AuthenticationException()
-            self.logger.debug("Токен прошел проверку.")
+            await self.__check(session)
+
+    async def __check(self, session: "ClientSession") -> None:
+        response, ok = await self.client.execute_request(
+            self.method,
+            self.path,
+            another_session=session,
+            lane=Lane.trading,
+            timeout=self.timeout,
+        )
+        if not ok:
+            self.logger.warning("Токен провалил проверку.")
+            raise AuthenticationException()
+        self.logger.debug("Токен прошел проверку.")
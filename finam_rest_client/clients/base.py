@@ -1,18 +1,107 @@
 """Модуль содержит базовые классы клиента и объекта."""
 
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Self, TypeVar
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, Any, Self, TypeVar
 
-from aiohttp import ClientSession
 from pydantic import BaseModel
 
-from finam_rest_client.exceptions import BaseApiException
+from finam_rest_client.exceptions import (
+    BaseApiException,
+    DeadlineExceededException,
+    RequestTimeoutException,
+)
 from finam_rest_client.models.response_models.base import BaseResponseModel
 
+from .circuit_breaker import CircuitBreaker, CircuitBreakers
+from .concurrency import AdaptiveConcurrencyLimiter, parse_retry_after
+from .hedging import HedgePolicy
+from .middleware import (
+    ApiRequest,
+    ApiResponse,
+    Handler,
+    Middleware,
+    build_pipeline,
+)
+from .rate_limit import RateLimiter
+from .validation import ValidationOffload
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
 B = TypeVar("B", bound=BaseResponseModel)
 
 
+class Lane(str, Enum):
+    """
+    Полоса запросов.
+
+    У каждой полосы свой пул соединений. Принимает значения:
+
+    - trading - заявки и стоп-заявки;
+    - data - рыночные данные и остальные запросы.
+    """
+
+    trading = "trading"
+    data = "data"
+
+
+class LaneOptions:
+    """
+    Настройки пула соединений полосы.
+
+    :param limit: Максимальное количество соединений;
+    :param keepalive_timeout: время жизни простаивающего соединения
+      (секунды);
+    :param priority: приоритет полосы в ограничителе частоты.
+      Меньшее значение обслуживается раньше;
+    :param prewarm: количество соединений, открываемых заранее
+      при создании сессии. По умолчанию 0: прогрев отправляет
+      запросы к Api и включается явно;
+    :param keep_warm_interval: интервал фоновых запросов, не дающих
+      соединениям закрыться (секунды): по prewarm запросов, но не
+      меньше одного. None - не отправлять.
+    """
+
+    __slots__ = (
+        "limit",
+        "keepalive_timeout",
+        "priority",
+        "prewarm",
+        "keep_warm_interval",
+    )
+
+    def __init__(
+        self,
+        limit: int,
+        keepalive_timeout: float,
+        priority: int,
+        *,
+        prewarm: int = 0,
+        keep_warm_interval: float | None = None,
+    ):
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.priority = priority
+        self.prewarm = prewarm
+        self.keep_warm_interval = keep_warm_interval
+
+
+DEFAULT_LANES = {
+    Lane.trading: LaneOptions(limit=10, keepalive_timeout=300, priority=0),
+    Lane.data: LaneOptions(limit=50, keepalive_timeout=15, priority=1),
+}
+
+#: Приоритет запросов прогрева в ограничителе частоты: они
+#: обслуживаются после запросов всех полос.
+WARMUP_PRIORITY = 100
+
+
 class BaseapiClientInterface(ABC):
     """Интерфейс для клиента."""
 
@@ -61,17 +150,98 @@ class BaseApiClient(BaseapiClientInterface, ABC):
     """
     Базовый класс для реализации подключения к Api.
 
+    Запросы разделены на полосы (Lane), у каждой полосы
+    своя сессия и свой пул соединений. Если задан ограничитель
+    частоты, то при конкуренции за него раньше обслуживается
+    полоса с меньшим приоритетом.
+
+    Если задан LaneOptions.prewarm, при создании сессий соединения
+    полосы открываются заранее запросами на warmup_path, а фоновые
+    задачи поддерживают их открытыми (LaneOptions.keep_warm_interval).
+    Запросы прогрева проходят через ограничитель частоты
+    с низшим приоритетом (WARMUP_PRIORITY).
+
+    Если передан transport, собственные сессии не создаются:
+    запросы отправляются через сессии transport, а заголовки
+    клиента передаются с каждым запросом. Так несколько клиентов
+    с разными токенами используют общий пул соединений.
+
     :param url: Базовый url Api.
     :param headers: Заголовки для отправки на сервер.
+    :param rate_limiter: Общий ограничитель частоты запросов.
+    :param lanes: Настройки пулов соединений полос.
+    :param transport: Клиент, сессии которого используются
+      для запросов. Сессиями управляет transport.
+    :param timeouts: Время ожидания ответа (секунды) по путям
+      запросов. Заменяет значение по умолчанию объекта клиента
+      (BaseObjClient.timeout).
+    :param circuit_breakers: Автоматические выключатели по
+      семействам запросов (BaseObjClient.family).
+    :param hedge_policy: Политика дублирующих GET запросов.
+      None - запросы не дублируются.
+    :param concurrency_limiter: Адаптивный ограничитель
+      одновременных запросов.
+    :param middlewares: Цепочка промежуточных обработчиков запросов
+      объектов клиента (см. BaseObjClient._execute_request).
+      Первый обработчик выполняется первым.
+    :param validation: Политика разбора больших ответов вне
+      событийного цикла. None - все ответы разбираются в цикле.
     """
 
-    __slots__ = "__url", "__headers", "__session"
+    __slots__ = (
+        "__url",
+        "__headers",
+        "__sessions",
+        "__rate_limiter",
+        "__lanes",
+        "__keep_warm_tasks",
+        "__startup_timings",
+        "__transport",
+        "__timeouts",
+        "__circuit_breakers",
+        "__hedge_policy",
+        "__concurrency_limiter",
+        "__middlewares",
+        "__pipeline",
+        "__validation",
+        "__in_flight",
+    )
     logger: logging.Logger
+    warmup_path: str | None = None
 
-    def __init__(self, url: str, headers: dict):
+    def __init__(
+        self,
+        url: str,
+        headers: dict,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        lanes: dict[Lane, LaneOptions] | None = None,
+        transport: "BaseApiClient | None" = None,
+        timeouts: dict[str, float] | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        middlewares: Iterable[Middleware] = (),
+        validation: ValidationOffload | None = None,
+    ):
         self.__url = url
         self.__headers = headers
-        self.__session = None
+        self.__sessions: dict[Lane, ClientSession] = {}
+        self.__rate_limiter = rate_limiter
+        self.__lanes = DEFAULT_LANES | (lanes or {})
+        self.__keep_warm_tasks: list[asyncio.Task] = []
+        self.__startup_timings: dict[str, float] = {}
+        self.__transport = transport
+        self.__timeouts = timeouts or {}
+        self.__circuit_breakers = circuit_breakers
+        self.__hedge_policy = hedge_policy
+        self.__concurrency_limiter = concurrency_limiter
+        self.__middlewares = tuple(middlewares)
+        self.__validation = validation
+        self.__in_flight = 0
+        self.__pipeline = build_pipeline(
+            self.__send_request, self.__middlewares
+        )
 
     @property
     def url(self) -> str:
@@ -84,15 +254,111 @@ class BaseApiClient(BaseapiClientInterface, ABC):
         return self.__headers
 
     @property
-    def session(self) -> ClientSession:
-        """Экземпляр сессии."""
-        if not self.__session:
+    def rate_limiter(self) -> RateLimiter | None:
+        """Общий ограничитель частоты запросов."""
+        return self.__rate_limiter
+
+    @property
+    def lanes(self) -> dict[Lane, LaneOptions]:
+        """Настройки пулов соединений полос."""
+        return self.__lanes
+
+    @property
+    def transport(self) -> "BaseApiClient | None":
+        """Клиент, сессии которого используются для запросов."""
+        return self.__transport
+
+    @property
+    def timeouts(self) -> dict[str, float]:
+        """Время ожидания ответа по путям запросов."""
+        return self.__timeouts
+
+    @property
+    def circuit_breakers(self) -> CircuitBreakers | None:
+        """Автоматические выключатели по семействам запросов."""
+        return self.__circuit_breakers
+
+    @property
+    def hedge_policy(self) -> HedgePolicy | None:
+        """Политика дублирующих GET запросов."""
+        return self.__hedge_policy
+
+    @property
+    def concurrency_limiter(self) -> AdaptiveConcurrencyLimiter | None:
+        """Адаптивный ограничитель одновременных запросов."""
+        return self.__concurrency_limiter
+
+    @property
+    def middlewares(self) -> tuple[Middleware, ...]:
+        """Цепочка промежуточных обработчиков запросов."""
+        return self.__middlewares
+
+    def add_middleware(self, middleware: Middleware) -> None:
+        """
+        Добавление обработчика в конец цепочки.
+
+        :param middleware: Промежуточный обработчик.
+        """
+        self.__middlewares += (middleware,)
+        self.__pipeline = build_pipeline(
+            self.__send_request, self.__middlewares
+        )
+
+    @property
+    def validation(self) -> ValidationOffload | None:
+        """Политика разбора больших ответов."""
+        return self.__validation
+
+    @property
+    def pipeline(self) -> Handler:
+        """Обработчик, запускающий цепочку middleware."""
+        return self.__pipeline
+
+    async def __send_request(self, request: ApiRequest) -> ApiResponse:
+        response, ok = await self.execute_request(
+            request.method,
+            request.path,
+            lane=request.lane,
+            timeout=request.timeout,
+            deadline=request.deadline,
+            family=request.family,
+            **request.kwargs,
+        )
+        return ApiResponse(response, ok, request.resp_model)
+
+    @property
+    def in_flight(self) -> int:
+        """Количество отправленных запросов, ожидающих ответа."""
+        return self.__in_flight
+
+    @property
+    def startup_timings(self) -> dict[str, float]:
+        """Длительность этапов последнего запуска сессии (секунды)."""
+        return self.__startup_timings
+
+    @property
+    def session(self) -> "ClientSession":
+        """Экземпляр сессии полосы data."""
+        return self.get_session(Lane.data)
+
+    def get_session(self, lane: Lane) -> "ClientSession":
+        """
+        Экземпляр сессии полосы.
+
+        :param lane: Полоса запросов.
+
+        :raise BaseApiException: Если сессия не создана.
+        """
+        if self.__transport is not None:
+            return self.__transport.get_session(lane)
+        session = self.__sessions.get(lane)
+        if not session:
             raise BaseApiException(
                 "Отсутствует клиентская сессия. "
                 "Воспользуйтесь методом session_start "
                 "или контекстным менеджером."
             )
-        return self.__session
+        return session
 
     async def __aenter__(self) -> Self:
         """Вход в менеджер контекста."""
@@ -105,88 +371,440 @@ class BaseApiClient(BaseapiClientInterface, ABC):
 
     async def session_start(self):
         """
-        Метод создает новый экземпляр сессии.
+        Метод создает новые экземпляры сессий для всех полос.
 
-        Предыдущая сессия закрывается.
+        Предыдущие сессии закрываются. Если задан transport,
+        сессии не создаются.
         """
+        if self.__transport is not None:
+            self.logger.info("Используются сессии transport.")
+            self.__startup_timings = {"session": 0.0, "prewarm": 0.0}
+            return
         self.logger.info("Запущено создание сессии.")
-        if self.__session:
+        started = time.perf_counter()
+        if self.__sessions:
             self.logger.info("Закрытие предыдущей сессии.")
-            await self.__session.close()
-        self.__session = ClientSession(
-            base_url=self.__url, headers=self.__headers
-        )
+            await self.__close_sessions()
+        for lane in self.__lanes:
+            self.__sessions[lane] = self.__new_session(lane)
         self.logger.info("Сессия создана.")
+        created = time.perf_counter()
+        await asyncio.gather(*(self.prewarm(lane) for lane in self.__lanes))
+        self.__startup_timings = {
+            "session": created - started,
+            "prewarm": time.perf_counter() - created,
+        }
+        self.__keep_warm_tasks = [
+            asyncio.create_task(
+                self.__keep_warm(lane, options.keep_warm_interval)
+            )
+            for lane, options in self.__lanes.items()
+            if options.keep_warm_interval
+        ]
+
+    def __new_session(self, lane: Lane) -> "ClientSession":
+        # aiohttp импортируется при первом создании сессии,
+        # чтобы не замедлять импорт пакета.
+        from aiohttp import ClientSession, TCPConnector
+
+        options = self.__lanes[lane]
+        connector = TCPConnector(
+            limit=options.limit,
+            keepalive_timeout=options.keepalive_timeout,
+        )
+        return ClientSession(
+            base_url=self.__url,
+            headers=self.__headers,
+            connector=connector,
+        )
+
+    async def __reset_session(
+        self, lane: Lane, session: "ClientSession"
+    ) -> None:
+        """
+        Замена сессии полосы после ошибки запроса.
+
+        Заменяется только сессия полосы, в которой произошла
+        ошибка, и только если запрос выполнялся через текущую
+        сессию полосы: остальные полосы продолжают работу,
+        а ошибки других запросов через уже замененную сессию
+        не вызывают повторной замены.
+        """
+        if self.__transport is not None:
+            await self.__transport.__reset_session(lane, session)
+            return
+        if self.__sessions.get(lane) is not session:
+            return
+        self.logger.info("Пересоздание сессии полосы %s.", lane)
+        self.__sessions[lane] = self.__new_session(lane)
+        await session.close()
 
     async def session_end(self):
-        """Метод закрывает текущую сессию, если существует."""
+        """Метод закрывает текущие сессии, если существуют."""
         self.logger.info("Запущено закрытие сессии.")
-        if not self.__session:
+        if not self.__sessions:
             self.logger.info("Сессия не существует. Выход.")
             return
-        await self.__session.close()
+        await self.__close_sessions()
         self.logger.info("Сессия закрыта.")
 
+    async def __close_sessions(self) -> None:
+        tasks, self.__keep_warm_tasks = self.__keep_warm_tasks, []
+        for task in tasks:
+            task.cancel()
+        sessions = list(self.__sessions.values())
+        self.__sessions = {}
+        await asyncio.gather(*(session.close() for session in sessions))
+
+    async def prewarm(
+        self, lane: Lane = Lane.trading, connections: int | None = None
+    ) -> int:
+        """
+        Открытие соединений полосы заранее.
+
+        Отправляет одновременно несколько запросов на warmup_path,
+        после чего соединения остаются в пуле. Запросы проходят
+        через ограничитель частоты с приоритетом WARMUP_PRIORITY.
+        Если задан transport, открываются соединения его сессии
+        с заголовками этого клиента. Полезно вызывать перед
+        запланированной отправкой заявок.
+
+        :param lane: Полоса запросов;
+        :param connections: количество соединений. По умолчанию
+          LaneOptions.prewarm полосы.
+
+        :return: Количество успешных запросов.
+        """
+        if connections is None:
+            connections = self.__lanes[lane].prewarm
+        if not self.warmup_path or connections <= 0:
+            return 0
+        self.logger.debug(
+            "Прогрев соединений: lane=%s, connections=%s.", lane, connections
+        )
+        session = self.get_session(lane)
+        path = self.warmup_path
+        results = await asyncio.gather(
+            *(self.__touch(session, path) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if result is not None]
+        if errors:
+            self.logger.warning(
+                "Ошибка прогрева соединений %s: %s.", lane, errors[0]
+            )
+        return connections - len(errors)
+
+    async def __touch(self, session: "ClientSession", path: str) -> None:
+        if self.__rate_limiter:
+            await self.__rate_limiter.acquire(WARMUP_PRIORITY)
+        # Сессии transport не содержат заголовков этого клиента.
+        headers = self.__headers if self.__transport is not None else None
+        async with session.get(path, headers=headers) as response:
+            await response.read()
+
+    async def __keep_warm(self, lane: Lane, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            rate_limiter = self.__rate_limiter
+            if rate_limiter and rate_limiter.waiting:
+                continue
+            await self.prewarm(lane, max(self.__lanes[lane].prewarm, 1))
+
     async def execute_request(
         self,
         method: str,
         path: str,
         *,
-        another_session: ClientSession | None = None,
+        another_session: "ClientSession | None" = None,
+        lane: Lane = Lane.data,
+        timeout: float | None = None,
+        deadline: float | None = None,
+        family: str | None = None,
         **kwargs,
     ) -> tuple[str, bool]:
         """
         Метод для отправки запросов к Api.
 
-        В случае возникновения ошибки при выполнении
-        запроса закрывает клиентскую сессию.
+        При обрыве соединения пересоздает сессию полосы
+        запроса, сессии других полос не затрагиваются.
+        При ответе с ошибкой и превышении времени ожидания
+        сессия не пересоздается.
+
+        Если крайний срок истек до отправки (в том числе
+        во время ожидания ограничителя частоты), запрос
+        не отправляется. Если выключатель семейства запроса
+        разомкнут, запрос не отправляется.
 
         :param method: Тип запроса.
         :param path: Uri запроса.
         :param another_session: Сессия для использования в запросе.
             Если не указано, то будет использоваться сессия
             внутри клиента. В большинстве случаев не передается.
+        :param lane: Полоса запроса.
+        :param timeout: Время ожидания ответа (секунды). Значение
+            из timeouts клиента для path имеет приоритет.
+        :param deadline: Крайний срок получения ответа,
+            момент по time.monotonic().
+        :param family: Семейство запроса для автоматического
+            выключателя. None - выключатель не используется.
         :param kwargs: Дополнительные аргументы для передачи в запрос.
 
+        :raise CircuitOpenException: Если выключатель разомкнут.
+        :raise DeadlineExceededException: Если крайний срок истек
+            до отправки запроса.
+        :raise RequestTimeoutException: Если ответ не получен вовремя.
         :raise BaseApiException: В случае появления ошибок.
 
         :return: Текст ответа в json и True(если вернулся код 200) | False.
         """
         self.logger.debug(
             "Метод вызван с параметрами: method=%s, "
-            "path=%s, another_session=%s, %s.",
+            "path=%s, another_session=%s, lane=%s, "
+            "timeout=%s, deadline=%s, family=%s, %s.",
             method,
             path,
             another_session,
+            lane,
+            timeout,
+            deadline,
+            family,
             kwargs,
         )
-        session: ClientSession = another_session or self.session
+        breaker = None
+        if self.__circuit_breakers is not None and family is not None:
+            breaker = self.__circuit_breakers[family]
+            breaker.check()
+        session: ClientSession = another_session or self.get_session(lane)
+        if self.__transport is not None:
+            kwargs["headers"] = self.__headers | kwargs.get("headers", {})
+        timeout = self.__timeouts.get(path, timeout)
+        limiter = self.__concurrency_limiter
+        if limiter is not None:
+            await self.__wait(limiter.acquire, deadline, path)
+        try:
+            if self.__rate_limiter:
+                await self.__wait(
+                    partial(
+                        self.__rate_limiter.acquire,
+                        self.__lanes[lane].priority,
+                    ),
+                    deadline,
+                    path,
+                )
+            if deadline is not None:
+                remaining = self.__remaining(deadline, path)
+                timeout = (
+                    remaining if timeout is None else min(timeout, remaining)
+                )
+            if timeout is not None:
+                from aiohttp import ClientTimeout
+
+                kwargs["timeout"] = ClientTimeout(total=timeout)
+            if breaker is not None:
+                breaker.before_call()
+            self.__in_flight += 1
+            try:
+                response, ok = await self.__send(
+                    method, session, path, kwargs, timeout, breaker, lane
+                )
+            finally:
+                self.__in_flight -= 1
+        finally:
+            if limiter is not None:
+                limiter.release()
+        self.logger.debug(
+            "Метод вернул ответ: response=%s, ok=%s", response, ok
+        )
+        return response, ok
+
+    async def __send(
+        self,
+        method: str,
+        session: "ClientSession",
+        path: str,
+        kwargs: dict[str, Any],
+        timeout: float | None,
+        breaker: CircuitBreaker | None,
+        lane: Lane,
+    ) -> tuple[str, bool]:
+        limiter = self.__concurrency_limiter
+        started = time.monotonic()
         try:
-            response, ok = await self._execute_request(
-                method, session, path, **kwargs
+            policy = self.__hedge_policy
+            if policy is not None and policy.applies(method, path):
+                response, status, headers = await self.__hedged(
+                    policy, method, session, path, kwargs
+                )
+            else:
+                response, status, headers = await self._execute_request(
+                    method, session, path, **kwargs
+                )
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except TimeoutError:
+            self.logger.warning(
+                "Превышено время ожидания ответа: path=%s, timeout=%s.",
+                path,
+                timeout,
             )
+            if breaker is not None:
+                breaker.record(time.monotonic() - started, failed=True)
+            if limiter is not None:
+                limiter.on_error()
+            raise RequestTimeoutException() from None
         except Exception as exc:
             self.logger.warning("Возникла ошибка: %s", exc)
-            await self.session_end()
+            if breaker is not None:
+                breaker.record(time.monotonic() - started, failed=True)
+            status = getattr(exc, "status", 0)
+            if limiter is not None:
+                self.__adapt(
+                    limiter, status, getattr(exc, "headers", None) or {}, None
+                )
+            # Сессия пересоздается только при обрыве соединения:
+            # ответ сервера с ошибкой (в том числе 429) или ответ
+            # не в json не означают проблем с соединениями, а
+            # закрытая сессия не дала бы выключателю проверить
+            # восстановление Api пробными запросами.
+            if _is_connection_error(exc, status):
+                await self.__reset_session(lane, session)
             raise BaseApiException(exc)
-        self.logger.debug(
-            "Метод вернул ответ: response=%s, ok=%s", response, ok
+        latency = time.monotonic() - started
+        # Ответ 5xx с телом json - тоже отказ Api: он должен
+        # открывать выключатель и уменьшать окно ограничителя.
+        failed = status >= 500
+        if breaker is not None:
+            breaker.record(latency, failed=failed)
+        if limiter is not None:
+            self.__adapt(limiter, status, headers, None if failed else latency)
+        return response, status == 200
+
+    @staticmethod
+    def __adapt(
+        limiter: AdaptiveConcurrencyLimiter,
+        status: int,
+        headers: Mapping[str, str],
+        latency: float | None,
+    ) -> None:
+        """
+        Передача результата запроса ограничителю одновременных запросов.
+
+        Ответ 429 или заголовок Retry-After уменьшают окно,
+        ошибка (latency=None): запрос без ответа или ответ 5xx,
+        тоже.
+        """
+        if status == 429 or "Retry-After" in headers:
+            limiter.on_throttle(parse_retry_after(headers.get("Retry-After")))
+        elif latency is None:
+            limiter.on_error()
+        else:
+            limiter.on_success(latency)
+
+    async def __wait(
+        self,
+        acquire: Callable[[], Awaitable[None]],
+        deadline: float | None,
+        path: str,
+    ) -> None:
+        """Ожидание ограничителя не дольше крайнего срока."""
+        if deadline is None:
+            await acquire()
+            return
+        remaining = self.__remaining(deadline, path)
+        try:
+            await asyncio.wait_for(acquire(), remaining)
+        except TimeoutError:
+            raise self.__deadline_exceeded(path) from None
+
+    async def __hedged(
+        self,
+        policy: HedgePolicy,
+        method: str,
+        session: "ClientSession",
+        path: str,
+        kwargs: dict[str, Any],
+    ) -> tuple[str, int, Mapping[str, str]]:
+        """
+        Отправка запроса с дублированием.
+
+        Дублирующий запрос отправляется, только если хватает
+        бюджета политики и токена ограничителя частоты
+        без ожидания.
+        """
+        policy.on_request()
+        primary = asyncio.ensure_future(
+            self.__observed(policy, method, session, path, kwargs)
         )
-        return response, ok
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.delay(path))
+            rate_limiter = self.__rate_limiter
+            if (
+                done
+                or not policy.can_hedge()
+                or (rate_limiter and not rate_limiter.try_acquire())
+            ):
+                return await primary
+            policy.spend()
+            self.logger.debug("Отправлен дублирующий запрос: %s.", path)
+            hedge = asyncio.ensure_future(
+                self.__observed(policy, method, session, path, kwargs)
+            )
+            tasks.add(hedge)
+            error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        policy.record_win(task is hedge)
+                        return task.result()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __observed(
+        self,
+        policy: HedgePolicy,
+        method: str,
+        session: "ClientSession",
+        path: str,
+        kwargs: dict[str, Any],
+    ) -> tuple[str, int, Mapping[str, str]]:
+        started = time.monotonic()
+        result = await self._execute_request(method, session, path, **kwargs)
+        policy.observe(path, time.monotonic() - started)
+        return result
+
+    def __remaining(self, deadline: float, path: str) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise self.__deadline_exceeded(path)
+        return remaining
+
+    def __deadline_exceeded(self, path: str) -> DeadlineExceededException:
+        self.logger.warning("Крайний срок запроса истек: path=%s.", path)
+        return DeadlineExceededException()
 
     @staticmethod
     async def _execute_request(
         method: str,
-        session: ClientSession,
+        session: "ClientSession",
         path: str,
         **kwargs,
-    ) -> tuple[str, bool]:
+    ) -> tuple[str, int, Mapping[str, str]]:
         async with session.request(method, path, **kwargs) as response:
             if response.status != 200:
                 if response.content_type != "application/json":
                     response.raise_for_status()
-                return await response.text(), False
-            return await response.text(), True
+            return await response.text(), response.status, response.headers
 
 
 ApiClient = TypeVar("ApiClient", bound=BaseApiClient)
@@ -201,6 +819,9 @@ class BaseObjClient(ABC):
 
     __slots__ = "__client"
     logger: logging.Logger
+    lane = Lane.data
+    timeout: float | None = 30.0
+    family: str | None = None
 
     def __init__(self, client: ApiClient):
         self.__client = client
@@ -237,6 +858,7 @@ class BaseObjClient(ABC):
         resp_model: type[B],
         *,
         path: str | None = None,
+        deadline: float | None = None,
         **kwargs,
     ) -> B:
         """
@@ -244,21 +866,57 @@ class BaseObjClient(ABC):
 
         :param resp_model: Модель для ответа сервера.
         :param path: Пользовательский путь.
+        :param deadline: Крайний срок получения ответа,
+            момент по time.monotonic().
 
         :return: Ответ сервера.
         """
         self.logger.debug(
             "Метод запущен с параметрами: resp_model=%s, "
-            "path=%s, kwargs=%s.",
+            "path=%s, deadline=%s, kwargs=%s.",
             resp_model,
             path,
+            deadline,
             kwargs,
         )
         path = path or self.path
-        response, ok = await self.client.execute_request(
-            self.method, path, **kwargs
-        )
-        result = resp_model.model_validate_json(response)
+        if self.client.middlewares:
+            response = await self.client.pipeline(
+                ApiRequest(
+                    self.method,
+                    path,
+                    resp_model,
+                    lane=self.lane,
+                    timeout=self.timeout,
+                    deadline=deadline,
+                    family=self.family,
+                    kwargs=kwargs,
+                    auth=self.client.headers.get("X-Api-Key"),
+                )
+            )
+            ok = response.ok
+            validation = self.client.validation
+            if validation is None:
+                result = response.model
+            else:
+                result = await response.load_model(validation.validate)
+        else:
+            # Без обработчиков запрос отправляется напрямую,
+            # чтобы пустая цепочка не добавляла накладных расходов.
+            text, ok = await self.client.execute_request(
+                self.method,
+                path,
+                lane=self.lane,
+                timeout=self.timeout,
+                deadline=deadline,
+                family=self.family,
+                **kwargs,
+            )
+            validation = self.client.validation
+            if validation is None:
+                result = resp_model.model_validate_json(text)
+            else:
+                result = await validation.validate(resp_model, text)
         if not ok:
             self.logger.warning(
                 "Запрос %s вернулся с ошибкой: %s.",
@@ -267,3 +925,9 @@ class BaseObjClient(ABC):
             )
         self.logger.debug("Метод вернул: %s.", result)
         return result
+
+
+def _is_connection_error(exc: Exception, status: int) -> bool:
+    from aiohttp import ClientConnectionError
+
+    return not status and isinstance(exc, (ClientConnectionError, OSError))
@@ -0,0 +1,405 @@
+"""Календарь торговых сессий, выведенный из истории свечей."""
+
+import logging
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import UTC, date, datetime, time, timedelta, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from finam_rest_client.exceptions import BaseApiException
+from finam_rest_client.models.response_models.securities import Security
+
+from .windows import as_date, plan_windows
+
+logger = logging.getLogger("finam_rest_client.SessionCalendar")
+
+#: Имена часовых поясов Windows (Security.time_zone_name) и IANA.
+WINDOWS_TIME_ZONES = {
+    "Russian Standard Time": "Europe/Moscow",
+    "Eastern Standard Time": "America/New_York",
+    "Central Standard Time": "America/Chicago",
+    "Pacific Standard Time": "America/Los_Angeles",
+    "GMT Standard Time": "Europe/London",
+    "W. Europe Standard Time": "Europe/Berlin",
+    "Central European Standard Time": "Europe/Warsaw",
+    "FLE Standard Time": "Europe/Kiev",
+    "China Standard Time": "Asia/Shanghai",
+    "Tokyo Standard Time": "Asia/Tokyo",
+    "UTC": "UTC",
+}
+DEFAULT_TIME_ZONE = "Europe/Moscow"
+
+#: Доля дней недели с торгами, начиная с которой день недели
+#: считается торговым вне наблюдаемых интервалов.
+WEEKDAY_RATIO = 0.5
+
+
+def security_time_zone(name: str) -> ZoneInfo:
+    """
+    Часовой пояс по имени из Security.time_zone_name.
+
+    :param name: Имя пояса Windows или IANA. Для неизвестного
+      имени используется DEFAULT_TIME_ZONE.
+    """
+    try:
+        return ZoneInfo(WINDOWS_TIME_ZONES.get(name, name))
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(
+            "Неизвестный часовой пояс %s, используется %s.",
+            name,
+            DEFAULT_TIME_ZONE,
+        )
+        return ZoneInfo(DEFAULT_TIME_ZONE)
+
+
+class SessionCalendar:
+    """
+    Календарь торговых сессий режима торгов.
+
+    Строится по наблюдаемой истории:
+
+    - observe_days - торговые дни из дневных свечей
+      инструмента между его первой и последней свечой
+      интервала. Внутри наблюдаемых интервалов день без свечи
+      считается неторговым (выходные, праздники); вне их
+      торговыми считаются дни недели, в которые торги шли
+      хотя бы в WEEKDAY_RATIO наблюдаемых случаев;
+    - observe_bars - время внутридневных свечей: торговые
+      дни и границы сессии в местном времени (самое раннее
+      начало и самый поздний конец свечи).
+
+    Пока не наблюдался ни один торговый день, can_have_bars
+    всегда True: календарь только исключает интервалы,
+    в которых свечей заведомо нет.
+
+    :param time_zone: Часовой пояс режима торгов.
+    """
+
+    __slots__ = (
+        "__tz",
+        "__days",
+        "__covered",
+        "__open",
+        "__close",
+        "__weekdays",
+    )
+
+    def __init__(self, time_zone: str | tzinfo = DEFAULT_TIME_ZONE):
+        if isinstance(time_zone, str):
+            time_zone = security_time_zone(time_zone)
+        self.__tz = time_zone
+        self.__days: set[date] = set()
+        self.__covered: list[tuple[date, date]] = []
+        self.__open: time | None = None
+        self.__close: time | None = None
+        self.__weekdays: frozenset[int] | None = None
+
+    @property
+    def time_zone(self) -> tzinfo:
+        """Часовой пояс режима торгов."""
+        return self.__tz
+
+    @property
+    def session(self) -> tuple[time, time] | None:
+        """Границы сессии в местном времени. None - не наблюдались."""
+        if self.__open is None or self.__close is None:
+            return None
+        return self.__open, self.__close
+
+    @property
+    def weekdays(self) -> frozenset[int] | None:
+        """Торговые дни недели (0 - понедельник). None - неизвестны."""
+        if not self.__days or not self.__covered:
+            return None
+        if self.__weekdays is None:
+            self.__weekdays = self.__infer_weekdays()
+        return self.__weekdays
+
+    def observe_days(
+        self, days: Iterable[date], from_: date, to: date
+    ) -> None:
+        """
+        Учет торговых дней из дневных свечей одного инструмента.
+
+        Наблюдаемым считается не весь запрошенный интервал,
+        а только его часть от первой до последней свечи:
+        до начала и после окончания торгов инструментом (или
+        до первой сделки неликвидного инструмента) дни без
+        свечей не становятся неторговыми.
+
+        :param days: Даты свечей;
+        :param from_: начало запрошенного интервала;
+        :param to: конец запрошенного интервала.
+        """
+        observed = [day for day in days if from_ <= day <= to]
+        if not observed:
+            return
+        self.__days.update(observed)
+        self.__cover(min(observed), max(observed))
+
+    def observe_bars(
+        self, moments: Iterable[datetime], duration: timedelta
+    ) -> None:
+        """
+        Учет времени внутридневных свечей.
+
+        :param moments: Время начала свечей;
+        :param duration: длительность свечи (тайм-фрейм).
+        """
+        for moment in moments:
+            local = moment.astimezone(self.__tz)
+            end = (local + duration).time()
+            self.__days.add(local.date())
+            if self.__open is None or local.time() < self.__open:
+                self.__open = local.time()
+            if end < local.time():
+                end = time.max
+            if self.__close is None or end > self.__close:
+                self.__close = end
+        self.__weekdays = None
+
+    def is_trading_day(self, day: date) -> bool:
+        """
+        Проверка, могут ли в день быть торги.
+
+        :param day: Дата в часовом поясе режима торгов.
+        """
+        if day in self.__days:
+            return True
+        if not self.__days:
+            return True
+        if self.__is_covered(day):
+            return False
+        weekdays = self.weekdays
+        return weekdays is None or day.weekday() in weekdays
+
+    def can_have_bars(
+        self, from_: date | datetime, to: date | datetime
+    ) -> bool:
+        """
+        Проверка, могут ли в интервале быть свечи.
+
+        :param from_: Начало интервала: дата в часовом поясе
+          режима торгов или момент времени;
+        :param to: конец интервала (включительно).
+
+        :return: False, если интервал целиком приходится на
+          неторговые дни или время вне сессии.
+        """
+        if not isinstance(from_, datetime) or not isinstance(to, datetime):
+            day = as_date(from_)
+            while day <= as_date(to):
+                if self.is_trading_day(day):
+                    return True
+                day += timedelta(days=1)
+            return False
+        start = _aware(from_).astimezone(self.__tz)
+        end = _aware(to).astimezone(self.__tz)
+        session = self.session
+        day = start.date()
+        while day <= end.date():
+            if self.is_trading_day(day):
+                if session is None:
+                    return True
+                opens = datetime.combine(day, session[0], self.__tz)
+                closes = datetime.combine(day, session[1], self.__tz)
+                if opens <= end and start < closes:
+                    return True
+            day += timedelta(days=1)
+        return False
+
+    def __cover(self, from_: date, to: date) -> None:
+        intervals = sorted([*self.__covered, (from_, to)])
+        merged: list[tuple[date, date]] = []
+        for start, end in intervals:
+            if merged and start <= merged[-1][1] + timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.__covered = merged
+        self.__weekdays = None
+
+    def __is_covered(self, day: date) -> bool:
+        index = bisect_right(self.__covered, (day, date.max)) - 1
+        return index >= 0 and self.__covered[index][1] >= day
+
+    def __infer_weekdays(self) -> frozenset[int]:
+        total = [0] * 7
+        trading = [0] * 7
+        for start, end in self.__covered:
+            day = start
+            while day <= end:
+                total[day.weekday()] += 1
+                trading[day.weekday()] += day in self.__days
+                day += timedelta(days=1)
+        return frozenset(
+            weekday
+            for weekday in range(7)
+            if total[weekday]
+            and trading[weekday] / total[weekday] >= WEEKDAY_RATIO
+        )
+
+
+class SessionCalendars:
+    """
+    Календари сессий по режимам торгов.
+
+    Календарь режима торгов создается в часовом поясе
+    инструмента (Security.time_zone_name) и заполняется
+    методом learn по истории нескольких инструментов режима.
+    """
+
+    logger = logging.getLogger("finam_rest_client.SessionCalendars")
+
+    def __init__(self):
+        self.__calendars: dict[str, SessionCalendar] = {}
+
+    def __contains__(self, board: object) -> bool:
+        """Проверка, есть ли календарь режима торгов."""
+        return board in self.__calendars
+
+    def __getitem__(self, board: str) -> SessionCalendar:
+        """Календарь режима торгов."""
+        return self.__calendars[board]
+
+    def get(self, board: str) -> SessionCalendar | None:
+        """Календарь режима торгов или None."""
+        return self.__calendars.get(board)
+
+    def for_security(self, security: Security) -> SessionCalendar:
+        """
+        Календарь режима торгов инструмента.
+
+        Создается при первом обращении.
+
+        :param security: Инструмент.
+        """
+        calendar = self.__calendars.get(security.board)
+        if calendar is None:
+            calendar = SessionCalendar(security.time_zone_name)
+            self.__calendars[security.board] = calendar
+        return calendar
+
+    async def rank_by_turnover(
+        self,
+        client,
+        securities: Sequence[Security],
+        to: date,
+        *,
+        days: int = 30,
+    ) -> list[Security]:
+        """
+        Упорядочивание инструментов по обороту.
+
+        Оборот - сумма close * volume свечей D1 за days дней
+        до to. Инструменты без свечей и с ошибкой запроса
+        исключаются.
+
+        :param client: Экземпляр клиента;
+        :param securities: инструменты;
+        :param to: конец интервала;
+        :param days: длина интервала (дни).
+
+        :return: Инструменты по убыванию оборота.
+        """
+        turnover: dict[tuple[str, str], float] = {}
+        for security in securities:
+            result = await client.get_candles(
+                security.code,
+                security.board,
+                "D1",
+                from_=to - timedelta(days=days),
+                to=to,
+            )
+            if result.data is None:
+                self.logger.warning(
+                    "Оборот %s:%s не получен: %s.",
+                    security.board,
+                    security.code,
+                    result.error,
+                )
+                continue
+            value = sum(
+                candle.close.num / 10**candle.close.scale * candle.volume
+                for candle in result.data.candles
+            )
+            if value > 0:
+                turnover[security.board, security.code] = value
+        return sorted(
+            (s for s in securities if (s.board, s.code) in turnover),
+            key=lambda s: turnover[s.board, s.code],
+            reverse=True,
+        )
+
+    async def learn(
+        self,
+        client,
+        securities: Sequence[Security],
+        from_: date,
+        to: date,
+        *,
+        session_days: int = 20,
+    ) -> SessionCalendar:
+        """
+        Заполнение календаря режима торгов по истории.
+
+        Торговые дни берутся из свечей D1 инструментов за
+        [from_, to] (объединение: день считается торговым, если
+        торговался хотя бы один инструмент, поэтому стоит
+        передавать несколько ликвидных инструментов, см.
+        rank_by_turnover). Каждый инструмент отмечает
+        неторговыми только дни между своими первой и последней
+        свечой. Границы сессии - из свечей H1 первого
+        инструмента за последние session_days дней интервала.
+
+        :param client: Экземпляр клиента;
+        :param securities: инструменты одного режима торгов;
+        :param from_: начало интервала;
+        :param to: конец интервала;
+        :param session_days: длина интервала свечей H1 (дни).
+
+        :raise BaseApiException: При ошибке Api.
+
+        :return: Календарь режима торгов.
+        """
+        calendar = self.for_security(securities[0])
+        for security in securities:
+            days: list[date] = []
+            for start, end in plan_windows(from_, to):
+                result = await client.get_candles(
+                    security.code, security.board, "D1", from_=start, to=end
+                )
+                if result.data is None:
+                    raise BaseApiException(f"Ошибка Api: {result.error}.")
+                days.extend(candle.date for candle in result.data.candles)
+            calendar.observe_days(days, from_, to)
+        security = securities[0]
+        end_moment = datetime.combine(to, time(23, 59, 59), UTC)
+        start_moment = max(
+            datetime.combine(from_, time.min, UTC),
+            end_moment - timedelta(days=session_days),
+        )
+        result = await client.get_candles(
+            security.code,
+            security.board,
+            "H1",
+            from_=start_moment,
+            to=end_moment,
+        )
+        if result.data is None:
+            raise BaseApiException(f"Ошибка Api: {result.error}.")
+        calendar.observe_bars(
+            (candle.timestamp for candle in result.data.candles),
+            timedelta(hours=1),
+        )
+        self.logger.info(
+            "Календарь %s: торговые дни недели %s, сессия %s.",
+            security.board,
+            sorted(calendar.weekdays or ()),
+            calendar.session,
+        )
+        return calendar
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
@@ -1,6 +1,11 @@
 """Логика работы со свечами."""
 
 import logging
+from datetime import date, datetime
+from typing import Any
+
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
 
 from finam_rest_client.models.request_models import (
     DayCandlesRequest,
@@ -13,6 +18,8 @@ from finam_rest_client.models.response_models import (
 
 from .base import BaseObjClient
 
+CandlesRequest = DayCandlesRequest | IntraDayCandlesRequest
+
 
 class Candles(BaseObjClient):
     """Класс для работы со свечами."""
@@ -21,14 +28,18 @@ class Candles(BaseObjClient):
     method = "get"
     DAY, INTRADAY = (f"{path}/day-candles", f"{path}/intraday-candles")
     logger = logging.getLogger("finam_rest_client.Candles")
+    timeout = 10.0
+    family = "candles"
 
     async def get_day_candles(
-        self, req_candles: DayCandlesRequest
+        self, req_candles: DayCandlesRequest, deadline: float | None = None
     ) -> DayCandles:
         """
         Получение дневных свечей.
 
         :param req_candles: Модель запроса на получение дневных свечей.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель дневных свечей.
         """
@@ -40,17 +51,22 @@ class Candles(BaseObjClient):
             resp_model=DayCandles,
             params=data,
             path=self.DAY,
+            deadline=deadline,
         )
         self.logger.debug("Метод вернул: %s.", result)
         return result
 
     async def get_intraday_candles(
-        self, req_candles: IntraDayCandlesRequest
+        self,
+        req_candles: IntraDayCandlesRequest,
+        deadline: float | None = None,
     ) -> IntraDayCandles:
         """
         Получение внутридневных свечей.
 
         :param req_candles: Модель запроса на получение дневных свечей.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель дневных свечей.
         """
@@ -62,6 +78,137 @@ class Candles(BaseObjClient):
             resp_model=IntraDayCandles,
             params=data,
             path=self.INTRADAY,
+            deadline=deadline,
         )
         self.logger.debug("Метод вернул: %s", result)
         return result
+
+    def prepare(self, req_candles: CandlesRequest) -> "PreparedCandlesQuery":
+        """
+        Подготовка повторно используемого запроса свечей.
+
+        :param req_candles: Модель запроса свечей. Значения from_, to
+          и count в ней используются по умолчанию.
+
+        :return: Подготовленный запрос.
+        """
+        self.logger.debug(
+            "Метод запущен с параметрами: req_candles=%s.", req_candles
+        )
+        return PreparedCandlesQuery(self, req_candles)
+
+
+class PreparedCandlesQuery:
+    """
+    Подготовленный запрос свечей.
+
+    Модель запроса валидируется и сериализуется один раз.
+    При каждом вызове проверяются и кодируются только
+    Interval.From, Interval.To и Interval.Count.
+
+    :param candles: Экземпляр класса для работы со свечами;
+    :param req_candles: модель запроса свечей.
+    """
+
+    __slots__ = (
+        "__candles",
+        "__model_type",
+        "__params",
+        "__path",
+        "__resp_model",
+        "__type",
+        "__adapter",
+        "__from",
+        "__to",
+    )
+    logger = logging.getLogger("finam_rest_client.PreparedCandlesQuery")
+
+    def __init__(self, candles: Candles, req_candles: CandlesRequest):
+        self.__candles = candles
+        self.__model_type = type(req_candles)
+        self.__params = candles.create_data(req_candles)
+        self.__from = req_candles.from_
+        self.__to = req_candles.to
+        if isinstance(req_candles, DayCandlesRequest):
+            self.__path = candles.DAY
+            self.__resp_model: type[DayCandles | IntraDayCandles] = DayCandles
+            self.__type: type[date] = date
+        else:
+            self.__path = candles.INTRADAY
+            self.__resp_model = IntraDayCandles
+            self.__type = datetime
+        self.__adapter = TypeAdapter(self.__type)
+
+    @property
+    def params(self) -> dict[str, Any]:
+        """Подготовленные параметры запроса."""
+        return dict(self.__params)
+
+    def build_params(
+        self,
+        from_: date | datetime | None = None,
+        to: date | datetime | None = None,
+        count: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Сборка параметров запроса.
+
+        Переданные значения заменяют подготовленные.
+
+        :param from_: Начало интервала;
+        :param to: конец интервала;
+        :param count: количество свечей.
+
+        :raise ValueError: Если значения не прошли проверку.
+
+        :return: Параметры запроса.
+        """
+        params = dict(self.__params)
+        if from_ is None:
+            from_ = self.__from
+        else:
+            from_, params["Interval.From"] = self.__encode(from_)
+        if to is None:
+            to = self.__to
+        else:
+            to, params["Interval.To"] = self.__encode(to)
+        if from_ is not None and to is not None:
+            self.__model_type.check_interval(from_, to)
+        if count is not None:
+            if not 1 <= count <= 500:
+                raise ValueError("count must be between 1 and 500.")
+            params["Interval.Count"] = count
+        return params
+
+    async def fetch(
+        self,
+        from_: date | datetime | None = None,
+        to: date | datetime | None = None,
+        count: int | None = None,
+        deadline: float | None = None,
+    ) -> DayCandles | IntraDayCandles:
+        """
+        Получение свечей по подготовленному запросу.
+
+        :param from_: Начало интервала;
+        :param to: конец интервала;
+        :param count: количество свечей;
+        :param deadline: крайний срок получения ответа,
+          момент по time.monotonic().
+
+        :return: Свечи.
+        """
+        params = self.build_params(from_=from_, to=to, count=count)
+        self.logger.debug("Запрос свечей с параметрами: %s.", params)
+        return await self.__candles._execute_request(
+            resp_model=self.__resp_model,
+            params=params,
+            path=self.__path,
+            deadline=deadline,
+        )
+
+    def __encode(self, value: date | datetime) -> tuple[date, str]:
+        """Проверка и кодирование даты так же, как это делает модель."""
+        if type(value) is not self.__type:
+            value = self.__adapter.validate_python(value)
+        return value, to_jsonable_python(value)
@@ -0,0 +1,268 @@
+"""Автоматические выключатели по семействам запросов."""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from enum import Enum
+
+from finam_rest_client.exceptions import CircuitOpenException
+
+
+class BreakerState(str, Enum):
+    """
+    Состояние автоматического выключателя.
+
+    Значения:
+
+        - closed - запросы отправляются;
+        - open - запросы отклоняются без отправки;
+        - half_open - разрешены пробные запросы.
+    """
+
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+StateCallback = Callable[[str, BreakerState, BreakerState], None]
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель одного семейства запросов.
+
+    Учитывает результаты последних window запросов. Ошибкой
+    считается запрос, завершившийся исключением (сетевая ошибка,
+    таймаут, ответ не в json), медленным - запрос дольше
+    slow_call_duration. Ответы Api с ошибкой в json ошибками
+    не считаются.
+
+    Когда накоплено min_calls результатов и доля ошибок
+    или медленных запросов достигла порога, выключатель
+    размыкается на open_timeout секунд. Затем разрешаются
+    half_open_calls пробных запросов: если все успешны,
+    выключатель замыкается, иначе снова размыкается.
+
+    :param family: Семейство запросов;
+    :param failure_rate: порог доли ошибок;
+    :param slow_call_rate: порог доли медленных запросов;
+    :param slow_call_duration: длительность медленного запроса
+      (секунды). None - не учитывать задержку;
+    :param window: количество учитываемых запросов;
+    :param min_calls: минимальное количество запросов для оценки;
+    :param open_timeout: время в разомкнутом состоянии (секунды);
+    :param half_open_calls: количество пробных запросов;
+    :param on_state_change: функция, вызываемая при смене
+      состояния с аргументами (family, старое, новое).
+    """
+
+    __slots__ = (
+        "__family",
+        "__failure_rate",
+        "__slow_call_rate",
+        "__slow_call_duration",
+        "__min_calls",
+        "__open_timeout",
+        "__half_open_calls",
+        "__on_state_change",
+        "__state",
+        "__opened_at",
+        "__window",
+        "__failures",
+        "__slow_calls",
+        "__probes",
+        "__probe_successes",
+    )
+    logger = logging.getLogger("finam_rest_client.CircuitBreaker")
+
+    def __init__(
+        self,
+        family: str,
+        *,
+        failure_rate: float = 0.5,
+        slow_call_rate: float = 0.8,
+        slow_call_duration: float | None = None,
+        window: int = 20,
+        min_calls: int = 10,
+        open_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        on_state_change: StateCallback | None = None,
+    ):
+        self.__family = family
+        self.__failure_rate = failure_rate
+        self.__slow_call_rate = slow_call_rate
+        self.__slow_call_duration = slow_call_duration
+        self.__min_calls = min_calls
+        self.__open_timeout = open_timeout
+        self.__half_open_calls = half_open_calls
+        self.__on_state_change = on_state_change
+        self.__state = BreakerState.closed
+        self.__opened_at = 0.0
+        self.__window: deque[tuple[bool, bool]] = deque(maxlen=window)
+        self.__failures = 0
+        self.__slow_calls = 0
+        self.__probes = 0
+        self.__probe_successes = 0
+
+    @property
+    def family(self) -> str:
+        """Семейство запросов."""
+        return self.__family
+
+    @property
+    def state(self) -> BreakerState:
+        """Текущее состояние."""
+        if (
+            self.__state == BreakerState.open
+            and time.monotonic() - self.__opened_at >= self.__open_timeout
+        ):
+            self.__set_state(BreakerState.half_open)
+        return self.__state
+
+    @property
+    def failure_rate(self) -> float:
+        """Доля ошибок среди учитываемых запросов."""
+        return self.__failures / len(self.__window) if self.__window else 0.0
+
+    @property
+    def slow_call_rate(self) -> float:
+        """Доля медленных среди учитываемых запросов."""
+        return self.__slow_calls / len(self.__window) if self.__window else 0.0
+
+    @property
+    def retry_after(self) -> float:
+        """Через сколько секунд будет разрешен пробный запрос."""
+        if self.state != BreakerState.open:
+            return 0.0
+        elapsed = time.monotonic() - self.__opened_at
+        return max(0.0, self.__open_timeout - elapsed)
+
+    def check(self) -> None:
+        """
+        Проверка, может ли запрос быть отправлен.
+
+        :raise CircuitOpenException: Если выключатель разомкнут
+          или все пробные запросы уже отправлены.
+        """
+        state = self.state
+        if state == BreakerState.open or (
+            state == BreakerState.half_open
+            and self.__probes >= self.__half_open_calls
+        ):
+            raise CircuitOpenException(self.__family, self.retry_after)
+
+    def before_call(self) -> None:
+        """
+        Регистрация отправки запроса.
+
+        :raise CircuitOpenException: См. check.
+        """
+        self.check()
+        if self.__state == BreakerState.half_open:
+            self.__probes += 1
+
+    def record(self, duration: float, failed: bool) -> None:
+        """
+        Учет результата запроса.
+
+        :param duration: Длительность запроса (секунды);
+        :param failed: запрос завершился ошибкой.
+        """
+        slow = (
+            self.__slow_call_duration is not None
+            and duration >= self.__slow_call_duration
+        )
+        if self.__state == BreakerState.half_open:
+            self.__probes = max(0, self.__probes - 1)
+            if failed or slow:
+                self.__set_state(BreakerState.open)
+                return
+            self.__probe_successes += 1
+            if self.__probe_successes >= self.__half_open_calls:
+                self.__set_state(BreakerState.closed)
+            return
+        if self.__state == BreakerState.open:
+            return
+        window = self.__window
+        if len(window) == window.maxlen:
+            old_failed, old_slow = window[0]
+            self.__failures -= old_failed
+            self.__slow_calls -= old_slow
+        window.append((failed, slow))
+        self.__failures += failed
+        self.__slow_calls += slow
+        if len(window) >= self.__min_calls and (
+            self.failure_rate >= self.__failure_rate
+            or self.slow_call_rate >= self.__slow_call_rate
+        ):
+            self.__set_state(BreakerState.open)
+
+    def release(self) -> None:
+        """Отмена регистрации запроса, результат которого не получен."""
+        if self.__state == BreakerState.half_open:
+            self.__probes = max(0, self.__probes - 1)
+
+    def reset(self) -> None:
+        """Замыкание выключателя и очистка статистики."""
+        self.__set_state(BreakerState.closed)
+
+    def __set_state(self, state: BreakerState) -> None:
+        old, self.__state = self.__state, state
+        if state == BreakerState.open:
+            self.__opened_at = time.monotonic()
+        if state == BreakerState.half_open:
+            self.__probes = self.__probe_successes = 0
+        if state == BreakerState.closed:
+            self.__window.clear()
+            self.__failures = self.__slow_calls = 0
+        if old == state:
+            return
+        level = logging.WARNING if state == BreakerState.open else logging.INFO
+        self.logger.log(
+            level,
+            "Выключатель %s: %s -> %s (ошибки %.2f, медленные %.2f).",
+            self.__family,
+            old.value,
+            state.value,
+            self.failure_rate,
+            self.slow_call_rate,
+        )
+        if self.__on_state_change:
+            try:
+                self.__on_state_change(self.__family, old, state)
+            except Exception:
+                self.logger.exception("Ошибка в обработчике смены состояния.")
+
+
+class CircuitBreakers:
+    """
+    Набор автоматических выключателей по семействам запросов.
+
+    Выключатели создаются при первом запросе семейства
+    с общими настройками.
+
+    :param options: Аргументы CircuitBreaker.
+    """
+
+    __slots__ = "__options", "__breakers"
+
+    def __init__(self, **options):
+        self.__options = options
+        self.__breakers: dict[str, CircuitBreaker] = {}
+
+    def __getitem__(self, family: str) -> CircuitBreaker:
+        """Выключатель семейства запросов."""
+        breaker = self.__breakers.get(family)
+        if breaker is None:
+            breaker = CircuitBreaker(family, **self.__options)
+            self.__breakers[family] = breaker
+        return breaker
+
+    def __iter__(self) -> Iterator[CircuitBreaker]:
+        """Перебор созданных выключателей."""
+        return iter(list(self.__breakers.values()))
+
+    def states(self) -> dict[str, BreakerState]:
+        """Состояния выключателей по семействам запросов."""
+        return {family: b.state for family, b in self.__breakers.items()}
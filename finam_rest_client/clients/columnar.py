@@ -0,0 +1,296 @@
+"""
+Колоночные пакеты Arrow из ответов Api и запись в Arrow IPC и Parquet.
+
+Пакеты собираются по столбцам: для каждого поля значения
+выбираются из моделей одним проходом и передаются в pyarrow
+массивом, без промежуточных словарей строк. FinamDecimal
+и Decimal хранятся двумя целочисленными столбцами <поле>_num
+(мантисса) и <поле>_scale (степень), значение равно
+num * 10^(-scale).
+
+Требуется pyarrow: poetry install --with arrow.
+"""
+
+import os
+from collections.abc import Sequence
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any
+
+from finam_rest_client.models.response_models.candles import (
+    DayCandle,
+    IntraDayCandle,
+)
+from finam_rest_client.models.response_models.securities import Security
+
+#: Форматы файлов и расширения.
+COLUMNAR_FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+_PRICES = ("open", "high", "low", "close")
+
+
+def import_pyarrow() -> Any:
+    """
+    Импорт pyarrow.
+
+    :raise ImportError: Если pyarrow не установлен.
+    """
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "Для пакетов Arrow и Parquet установите pyarrow: "
+            "poetry install --with arrow."
+        ) from exc
+    return pyarrow
+
+
+def candles_schema(intraday: bool = False, instrument: bool = False) -> Any:
+    """
+    Схема пакета свечей.
+
+    :param intraday: Внутридневные свечи: столбец timestamp
+      вместо date;
+    :param instrument: добавить столбцы board и code.
+    """
+    pa = import_pyarrow()
+    fields = []
+    if instrument:
+        fields += [
+            pa.field("board", pa.string()),
+            pa.field("code", pa.string()),
+        ]
+    if intraday:
+        fields.append(pa.field("timestamp", pa.timestamp("s", tz="UTC")))
+    else:
+        fields.append(pa.field("date", pa.date32()))
+    for name in _PRICES:
+        fields.append(pa.field(f"{name}_num", pa.int64()))
+        fields.append(pa.field(f"{name}_scale", pa.int8()))
+    fields.append(pa.field("volume", pa.int64()))
+    return pa.schema(fields)
+
+
+def candles_batch(
+    candles: Sequence[DayCandle | IntraDayCandle],
+    *,
+    intraday: bool | None = None,
+    board: str | None = None,
+    code: str | None = None,
+) -> Any:
+    """
+    Пакет Arrow из свечей.
+
+    :param candles: Свечи ответа (data.candles);
+    :param intraday: внутридневные свечи. None - определить
+      по первой свече (для пустого списка - дневные);
+    :param board: режим торгов для столбца board;
+    :param code: код инструмента для столбца code. Столбцы
+      board и code добавляются, если указан board или code.
+
+    :return: RecordBatch со схемой candles_schema.
+    """
+    pa = import_pyarrow()
+    if intraday is None:
+        intraday = bool(candles) and isinstance(candles[0], IntraDayCandle)
+    instrument = board is not None or code is not None
+    schema = candles_schema(intraday, instrument)
+    size = len(candles)
+    arrays = []
+    if instrument:
+        arrays.append(pa.repeat(pa.scalar(board, pa.string()), size))
+        arrays.append(pa.repeat(pa.scalar(code, pa.string()), size))
+    moment = "timestamp" if intraday else "date"
+    arrays.append(
+        pa.array(
+            list(map(attrgetter(moment), candles)),
+            schema.field(moment).type,
+        )
+    )
+    for name in _PRICES:
+        values = list(map(attrgetter(name), candles))
+        arrays.append(pa.array([v.num for v in values], pa.int64()))
+        arrays.append(pa.array([v.scale for v in values], pa.int8()))
+    arrays.append(
+        pa.array(list(map(attrgetter("volume"), candles)), pa.int64())
+    )
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+_SECURITY_STRINGS = (
+    "code",
+    "board",
+    "market",
+    "currency",
+    "short_name",
+    "time_zone_name",
+    "price_sign",
+    "ticker",
+)
+_SECURITY_INTS = ("decimals", "lot_size", "min_step", "properties")
+_SECURITY_DECIMALS = ("bp_cost", "accrued_interest")
+
+
+def securities_schema() -> Any:
+    """Схема пакета инструментов."""
+    pa = import_pyarrow()
+    fields = [pa.field(name, pa.string()) for name in _SECURITY_STRINGS]
+    fields += [pa.field(name, pa.int64()) for name in _SECURITY_INTS]
+    fields.append(pa.field("lot_divider", pa.int64()))
+    for name in _SECURITY_DECIMALS:
+        fields.append(pa.field(f"{name}_num", pa.int64()))
+        fields.append(pa.field(f"{name}_scale", pa.int8()))
+    return pa.schema(fields)
+
+
+def securities_batch(securities: Sequence[Security]) -> Any:
+    """
+    Пакет Arrow из инструментов.
+
+    Перечисления (market, price_sign) записываются значениями.
+
+    :param securities: Инструменты ответа (data.securities).
+
+    :return: RecordBatch со схемой securities_schema.
+    """
+    pa = import_pyarrow()
+    schema = securities_schema()
+    arrays = []
+    for name in _SECURITY_STRINGS:
+        values = list(map(attrgetter(name), securities))
+        if name in ("market", "price_sign"):
+            values = [value.value for value in values]
+        arrays.append(pa.array(values, pa.string()))
+    for name in (*_SECURITY_INTS, "lot_divider"):
+        arrays.append(
+            pa.array(list(map(attrgetter(name), securities)), pa.int64())
+        )
+    for name in _SECURITY_DECIMALS:
+        parts = [
+            _decimal_parts(value)
+            for value in map(attrgetter(name), securities)
+        ]
+        arrays.append(pa.array([num for num, _ in parts], pa.int64()))
+        arrays.append(pa.array([scale for _, scale in parts], pa.int8()))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _decimal_parts(value: Decimal) -> tuple[int, int]:
+    exponent = value.as_tuple().exponent
+    if not isinstance(exponent, int):
+        raise ValueError(f"Not a finite number: {value}.")
+    return int(value.scaleb(-exponent)), -exponent
+
+
+class ColumnarWriter:
+    """
+    Потоковая запись пакетов Arrow в файл Arrow IPC или Parquet.
+
+    Пакеты накапливаются до chunk_rows строк, объединяются
+    и записываются одним пакетом (в Parquet - одной группой
+    строк), поэтому в памяти находится не больше chunk_rows
+    строк, а файл не дробится на мелкие группы по размеру
+    ответа. Схема файла - схема первого пакета.
+
+    :param path: Путь к файлу;
+    :param fmt: формат arrow или parquet;
+    :param chunk_rows: количество строк в записываемом пакете;
+    :param compression: сжатие Parquet.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        fmt: str = "parquet",
+        *,
+        chunk_rows: int = 65_536,
+        compression: str = "zstd",
+    ):
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown format: {fmt}.")
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be greater than 0.")
+        self.__pa = import_pyarrow()
+        self.__path = path
+        self.__fmt = fmt
+        self.__chunk_rows = chunk_rows
+        self.__compression = compression
+        self.__buffer: list[Any] = []
+        self.__buffered = 0
+        self.__rows = 0
+        self.__schema: Any = None
+        self.__writer: Any = None
+
+    @property
+    def schema(self) -> Any:
+        """Схема файла. None до первого пакета."""
+        return self.__schema
+
+    @property
+    def rows(self) -> int:
+        """Количество принятых строк."""
+        return self.__rows
+
+    def write(self, batch: Any) -> None:
+        """
+        Запись пакета.
+
+        :param batch: RecordBatch или Table со схемой файла.
+        """
+        if self.__schema is None:
+            self.__schema = batch.schema
+        self.__buffer.append(batch)
+        self.__buffered += batch.num_rows
+        self.__rows += batch.num_rows
+        if self.__buffered >= self.__chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Запись накопленных пакетов."""
+        if not self.__buffer:
+            return
+        pa = self.__pa
+        table = pa.Table.from_batches(
+            [
+                batch
+                for item in self.__buffer
+                for batch in (
+                    item.to_batches() if isinstance(item, pa.Table) else [item]
+                )
+            ],
+            schema=self.__schema,
+        ).combine_chunks()
+        self.__buffer = []
+        self.__buffered = 0
+        if self.__writer is None:
+            self.__writer = self.__open()
+        if self.__fmt == "parquet":
+            self.__writer.write_table(table, row_group_size=table.num_rows)
+        else:
+            self.__writer.write_table(table)
+
+    def close(self) -> None:
+        """Запись буфера и закрытие файла."""
+        self.flush()
+        writer, self.__writer = self.__writer, None
+        if writer is not None:
+            writer.close()
+
+    def __enter__(self):
+        """Вход в менеджер контекста."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Выход из менеджера контекста."""
+        self.close()
+
+    def __open(self) -> Any:
+        if self.__fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(
+                str(self.__path),
+                self.__schema,
+                compression=self.__compression,
+            )
+        return self.__pa.ipc.new_file(str(self.__path), self.__schema)
@@ -0,0 +1,204 @@
+"""Адаптивное ограничение количества одновременных запросов."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Разбор заголовка Retry-After.
+
+    :param value: Значение заголовка: секунды или дата HTTP.
+
+    :return: Пауза в секундах или None, если заголовка нет
+      или он не распознан.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (moment - datetime.now(UTC)).total_seconds())
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Ограничитель одновременных запросов по алгоритму AIMD.
+
+    Окно (количество одновременных запросов) растет на
+    increase за каждые limit успешных запросов, пока задержка
+    не превышает latency_threshold. При ответе 429, заголовке
+    Retry-After или ошибке запроса окно умножается на decrease,
+    но не чаще раза в cooldown секунд. Если передан Retry-After,
+    новые запросы не отправляются до его истечения.
+
+    :param initial: Начальное окно;
+    :param min_limit: минимальное окно;
+    :param max_limit: максимальное окно;
+    :param increase: прирост окна за limit успешных запросов;
+    :param decrease: множитель окна при перегрузке;
+    :param latency_threshold: задержка (секунды), выше которой
+      окно не растет. None - не учитывать задержку;
+    :param cooldown: минимальный интервал между уменьшениями
+      окна (секунды).
+    """
+
+    __slots__ = (
+        "__limit",
+        "__min_limit",
+        "__max_limit",
+        "__increase",
+        "__decrease",
+        "__latency_threshold",
+        "__cooldown",
+        "__in_flight",
+        "__waiters",
+        "__paused_until",
+        "__decreased_at",
+        "__throttled",
+    )
+    logger = logging.getLogger("finam_rest_client.AdaptiveConcurrencyLimiter")
+
+    def __init__(
+        self,
+        initial: int = 8,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_threshold: float | None = None,
+        cooldown: float = 1.0,
+    ):
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1.")
+        self.__limit = float(min(max(initial, min_limit), max_limit))
+        self.__min_limit = min_limit
+        self.__max_limit = max_limit
+        self.__increase = increase
+        self.__decrease = decrease
+        self.__latency_threshold = latency_threshold
+        self.__cooldown = cooldown
+        self.__in_flight = 0
+        self.__waiters: deque[asyncio.Future] = deque()
+        self.__paused_until = 0.0
+        self.__decreased_at = float("-inf")
+        self.__throttled = 0
+
+    @property
+    def limit(self) -> int:
+        """Текущее окно: допустимое количество одновременных запросов."""
+        return int(self.__limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Количество выполняющихся запросов."""
+        return self.__in_flight
+
+    @property
+    def waiting(self) -> int:
+        """Количество запросов, ожидающих места в окне."""
+        return len(self.__waiters)
+
+    @property
+    def throttled(self) -> int:
+        """Количество ответов о перегрузке Api."""
+        return self.__throttled
+
+    async def acquire(self) -> None:
+        """
+        Дождаться места в окне.
+
+        После получения места выдерживается пауза Retry-After,
+        если она была задана.
+        """
+        if self.__waiters or self.__in_flight >= self.limit:
+            future = asyncio.get_running_loop().create_future()
+            self.__waiters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()
+                else:
+                    self.__waiters.remove(future)
+                raise
+        else:
+            self.__in_flight += 1
+        pause = self.__paused_until - time.monotonic()
+        if pause > 0:
+            try:
+                await asyncio.sleep(pause)
+            except asyncio.CancelledError:
+                self.release()
+                raise
+
+    def release(self) -> None:
+        """Освобождение места в окне."""
+        self.__in_flight -= 1
+        self.__wake()
+
+    def on_success(self, latency: float) -> None:
+        """
+        Учет успешного запроса.
+
+        :param latency: Задержка ответа (секунды).
+        """
+        threshold = self.__latency_threshold
+        if threshold is not None and latency > threshold:
+            return
+        if self.__limit >= self.__max_limit:
+            return
+        old = self.limit
+        self.__limit = min(
+            float(self.__max_limit),
+            self.__limit + self.__increase / self.__limit,
+        )
+        if self.limit != old:
+            self.logger.debug("Окно увеличено: %s.", self.limit)
+            self.__wake()
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        """
+        Учет ответа о перегрузке Api.
+
+        :param retry_after: Пауза из заголовка Retry-After (секунды).
+        """
+        self.__throttled += 1
+        if retry_after:
+            self.__paused_until = max(
+                self.__paused_until, time.monotonic() + retry_after
+            )
+        self.__cut("перегрузка Api")
+
+    def on_error(self) -> None:
+        """Учет запроса, завершившегося ошибкой."""
+        self.__cut("ошибка запроса")
+
+    def __cut(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self.__decreased_at < self.__cooldown:
+            return
+        self.__decreased_at = now
+        self.__limit = max(
+            float(self.__min_limit), self.__limit * self.__decrease
+        )
+        self.logger.warning("Окно уменьшено до %s: %s.", self.limit, reason)
+
+    def __wake(self) -> None:
+        waiters = self.__waiters
+        while waiters and self.__in_flight < self.limit:
+            future = waiters.popleft()
+            if future.done():
+                continue
+            self.__in_flight += 1
+            future.set_result(None)
@@ -0,0 +1,525 @@
+"""Потоковая запись строк выгрузки в CSV, json lines, Arrow и Parquet."""
+
+import csv
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from types import NoneType, UnionType
+from typing import IO, Any, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from finam_rest_client.models.common_types import FinamDecimal
+
+from .columnar import COLUMNAR_FORMATS, ColumnarWriter, import_pyarrow
+
+Row = dict[str, Any]
+#: Столбец таблицы выгрузки: имя и тип значения (str, int,
+#: float или bool).
+Column = tuple[str, type]
+
+#: Форматы выгрузки и расширения файлов.
+FORMATS = {"csv": ".csv", "jsonl": ".jsonl", **COLUMNAR_FORMATS}
+
+
+def format_decimal(value: FinamDecimal) -> str:
+    """
+    Строка десятичного числа FinamDecimal без потери точности.
+
+    :param value: Число.
+    """
+    return f"{Decimal(value.num).scaleb(-value.scale):f}"
+
+
+def model_columns(model: type[BaseModel], prefix: str = "") -> list[Column]:
+    """
+    Столбцы таблицы выгрузки по типу модели.
+
+    Столбцы не зависят от значений: вложенная модель
+    разворачивается в поля через точку и тогда, когда
+    необязательное поле не задано. Совпадают с ключами
+    model_row.
+
+    :param model: Тип модели;
+    :param prefix: префикс имен полей.
+    """
+    columns: list[Column] = []
+    for name, field in model.model_fields.items():
+        key = prefix + name
+        kind = _kind(field.annotation)
+        if _is_nested(kind):
+            columns += model_columns(kind, key + ".")
+        elif kind in (int, float, bool):
+            columns.append((key, kind))
+        else:
+            columns.append((key, str))
+    return columns
+
+
+def model_row(model: BaseModel, prefix: str = "") -> Row:
+    """
+    Плоская строка выгрузки из модели.
+
+    Вложенные модели разворачиваются в поля через точку,
+    FinamDecimal и Decimal записываются строками десятичных
+    чисел, даты - в ISO 8601, перечисления - значениями,
+    списки и словари - строкой json. Поля незаданной
+    вложенной модели равны None, поэтому набор ключей
+    одинаков для всех моделей типа (model_columns).
+
+    :param model: Модель ответа;
+    :param prefix: префикс имен полей.
+
+    :return: Поля модели по именам.
+    """
+    row: Row = {}
+    for name, field in type(model).model_fields.items():
+        value = getattr(model, name)
+        key = prefix + name
+        if isinstance(value, FinamDecimal):
+            row[key] = format_decimal(value)
+        elif isinstance(value, BaseModel):
+            row.update(model_row(value, key + "."))
+        elif value is None and _is_nested(kind := _kind(field.annotation)):
+            row.update(
+                dict.fromkeys(
+                    column for column, _ in model_columns(kind, key + ".")
+                )
+            )
+        else:
+            row[key] = _scalar(value)
+    return row
+
+
+def _kind(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        return args[0] if len(args) == 1 else object
+    return annotation
+
+
+def _is_nested(kind: Any) -> bool:
+    return (
+        isinstance(kind, type)
+        and issubclass(kind, BaseModel)
+        and not issubclass(kind, FinamDecimal)
+    )
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return f"{value:f}"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return model_row(value)
+    return _scalar(value)
+
+
+class RowWriter(ABC):
+    """
+    Запись строк выгрузки в один файл.
+
+    :param path: Путь к файлу;
+    :param columns: столбцы таблицы (model_columns). None -
+      по первой строке или первому пакету.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        columns: Sequence[Column] | None = None,
+    ):
+        self._path = path
+        self._columns = None if columns is None else list(columns)
+        self._rows = 0
+
+    @property
+    def path(self) -> str | os.PathLike:
+        """Путь к файлу."""
+        return self._path
+
+    @property
+    def rows(self) -> int:
+        """Количество записанных строк."""
+        return self._rows
+
+    @abstractmethod
+    def write(self, rows: list[Row]) -> None:
+        """Запись строк."""
+
+    def write_batch(self, batch: Any) -> None:
+        """
+        Запись пакета Arrow.
+
+        Для строковых форматов пакет преобразуется в строки.
+        """
+        self.write(batch.to_pylist())
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Запись буферов в файл."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Запись буферов и закрытие файла."""
+
+
+class CsvRowWriter(RowWriter):
+    """
+    Запись строк в CSV.
+
+    Заголовок - имена столбцов columns, без них - поля первой
+    строки. Строка с полем не из заголовка вызывает ValueError.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        columns: Sequence[Column] | None = None,
+    ):
+        super().__init__(path, columns)
+        self.__file: IO[str] = open(path, "w", encoding="utf-8", newline="")
+        self.__writer: csv.DictWriter | None = None
+
+    def write(self, rows: list[Row]) -> None:
+        """Запись строк."""
+        if not rows:
+            return
+        if self.__writer is None:
+            if self._columns is None:
+                fieldnames = list(rows[0])
+            else:
+                fieldnames = [name for name, _ in self._columns]
+            self.__writer = csv.DictWriter(self.__file, fieldnames)
+            self.__writer.writeheader()
+        self.__writer.writerows(rows)
+        self._rows += len(rows)
+
+    def flush(self) -> None:
+        """Запись буфера в файл: записанные строки можно прочитать."""
+        self.__file.flush()
+
+    def close(self) -> None:
+        """Закрытие файла."""
+        self.__file.close()
+
+
+class JsonLinesRowWriter(RowWriter):
+    """Запись строк в json lines: один объект на строку."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        columns: Sequence[Column] | None = None,
+    ):
+        super().__init__(path, columns)
+        self.__file: IO[str] = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: list[Row]) -> None:
+        """Запись строк."""
+        self.__file.writelines(
+            json.dumps(row, ensure_ascii=False) + "\n" for row in rows
+        )
+        self._rows += len(rows)
+
+    def flush(self) -> None:
+        """Запись буфера в файл: записанные строки можно прочитать."""
+        self.__file.flush()
+
+    def close(self) -> None:
+        """Закрытие файла."""
+        self.__file.close()
+
+
+class ArrowRowWriter(RowWriter):
+    """
+    Запись строк в файл Arrow IPC или Parquet (ColumnarWriter).
+
+    Строки накапливаются до batch_size и преобразуются в пакет,
+    поэтому в памяти находится не больше одного пакета. Схема
+    строится по columns, без них - по первому пакету (столбец,
+    пустой во всем первом пакете, получит тип null). Готовые
+    пакеты (например, candles_batch) принимает write_batch.
+    Требуется pyarrow.
+
+    :param path: Путь к файлу;
+    :param batch_size: количество строк в пакете;
+    :param fmt: формат arrow или parquet;
+    :param columns: столбцы таблицы (model_columns).
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        batch_size: int = 10_000,
+        fmt: str = "arrow",
+        columns: Sequence[Column] | None = None,
+    ):
+        super().__init__(path, columns)
+        self.__writer = ColumnarWriter(path, fmt, chunk_rows=batch_size)
+        self.__batch_size = batch_size
+        self.__buffer: list[Row] = []
+        self.__schema = None if columns is None else _arrow_schema(columns)
+
+    def write(self, rows: list[Row]) -> None:
+        """Запись строк."""
+        self.__buffer.extend(rows)
+        self._rows += len(rows)
+        if len(self.__buffer) >= self.__batch_size:
+            self.__flush()
+
+    def write_batch(self, batch: Any) -> None:
+        """Запись пакета Arrow."""
+        self.__flush()
+        self.__writer.write(batch)
+        self._rows += batch.num_rows
+
+    def flush(self) -> None:
+        """
+        Передача накопленных строк в ColumnarWriter.
+
+        Файл Arrow IPC или Parquet становится читаемым только
+        после close: метаданные записываются при закрытии.
+        """
+        self.__flush()
+
+    def close(self) -> None:
+        """Запись буферов и закрытие файла."""
+        self.__flush()
+        self.__writer.close()
+
+    def __flush(self) -> None:
+        if not self.__buffer:
+            return
+        pa = import_pyarrow()
+        batch = pa.RecordBatch.from_pylist(
+            self.__buffer, schema=self.__schema or self.__writer.schema
+        )
+        self.__buffer = []
+        self.__writer.write(batch)
+
+
+def _arrow_schema(columns: Sequence[Column]) -> Any:
+    pa = import_pyarrow()
+    types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+    return pa.schema(
+        [(name, types.get(kind, pa.string())) for name, kind in columns]
+    )
+
+
+def open_row_writer(
+    path: str | os.PathLike,
+    fmt: str,
+    batch_size: int = 10_000,
+    columns: Sequence[Column] | None = None,
+) -> RowWriter:
+    """
+    Запись строк в файл формата fmt.
+
+    :param path: Путь к файлу;
+    :param fmt: формат из FORMATS;
+    :param batch_size: количество строк в пакете Arrow и Parquet;
+    :param columns: столбцы таблицы (model_columns).
+    """
+    if fmt == "csv":
+        return CsvRowWriter(path, columns)
+    if fmt == "jsonl":
+        return JsonLinesRowWriter(path, columns)
+    if fmt in COLUMNAR_FORMATS:
+        return ArrowRowWriter(path, batch_size, fmt, columns)
+    raise ValueError(f"Unknown format: {fmt}.")
+
+
+class ShardedWriter:
+    """
+    Запись таблицы выгрузки в несколько файлов.
+
+    Строки распределяются по файлам
+    <name>[-<значение shard_by>]-<номер части><расширение>
+    в каталоге directory. Новая часть начинается, когда в файле
+    max_rows строк. Открыто не больше max_open файлов: при
+    превышении закрывается давно не использованный, а строки
+    его сегмента пишутся в следующую часть. Существующие файлы
+    не перезаписываются, номер части увеличивается.
+
+    :param directory: Каталог для файлов;
+    :param name: имя таблицы;
+    :param fmt: формат из FORMATS;
+    :param shard_by: поле строки, по значению которого
+      выбирается файл. None - без разбиения;
+    :param max_rows: максимальное количество строк в файле.
+      None - без ограничения;
+    :param max_open: максимальное количество открытых файлов;
+    :param batch_size: количество строк в пакете Arrow и Parquet;
+    :param columns: столбцы таблицы (model_columns): одинаковые
+      заголовок CSV и схема Arrow во всех файлах.
+    """
+
+    logger = logging.getLogger("finam_rest_client.ShardedWriter")
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        name: str,
+        fmt: str = "csv",
+        *,
+        shard_by: str | None = None,
+        max_rows: int | None = None,
+        max_open: int = 64,
+        batch_size: int = 10_000,
+        columns: Sequence[Column] | None = None,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}.")
+        if max_rows is not None and max_rows < 1:
+            raise ValueError("max_rows must be greater than 0.")
+        if max_open < 1:
+            raise ValueError("max_open must be greater than 0.")
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__name = name
+        self.__fmt = fmt
+        self.__shard_by = shard_by
+        self.__max_rows = max_rows
+        self.__max_open = max_open
+        self.__batch_size = batch_size
+        self.__columns = columns
+        self.__writers: OrderedDict[str, RowWriter] = OrderedDict()
+        self.__parts: dict[str, int] = {}
+        self.__files: list[str] = []
+        self.__rows = 0
+
+    @property
+    def files(self) -> list[str]:
+        """Пути созданных файлов."""
+        return self.__files
+
+    @property
+    def rows(self) -> int:
+        """Количество записанных строк."""
+        return self.__rows
+
+    def write(self, rows: Iterable[Row]) -> None:
+        """
+        Запись строк.
+
+        :param rows: Строки выгрузки.
+        """
+        shards: dict[str, list[Row]] = {}
+        if self.__shard_by is None:
+            shards[""] = list(rows)
+        else:
+            for row in rows:
+                key = _shard_key(row.get(self.__shard_by))
+                shards.setdefault(key, []).append(row)
+        for key, shard in shards.items():
+            self.__write_shard(key, shard, "write")
+
+    def write_batch(self, batch: Any) -> None:
+        """
+        Запись пакета Arrow.
+
+        Пакет делится по значениям столбца shard_by без
+        преобразования в строки. Требуется pyarrow.
+
+        :param batch: RecordBatch, например candles_batch.
+        """
+        if self.__shard_by is None:
+            self.__write_shard("", batch, "write_batch")
+            return
+        import pyarrow.compute as pc
+
+        column = batch.column(self.__shard_by)
+        for value in pc.unique(column).to_pylist():
+            if value is None:
+                mask = pc.is_null(column)
+            else:
+                mask = pc.equal(column, value)
+            self.__write_shard(
+                _shard_key(value), batch.filter(mask), "write_batch"
+            )
+
+    def __write_shard(self, key: str, shard: Any, method: str) -> None:
+        while len(shard):
+            writer = self.__writer(key)
+            size = len(shard)
+            if self.__max_rows is not None:
+                size = min(size, self.__max_rows - writer.rows)
+            getattr(writer, method)(shard[:size])
+            self.__rows += size
+            shard = shard[size:]
+            if self.__max_rows is not None and writer.rows >= self.__max_rows:
+                self.__close(key)
+
+    def flush(self) -> None:
+        """Запись буферов открытых файлов (RowWriter.flush)."""
+        for writer in self.__writers.values():
+            writer.flush()
+
+    def close(self) -> None:
+        """Закрытие всех файлов."""
+        for key in list(self.__writers):
+            self.__close(key)
+
+    def __enter__(self):
+        """Вход в менеджер контекста."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Выход из менеджера контекста."""
+        self.close()
+
+    def __writer(self, key: str) -> RowWriter:
+        writer = self.__writers.get(key)
+        if writer is not None:
+            self.__writers.move_to_end(key)
+            return writer
+        if len(self.__writers) >= self.__max_open:
+            self.__close(next(iter(self.__writers)))
+        path = self.__next_path(key)
+        writer = open_row_writer(
+            path, self.__fmt, self.__batch_size, self.__columns
+        )
+        self.__writers[key] = writer
+        self.__files.append(path)
+        self.logger.debug("Открыт файл %s.", path)
+        return writer
+
+    def __next_path(self, key: str) -> str:
+        stem = f"{self.__name}-{key}" if key else self.__name
+        part = self.__parts.get(key, 0)
+        while True:
+            path = os.path.join(
+                self.__directory, f"{stem}-{part:05d}{FORMATS[self.__fmt]}"
+            )
+            part += 1
+            if not os.path.exists(path):
+                self.__parts[key] = part
+                return path
+
+    def __close(self, key: str) -> None:
+        writer = self.__writers.pop(key)
+        writer.close()
+        self.logger.debug(
+            "Закрыт файл %s: %s строк.", writer.path, writer.rows
+        )
+
+
+def _shard_key(value: Any) -> str:
+    text = "none" if value is None or value == "" else str(value)
+    return "".join(c if c.isalnum() or c in "._" else "_" for c in text)
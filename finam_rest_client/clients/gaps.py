@@ -0,0 +1,291 @@
+"""Поиск и устранение пропусков в локальных рядах свечей."""
+
+import asyncio
+import heapq
+import logging
+from collections.abc import Sequence
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+
+from finam_rest_client.exceptions import BaseApiException
+from finam_rest_client.models.request_models import (
+    DayCandlesRequest,
+    IntraDayCandlesRequest,
+)
+from finam_rest_client.models.response_models.candles import DayCandle
+
+from .calendar import SessionCalendar
+from .history import Candle, TimeFrame
+from .windows import INTRADAY_FRAMES, MAX_CANDLES, as_date, as_datetime
+
+logger = logging.getLogger("finam_rest_client.gaps")
+
+CandlesRequest = DayCandlesRequest | IntraDayCandlesRequest
+
+#: Шаг дневных тайм-фреймов.
+DAY_FRAMES = {"D1": timedelta(days=1), "W1": timedelta(days=7)}
+
+
+class CandleGap(NamedTuple):
+    """
+    Пропуск в ряду свечей.
+
+    Границы - время (дата для дневных тайм-фреймов) первой
+    и последней отсутствующих свечей, включительно.
+    """
+
+    start: date | datetime
+    end: date | datetime
+
+
+class GapRepairResult(NamedTuple):
+    """
+    Итог устранения пропусков.
+
+    :param gaps: Найденные пропуски;
+    :param requests: выполненные запросы;
+    :param inserted: добавлено свечей;
+    :param failed: запросы, завершившиеся ошибкой, и ошибки.
+    """
+
+    gaps: list[CandleGap]
+    requests: list[CandlesRequest]
+    inserted: int
+    failed: list[tuple[CandlesRequest, BaseException]]
+
+
+def candle_time(candle: Candle) -> date | datetime:
+    """Время свечи: дата дневной или момент внутридневной свечи."""
+    return candle.date if isinstance(candle, DayCandle) else candle.timestamp
+
+
+def find_gaps(
+    candles: Sequence[Candle],
+    time_frame: TimeFrame,
+    *,
+    from_: date | datetime | None = None,
+    to: date | datetime | None = None,
+    calendar: SessionCalendar | None = None,
+) -> list[CandleGap]:
+    """
+    Поиск пропусков в ряду свечей.
+
+    Пропуск - интервал между соседними свечами длиннее
+    тайм-фрейма, а также интервалы от from_ до первой и от
+    последней свечи до to. С календарем пропуски, целиком
+    приходящиеся на неторговые дни и время вне сессии,
+    не возвращаются. Свечи, которых не было из-за отсутствия
+    сделок, календарь не различает: такие пропуски будут
+    запрошены, и ответ окажется пустым.
+
+    :param candles: Свечи одного инструмента и тайм-фрейма
+      по возрастанию времени;
+    :param time_frame: тайм-фрейм;
+    :param from_: начало ожидаемого ряда. Для внутридневных
+      тайм-фреймов дата означает начало дня в UTC;
+    :param to: конец ожидаемого ряда (включительно);
+    :param calendar: календарь сессий режима торгов.
+
+    :return: Пропуски по возрастанию времени.
+    """
+    step = _step(time_frame)
+    if time_frame in INTRADAY_FRAMES:
+        if from_ is not None:
+            from_ = as_datetime(from_, time.min)
+        if to is not None:
+            to = as_datetime(to, time(23, 59, 59))
+    else:
+        from_ = None if from_ is None else as_date(from_)
+        to = None if to is None else as_date(to)
+    moments = list(map(candle_time, candles))
+    gaps: list[CandleGap] = []
+
+    def add(start, end) -> None:
+        if start <= end and (
+            calendar is None or calendar.can_have_bars(start, end)
+        ):
+            gaps.append(CandleGap(start, end))
+
+    if not moments:
+        if from_ is not None and to is not None:
+            add(from_, to)
+        return gaps
+    if from_ is not None:
+        add(from_, moments[0] - step)
+    for previous, current in zip(moments, moments[1:]):
+        if current <= previous:
+            raise ValueError("candles must be sorted by time without repeats.")
+        if current - previous > step:
+            add(previous + step, current - step)
+    if to is not None:
+        add(moments[-1] + step, to)
+    return gaps
+
+
+def plan_gap_requests(
+    board: str,
+    code: str,
+    time_frame: TimeFrame,
+    gaps: Sequence[CandleGap],
+    calendar: SessionCalendar | None = None,
+) -> list[CandlesRequest]:
+    """
+    Минимальный набор запросов, закрывающих пропуски.
+
+    Окно запроса начинается с первой незакрытой свечи
+    и продлевается, пока в него помещаются следующие пропуски:
+    окно не длиннее максимального интервала запроса и, для
+    внутридневных тайм-фреймов, MAX_CANDLES свечей. Близкие
+    пропуски закрываются одним запросом, длинные делятся.
+    Окна, в которых по календарю нет торгов, пропускаются.
+
+    :param board: Режим торгов;
+    :param code: код инструмента;
+    :param time_frame: тайм-фрейм;
+    :param gaps: пропуски по возрастанию (find_gaps);
+    :param calendar: календарь сессий режима торгов.
+
+    :return: Модели запросов свечей.
+    """
+    intraday = time_frame in INTRADAY_FRAMES
+    if intraday:
+        unit = timedelta(seconds=1)
+        span = min(
+            INTRADAY_FRAMES[time_frame] * MAX_CANDLES,
+            timedelta(days=IntraDayCandlesRequest.max_interval_days),
+        )
+    else:
+        unit = timedelta(days=1)
+        span = timedelta(days=DayCandlesRequest.max_interval_days)
+    windows: list[tuple] = []
+    for gap in gaps:
+        start = gap.start
+        while start <= gap.end:
+            if windows and start <= windows[-1][2]:
+                first, _, limit = windows.pop()
+                end = min(gap.end, limit)
+            else:
+                first, limit = start, start + span - unit
+                end = min(gap.end, limit)
+            windows.append((first, end, limit))
+            start = end + unit
+    requests: list[CandlesRequest] = []
+    for first, end, _ in windows:
+        if calendar is not None and not calendar.can_have_bars(first, end):
+            continue
+        params = dict(
+            security_board=board,
+            security_code=code,
+            time_frame=time_frame,
+            from_=first,
+            to=end,
+        )
+        if intraday:
+            requests.append(IntraDayCandlesRequest.model_validate(params))
+        else:
+            requests.append(DayCandlesRequest.model_validate(params))
+    return requests
+
+
+def splice_candles(candles: list[Candle], new: Sequence[Candle]) -> int:
+    """
+    Вставка свечей в ряд на место пропусков.
+
+    Свечи, время которых уже есть в ряду, не вставляются.
+    Ряд изменяется на месте и остается упорядоченным.
+
+    :param candles: Ряд свечей по возрастанию времени;
+    :param new: загруженные свечи.
+
+    :return: Количество вставленных свечей.
+    """
+    present = set(map(candle_time, candles))
+    added: dict[date | datetime, Candle] = {}
+    for candle in new:
+        moment = candle_time(candle)
+        if moment not in present:
+            added.setdefault(moment, candle)
+    if not added:
+        return 0
+    inserted = sorted(added.values(), key=candle_time)
+    candles[:] = heapq.merge(candles, inserted, key=candle_time)
+    return len(inserted)
+
+
+async def repair_gaps(
+    client,
+    board: str,
+    code: str,
+    time_frame: TimeFrame,
+    candles: list[Candle],
+    *,
+    from_: date | datetime | None = None,
+    to: date | datetime | None = None,
+    calendar: SessionCalendar | None = None,
+    concurrency: int = 4,
+) -> GapRepairResult:
+    """
+    Поиск и устранение пропусков в ряду свечей.
+
+    Запросы plan_gap_requests выполняются одновременно
+    (не больше concurrency), загруженные свечи вставляются
+    в candles на месте (splice_candles). Ошибка одного запроса
+    не отменяет остальные.
+
+    :param client: Экземпляр клиента;
+    :param board: режим торгов;
+    :param code: код инструмента;
+    :param time_frame: тайм-фрейм;
+    :param candles: ряд свечей по возрастанию времени;
+    :param from_: начало ожидаемого ряда;
+    :param to: конец ожидаемого ряда (включительно);
+    :param calendar: календарь сессий режима торгов;
+    :param concurrency: количество одновременных запросов.
+
+    :return: Итог устранения пропусков.
+    """
+    gaps = find_gaps(
+        candles, time_frame, from_=from_, to=to, calendar=calendar
+    )
+    requests = plan_gap_requests(board, code, time_frame, gaps, calendar)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(request: CandlesRequest) -> list[Candle]:
+        async with semaphore:
+            result = await client.get_candles(
+                code, board, time_frame, from_=request.from_, to=request.to
+            )
+        if result.data is None:
+            raise BaseApiException(f"Ошибка Api: {result.error}.")
+        return result.data.candles
+
+    results = await asyncio.gather(
+        *map(fetch, requests), return_exceptions=True
+    )
+    failed: list[tuple[CandlesRequest, BaseException]] = []
+    loaded: list[Candle] = []
+    for request, result in zip(requests, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            logger.error("Запрос %s не выполнен: %s.", request, result)
+            failed.append((request, result))
+        else:
+            loaded.extend(result)
+    inserted = splice_candles(candles, loaded)
+    logger.info(
+        "%s:%s %s: пропусков %s, запросов %s, вставлено свечей %s.",
+        board,
+        code,
+        time_frame,
+        len(gaps),
+        len(requests),
+        inserted,
+    )
+    return GapRepairResult(gaps, requests, inserted, failed)
+
+
+def _step(time_frame: str) -> timedelta:
+    if time_frame in INTRADAY_FRAMES:
+        return INTRADAY_FRAMES[time_frame]
+    return DAY_FRAMES[time_frame]
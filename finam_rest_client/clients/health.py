@@ -0,0 +1,224 @@
+"""Мониторинг событийного цикла, пулов соединений и запросов."""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
+
+from .base import Lane
+
+Metrics = dict[str, float]
+MetricsCallback = Callable[[Metrics], Awaitable[None] | None]
+ThresholdCallback = Callable[[str, float, float], Awaitable[None] | None]
+
+
+def pool_metrics(session) -> Metrics:
+    """
+    Состояние пула соединений сессии aiohttp.
+
+    :param session: Экземпляр ClientSession.
+
+    :return: Словарь с ключами acquired (занятые соединения),
+      idle (свободные открытые соединения), waiting (запросы,
+      ожидающие соединения) и limit (размер пула, 0 - без
+      ограничения).
+    """
+    connector = session.connector
+    if connector is None:
+        return {"acquired": 0, "idle": 0, "waiting": 0, "limit": 0}
+    # Счетчики пула в aiohttp не публичны, поэтому читаются
+    # с запасными значениями на случай их изменения.
+    conns = getattr(connector, "_conns", {})
+    waiters = getattr(connector, "_waiters", {})
+    return {
+        "acquired": len(getattr(connector, "_acquired", ())),
+        "idle": sum(map(len, conns.values())),
+        "waiting": sum(map(len, waiters.values())),
+        "limit": connector.limit,
+    }
+
+
+class HealthMonitor:
+    """
+    Мониторинг состояния клиента.
+
+    Раз в interval секунд фоновая задача собирает метрики:
+
+    - loop_lag - задержка пробуждения задачи относительно
+      заданного момента (секунды). Большое значение означает,
+      что цикл был занят, например разбором ответа;
+    - in_flight - количество запросов, отправленных в Api
+      и ожидающих ответа;
+    - <полоса>.acquired, <полоса>.idle, <полоса>.waiting,
+      <полоса>.limit - состояние пула соединений полосы
+      (см. pool_metrics);
+    - rate_limiter.waiting - запросы, ожидающие ограничителя
+      частоты, если он задан;
+    - concurrency.limit, concurrency.in_flight,
+      concurrency.waiting - состояние адаптивного ограничителя
+      одновременных запросов, если он задан.
+
+    Метрики передаются подписчикам on_metrics. Если метрика
+    превысила порог из thresholds, вызываются on_threshold
+    с именем метрики, значением и порогом. Повторно обработчики
+    вызываются после того, как значение опустится до порога.
+
+    :param client: Экземпляр клиента;
+    :param interval: интервал сбора метрик (секунды);
+    :param thresholds: пороги метрик по именам,
+      например {"loop_lag": 0.05, "data.waiting": 1};
+    :param on_metrics: обработчики метрик;
+    :param on_threshold: обработчики превышения порога.
+    """
+
+    logger = logging.getLogger("finam_rest_client.HealthMonitor")
+
+    def __init__(
+        self,
+        client,
+        *,
+        interval: float = 1.0,
+        thresholds: Mapping[str, float] | None = None,
+        on_metrics: MetricsCallback | None = None,
+        on_threshold: ThresholdCallback | None = None,
+    ):
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0.")
+        self.__client = client
+        self.__interval = interval
+        self.__thresholds = dict(thresholds or {})
+        self.__metrics_callbacks: list[MetricsCallback] = []
+        self.__threshold_callbacks: list[ThresholdCallback] = []
+        if on_metrics is not None:
+            self.__metrics_callbacks.append(on_metrics)
+        if on_threshold is not None:
+            self.__threshold_callbacks.append(on_threshold)
+        self.__exceeded: set[str] = set()
+        self.__metrics: Metrics = {}
+        self.__max_loop_lag = 0.0
+        self.__task: asyncio.Task | None = None
+
+    @property
+    def metrics(self) -> Metrics:
+        """Последние собранные метрики."""
+        return self.__metrics
+
+    @property
+    def max_loop_lag(self) -> float:
+        """Максимальная задержка цикла с момента запуска (секунды)."""
+        return self.__max_loop_lag
+
+    @property
+    def thresholds(self) -> dict[str, float]:
+        """Пороги метрик по именам."""
+        return self.__thresholds
+
+    @property
+    def running(self) -> bool:
+        """True, если задача мониторинга запущена."""
+        return self.__task is not None and not self.__task.done()
+
+    def on_metrics(self, callback: MetricsCallback) -> None:
+        """Добавление обработчика метрик."""
+        self.__metrics_callbacks.append(callback)
+
+    def on_threshold(self, callback: ThresholdCallback) -> None:
+        """Добавление обработчика превышения порога."""
+        self.__threshold_callbacks.append(callback)
+
+    def start(self) -> None:
+        """Запуск задачи мониторинга."""
+        if self.running:
+            return
+        self.logger.info("Запуск мониторинга: интервал %s с.", self.__interval)
+        self.__max_loop_lag = 0.0
+        self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Остановка задачи мониторинга."""
+        task, self.__task = self.__task, None
+        if task is None:
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        self.logger.info("Мониторинг остановлен.")
+
+    async def __aenter__(self):
+        """Вход в менеджер контекста."""
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Выход из менеджера контекста."""
+        await self.stop()
+
+    def collect(self, loop_lag: float = 0.0) -> Metrics:
+        """
+        Сбор метрик клиента.
+
+        :param loop_lag: Измеренная задержка цикла (секунды).
+
+        :return: Метрики по именам.
+        """
+        client = self.__client
+        metrics: Metrics = {
+            "loop_lag": loop_lag,
+            "in_flight": client.in_flight,
+        }
+        for lane in Lane:
+            try:
+                session = client.get_session(lane)
+            except Exception:
+                continue
+            for name, value in pool_metrics(session).items():
+                metrics[f"{lane.value}.{name}"] = value
+        if client.rate_limiter is not None:
+            metrics["rate_limiter.waiting"] = client.rate_limiter.waiting
+        limiter = client.concurrency_limiter
+        if limiter is not None:
+            metrics["concurrency.limit"] = limiter.limit
+            metrics["concurrency.in_flight"] = limiter.in_flight
+            metrics["concurrency.waiting"] = limiter.waiting
+        return metrics
+
+    async def __run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.__interval
+            await asyncio.sleep(self.__interval)
+            lag = max(0.0, loop.time() - expected)
+            self.__max_loop_lag = max(self.__max_loop_lag, lag)
+            self.__metrics = metrics = self.collect(lag)
+            for callback in self.__metrics_callbacks:
+                await self.__call(callback, metrics)
+            await self.__check(metrics)
+
+    async def __check(self, metrics: Metrics) -> None:
+        for name, threshold in self.__thresholds.items():
+            value = metrics.get(name)
+            if value is None or value <= threshold:
+                self.__exceeded.discard(name)
+                continue
+            if name in self.__exceeded:
+                continue
+            self.__exceeded.add(name)
+            self.logger.warning(
+                "Метрика %s превысила порог: %s > %s.", name, value, threshold
+            )
+            for callback in self.__threshold_callbacks:
+                await self.__call(callback, name, value, threshold)
+
+    async def __call(self, callback: Callable, *args) -> None:
+        started = time.perf_counter()
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exc:
+            self.logger.error("Ошибка обработчика метрик: %s.", exc)
+        elapsed = time.perf_counter() - started
+        if elapsed > self.__interval:
+            self.logger.warning(
+                "Обработчик метрик выполнялся %.3f с.", elapsed
+            )
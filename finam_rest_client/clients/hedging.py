@@ -0,0 +1,141 @@
+"""Дублирующие запросы для снижения задержки чтения."""
+
+import logging
+from collections import deque
+from collections.abc import Iterable
+
+
+class HedgePolicy:
+    """
+    Политика дублирующих (hedged) запросов.
+
+    Если ответ на GET запрос не получен за время, равное
+    процентилю percentile последних задержек этого пути,
+    отправляется второй такой же запрос и используется
+    ответ, пришедший первым.
+
+    Количество дублирующих запросов ограничено бюджетом:
+    каждый запрос пополняет его на budget, дублирующий
+    запрос расходует 1. Так дублирующих запросов не больше
+    доли budget от всех запросов, а нагрузка на Api
+    не может многократно вырасти при его деградации.
+
+    :param percentile: Процентиль задержки (от 0 до 1);
+    :param budget: доля дублирующих запросов;
+    :param max_tokens: максимальный запас бюджета;
+    :param window: количество учитываемых задержек пути;
+    :param min_samples: количество задержек, до накопления
+      которого используется initial_delay;
+    :param initial_delay: задержка перед дублирующим запросом
+      (секунды), пока задержек недостаточно;
+    :param min_delay: минимальная задержка (секунды);
+    :param paths: пути запросов для дублирования.
+      None - все GET запросы.
+    """
+
+    __slots__ = (
+        "__percentile",
+        "__budget",
+        "__max_tokens",
+        "__window",
+        "__min_samples",
+        "__initial_delay",
+        "__min_delay",
+        "__paths",
+        "__latencies",
+        "__tokens",
+        "__requests",
+        "__hedges",
+        "__hedge_wins",
+    )
+    logger = logging.getLogger("finam_rest_client.HedgePolicy")
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        *,
+        max_tokens: float = 10.0,
+        window: int = 200,
+        min_samples: int = 20,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.01,
+        paths: Iterable[str] | None = None,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1.")
+        self.__percentile = percentile
+        self.__budget = budget
+        self.__max_tokens = max_tokens
+        self.__window = window
+        self.__min_samples = min_samples
+        self.__initial_delay = initial_delay
+        self.__min_delay = min_delay
+        self.__paths = None if paths is None else frozenset(paths)
+        self.__latencies: dict[str, deque[float]] = {}
+        self.__tokens = 0.0
+        self.__requests = 0
+        self.__hedges = 0
+        self.__hedge_wins = 0
+
+    @property
+    def requests(self) -> int:
+        """Количество запросов, для которых применялась политика."""
+        return self.__requests
+
+    @property
+    def hedges(self) -> int:
+        """Количество отправленных дублирующих запросов."""
+        return self.__hedges
+
+    @property
+    def hedge_wins(self) -> int:
+        """Количество дублирующих запросов, ответивших первыми."""
+        return self.__hedge_wins
+
+    def applies(self, method: str, path: str) -> bool:
+        """Применяется ли политика к запросу."""
+        if method.lower() != "get":
+            return False
+        return self.__paths is None or path in self.__paths
+
+    def delay(self, path: str) -> float:
+        """
+        Задержка перед дублирующим запросом.
+
+        :param path: Путь запроса.
+
+        :return: Задержка в секундах.
+        """
+        latencies = self.__latencies.get(path)
+        if not latencies or len(latencies) < self.__min_samples:
+            return self.__initial_delay
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.__percentile))
+        return max(self.__min_delay, ordered[index])
+
+    def observe(self, path: str, latency: float) -> None:
+        """Учет задержки успешного запроса."""
+        latencies = self.__latencies.get(path)
+        if latencies is None:
+            latencies = self.__latencies[path] = deque(maxlen=self.__window)
+        latencies.append(latency)
+
+    def on_request(self) -> None:
+        """Пополнение бюджета при отправке запроса."""
+        self.__requests += 1
+        self.__tokens = min(self.__max_tokens, self.__tokens + self.__budget)
+
+    def can_hedge(self) -> bool:
+        """Хватает ли бюджета на дублирующий запрос."""
+        return self.__tokens >= 1
+
+    def spend(self) -> None:
+        """Расход бюджета на дублирующий запрос."""
+        self.__tokens -= 1
+        self.__hedges += 1
+
+    def record_win(self, hedge: bool) -> None:
+        """Учет запроса, ответившего первым."""
+        if hedge:
+            self.__hedge_wins += 1
@@ -0,0 +1,467 @@
+"""Массовая загрузка истории свечей с продолжением."""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import random
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, datetime, time
+from typing import IO, Literal, NamedTuple
+
+from finam_rest_client.exceptions import BaseApiException
+from finam_rest_client.models.response_models.candles import (
+    DayCandle,
+    IntraDayCandle,
+)
+from finam_rest_client.models.response_models.securities import Security
+
+from .calendar import SessionCalendar, SessionCalendars
+from .export import format_decimal
+from .windows import (
+    INTRADAY_FRAMES,
+    as_date,
+    as_datetime,
+    plan_intraday_windows,
+    plan_windows,
+)
+
+TimeFrame = Literal["M1", "M5", "M15", "H1", "D1", "W1"]
+Candle = DayCandle | IntraDayCandle
+CandlesCallback = Callable[
+    ["HistoryWindow", list[Candle]], Awaitable[None] | None
+]
+
+
+class HistoryWindow(NamedTuple):
+    """
+    Окно загрузки: инструмент и интервал (включительно).
+
+    Для дневных тайм-фреймов границы - даты, для внутридневных -
+    моменты времени в UTC.
+    """
+
+    board: str
+    code: str
+    from_: date | datetime
+    to: date | datetime
+
+    @property
+    def key(self) -> str:
+        """Ключ окна в файле контрольной точки."""
+        return (
+            f"{self.board}:{self.code}:"
+            f"{self.from_.isoformat()}:{self.to.isoformat()}"
+        )
+
+
+class HistoryJobResult(NamedTuple):
+    """
+    Итог загрузки.
+
+    :param windows: Количество окон;
+    :param done: загружено окон;
+    :param skipped: пропущено окон, загруженных ранее;
+    :param failed: окна, загрузка которых не удалась,
+      и последняя ошибка.
+    """
+
+    windows: int
+    done: int
+    skipped: int
+    failed: list[tuple[HistoryWindow, BaseException]]
+
+
+class HistoryCheckpoint:
+    """
+    Файл контрольной точки загрузки.
+
+    Ключи загруженных окон дописываются в файл по одному
+    на строку и сразу сбрасываются на диск, поэтому после
+    сбоя загрузка продолжается с незавершенных окон.
+    Недописанная последняя строка игнорируется.
+
+    :param path: Путь к файлу.
+    """
+
+    logger = logging.getLogger("finam_rest_client.HistoryCheckpoint")
+
+    def __init__(self, path: str | os.PathLike):
+        self.__path = path
+        self.__done: set[str] = set()
+        self.__file: IO[str] | None = None
+        self.__partial = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    if line.endswith("\n"):
+                        self.__done.add(line.rstrip("\n"))
+                    else:
+                        self.__partial = True
+            self.logger.info(
+                "Загружена контрольная точка: %s окон.", len(self.__done)
+            )
+
+    def __len__(self) -> int:
+        """Количество загруженных окон."""
+        return len(self.__done)
+
+    def __contains__(self, window: object) -> bool:
+        """Проверка, загружено ли окно."""
+        return isinstance(window, HistoryWindow) and window.key in self.__done
+
+    def mark(self, window: HistoryWindow) -> None:
+        """Отметка окна загруженным."""
+        if window.key in self.__done:
+            return
+        if self.__file is None:
+            self.__file = open(self.__path, "a", encoding="utf-8")
+            if self.__partial:
+                # Недописанная строка завершается, чтобы не склеить
+                # ее со следующим ключом.
+                self.__file.write("\n")
+                self.__partial = False
+        self.__file.write(window.key + "\n")
+        self.__file.flush()
+        self.__done.add(window.key)
+
+    def close(self) -> None:
+        """Закрытие файла."""
+        file, self.__file = self.__file, None
+        if file is not None:
+            file.close()
+
+
+class BulkHistoryJob:
+    """
+    Загрузка свечей по всем инструментам.
+
+    Инструменты берутся из get_securities и отбираются по boards,
+    markets и security_filter. Интервал каждого инструмента
+    разбивается на окна (plan_windows для дневных тайм-фреймов,
+    plan_intraday_windows для внутридневных; даты внутридневного
+    интервала берутся целиком в UTC), окна обрабатываются
+    concurrency задачами. Частота запросов ограничивается
+    ограничителями клиента (rate_limiter, concurrency_limiter).
+
+    Свечи каждого окна передаются в on_candles, после чего окно
+    отмечается в контрольной точке. При повторном запуске с той
+    же контрольной точкой загруженные окна пропускаются. Окно,
+    обработка которого прервалась между on_candles и отметкой,
+    будет загружено повторно.
+
+    :param client: Экземпляр клиента;
+    :param from_: начало интервала;
+    :param to: конец интервала;
+    :param on_candles: обработчик свечей окна;
+    :param time_frame: тайм-фрейм;
+    :param boards: режимы торгов. None - все;
+    :param markets: рынки. None - все;
+    :param security_filter: дополнительный отбор инструментов;
+    :param checkpoint: путь к файлу контрольной точки.
+      None - не сохранять прогресс;
+    :param concurrency: количество одновременно загружаемых окон;
+    :param retries: количество повторов окна при ошибке;
+    :param backoff: пауза перед первым повтором (секунды);
+    :param calendars: календари сессий режимов торгов. Окна,
+      в которых по календарю не может быть свечей, не
+      запрашиваются. Для внутридневных тайм-фреймов календари
+      режимов торгов, которых нет в calendars, перед загрузкой
+      строятся по истории (SessionCalendars.learn)
+      calendar_securities инструментов режима с наибольшим
+      оборотом среди первых calendar_candidates
+      (SessionCalendars.rank_by_turnover). Количество
+      пропущенных по календарю окон выводится в журнал;
+    :param calendar_securities: количество инструментов
+      для построения календаря;
+    :param calendar_candidates: количество инструментов режима,
+      среди которых выбираются самые ликвидные.
+    """
+
+    logger = logging.getLogger("finam_rest_client.BulkHistoryJob")
+
+    def __init__(
+        self,
+        client,
+        from_: date | datetime,
+        to: date | datetime,
+        on_candles: CandlesCallback,
+        *,
+        time_frame: TimeFrame = "D1",
+        boards: Iterable[str] | None = None,
+        markets: Iterable[str] | None = None,
+        security_filter: Callable[[Security], bool] | None = None,
+        checkpoint: str | os.PathLike | None = None,
+        concurrency: int = 8,
+        retries: int = 3,
+        backoff: float = 1.0,
+        calendars: SessionCalendars | None = None,
+        calendar_securities: int = 3,
+        calendar_candidates: int = 20,
+    ):
+        if from_ > to:
+            raise ValueError("from_ must not be later than to.")
+        self.__client = client
+        self.__from = from_
+        self.__to = to
+        self.__on_candles = on_candles
+        self.__time_frame = time_frame
+        self.__boards = None if boards is None else frozenset(boards)
+        self.__markets = None if markets is None else frozenset(markets)
+        self.__security_filter = security_filter
+        self.__checkpoint_path = checkpoint
+        self.__concurrency = concurrency
+        self.__retries = retries
+        self.__backoff = backoff
+        self.__calendars = calendars
+        self.__calendar_securities = calendar_securities
+        self.__calendar_candidates = calendar_candidates
+
+    def select(self, securities: Iterable[Security]) -> list[Security]:
+        """
+        Отбор инструментов для загрузки.
+
+        :param securities: Инструменты.
+
+        :return: Инструменты, прошедшие фильтры, без повторов.
+        """
+        boards, markets = self.__boards, self.__markets
+        selected: dict[tuple[str, str], Security] = {}
+        for security in securities:
+            if boards is not None and security.board not in boards:
+                continue
+            if markets is not None and security.market.value not in markets:
+                continue
+            if self.__security_filter and not self.__security_filter(security):
+                continue
+            selected.setdefault((security.board, security.code), security)
+        return list(selected.values())
+
+    def plan(self, securities: Iterable[Security]) -> list[HistoryWindow]:
+        """
+        Окна загрузки для инструментов.
+
+        :param securities: Отобранные инструменты.
+        """
+        ranges: dict[str, list] = {}
+        closed: dict[str, int] = {}
+        skipped: dict[str, int] = {}
+        windows: list[HistoryWindow] = []
+        for security in securities:
+            board = security.board
+            board_ranges = ranges.get(board)
+            if board_ranges is None:
+                calendar = None
+                if self.__calendars is not None:
+                    calendar = self.__calendars.get(board)
+                board_ranges = ranges[board] = self.__ranges(calendar)
+                if calendar is not None:
+                    closed[board] = len(self.__ranges(None)) - len(
+                        board_ranges
+                    )
+            windows.extend(
+                HistoryWindow(board, security.code, start, end)
+                for start, end in board_ranges
+            )
+            if closed.get(board):
+                skipped[board] = skipped.get(board, 0) + closed[board]
+        for board, count in skipped.items():
+            self.logger.info(
+                "Режим %s: по календарю пропущено окон: %s "
+                "(%s на инструмент).",
+                board,
+                count,
+                closed[board],
+            )
+        return windows
+
+    def __ranges(self, calendar: SessionCalendar | None) -> list:
+        if self.__time_frame in INTRADAY_FRAMES:
+            return list(
+                plan_intraday_windows(
+                    as_datetime(self.__from, time.min),
+                    as_datetime(self.__to, time(23, 59, 59)),
+                    self.__time_frame,
+                    calendar,
+                )
+            )
+        return list(
+            plan_windows(
+                as_date(self.__from),
+                as_date(self.__to),
+                calendar=calendar,
+            )
+        )
+
+    async def run(self) -> HistoryJobResult:
+        """
+        Запуск загрузки.
+
+        :raise BaseApiException: Если не удалось получить
+          список инструментов.
+
+        :return: Итог загрузки.
+        """
+        response = await self.__client.get_securities()
+        if response.data is None:
+            raise BaseApiException(
+                f"Не удалось получить инструменты: {response.error}."
+            )
+        securities = self.select(response.data.securities)
+        if self.__calendars is not None and (
+            self.__time_frame in INTRADAY_FRAMES
+        ):
+            await self.__learn_calendars(securities)
+        windows = self.plan(securities)
+        checkpoint = None
+        if self.__checkpoint_path is not None:
+            checkpoint = HistoryCheckpoint(self.__checkpoint_path)
+        queue: asyncio.Queue[HistoryWindow] = asyncio.Queue()
+        skipped = 0
+        for window in windows:
+            if checkpoint is not None and window in checkpoint:
+                skipped += 1
+            else:
+                queue.put_nowait(window)
+        self.logger.info(
+            "Инструментов: %s, окон: %s, загружено ранее: %s.",
+            len(securities),
+            len(windows),
+            skipped,
+        )
+        failed: list[tuple[HistoryWindow, BaseException]] = []
+        done = [0]
+        workers = [
+            asyncio.create_task(self.__worker(queue, checkpoint, done, failed))
+            for _ in range(min(self.__concurrency, queue.qsize()))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            if checkpoint is not None:
+                checkpoint.close()
+        result = HistoryJobResult(len(windows), done[0], skipped, failed)
+        self.logger.info(
+            "Загрузка завершена: загружено %s, пропущено %s, ошибок %s.",
+            result.done,
+            result.skipped,
+            len(result.failed),
+        )
+        return result
+
+    async def __learn_calendars(self, securities: list[Security]) -> None:
+        calendars = self.__calendars
+        assert calendars is not None
+        boards: dict[str, list[Security]] = {}
+        for security in securities:
+            if security.board not in calendars:
+                boards.setdefault(security.board, []).append(security)
+        for board, board_securities in boards.items():
+            try:
+                liquid = await calendars.rank_by_turnover(
+                    self.__client,
+                    board_securities[: self.__calendar_candidates],
+                    as_date(self.__to),
+                )
+                if not liquid:
+                    self.logger.warning(
+                        "Календарь %s не построен: нет торгов.", board
+                    )
+                    continue
+                await calendars.learn(
+                    self.__client,
+                    liquid[: self.__calendar_securities],
+                    as_date(self.__from),
+                    as_date(self.__to),
+                )
+            except BaseApiException as exc:
+                self.logger.warning(
+                    "Календарь %s не построен: %s.", board, exc
+                )
+
+    async def __worker(
+        self,
+        queue: asyncio.Queue[HistoryWindow],
+        checkpoint: HistoryCheckpoint | None,
+        done: list[int],
+        failed: list[tuple[HistoryWindow, BaseException]],
+    ) -> None:
+        while not queue.empty():
+            window = queue.get_nowait()
+            try:
+                candles = await self.__fetch(window)
+                result = self.__on_candles(window, candles)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                self.logger.error("Окно %s не загружено: %s.", window, exc)
+                failed.append((window, exc))
+                continue
+            if checkpoint is not None:
+                checkpoint.mark(window)
+            done[0] += 1
+
+    async def __fetch(self, window: HistoryWindow) -> list[Candle]:
+        attempt = 0
+        while True:
+            try:
+                result = await self.__client.get_candles(
+                    window.code,
+                    window.board,
+                    self.__time_frame,
+                    from_=window.from_,
+                    to=window.to,
+                )
+                if result.data is None:
+                    raise BaseApiException(f"Ошибка Api: {result.error}.")
+                return result.data.candles
+            except BaseApiException as exc:
+                if attempt >= self.__retries:
+                    raise
+                delay = self.__backoff * 2**attempt * random.uniform(0.5, 1)
+                attempt += 1
+                self.logger.warning(
+                    "Повтор окна %s через %.1f с: %s.", window, delay, exc
+                )
+                await asyncio.sleep(delay)
+
+
+class JsonLinesWriter:
+    """
+    Запись свечей в файлы json lines по инструментам.
+
+    Свечи инструмента дописываются в файл <board>_<code>.jsonl
+    в каталоге directory. Время свечи записывается в поле date
+    для дневных свечей и timestamp для внутридневных, цены -
+    строками десятичных чисел.
+
+    :param directory: Каталог для файлов.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+
+    def __call__(self, window: HistoryWindow, candles: list[Candle]):
+        """Запись свечей окна."""
+        path = os.path.join(
+            self.__directory, f"{window.board}_{window.code}.jsonl"
+        )
+        with open(path, "a", encoding="utf-8") as file:
+            for candle in candles:
+                if isinstance(candle, DayCandle):
+                    moment = {"date": candle.date.isoformat()}
+                else:
+                    moment = {"timestamp": candle.timestamp.isoformat()}
+                row = {
+                    **moment,
+                    **{
+                        name: format_decimal(getattr(candle, name))
+                        for name in ("open", "high", "low", "close")
+                    },
+                    "volume": candle.volume,
+                }
+                file.write(json.dumps(row) + "\n")
@@ -0,0 +1,428 @@
+"""Цепочка промежуточных обработчиков (middleware) запросов."""
+
+import asyncio
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+from typing import Any
+
+from finam_rest_client.exceptions import (
+    BaseApiException,
+    DeadlineExceededException,
+    RequestTimeoutException,
+)
+from finam_rest_client.models.response_models.base import BaseResponseModel
+
+
+class ApiRequest:
+    """
+    Запрос к Api, проходящий через цепочку middleware.
+
+    Обработчики могут изменять любые поля запроса.
+
+    :param method: Метод запроса;
+    :param path: путь запроса;
+    :param resp_model: модель ответа сервера;
+    :param lane: полоса запросов;
+    :param timeout: время ожидания ответа (секунды);
+    :param deadline: крайний срок получения ответа,
+      момент по time.monotonic();
+    :param family: семейство запроса для автоматического выключателя;
+    :param kwargs: аргументы запроса (params, json, data, headers);
+    :param auth: токен клиента, отправляющего запрос. Заголовок
+      с токеном добавляется после цепочки, поле позволяет
+      обработчикам различать запросы разных токенов.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "resp_model",
+        "lane",
+        "timeout",
+        "deadline",
+        "family",
+        "kwargs",
+        "auth",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        resp_model: type[BaseResponseModel],
+        *,
+        lane: Any = None,
+        timeout: float | None = None,
+        deadline: float | None = None,
+        family: str | None = None,
+        kwargs: dict[str, Any] | None = None,
+        auth: str | None = None,
+    ):
+        self.method = method
+        self.path = path
+        self.resp_model = resp_model
+        self.lane = lane
+        self.timeout = timeout
+        self.deadline = deadline
+        self.family = family
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.auth = auth
+
+    def __repr__(self) -> str:
+        """Строковое представление запроса."""
+        return (
+            f"ApiRequest(method={self.method!r}, path={self.path!r}, "
+            f"kwargs={self.kwargs!r})"
+        )
+
+
+class ApiResponse:
+    """
+    Ответ Api, возвращаемый цепочкой middleware.
+
+    Хранит текст ответа и/или разобранную модель. Модель
+    разбирается из текста при первом обращении и запоминается,
+    поэтому несколько обработчиков не разбирают ответ повторно.
+
+    :param text: Текст ответа в json;
+    :param ok: True, если вернулся код 200;
+    :param resp_model: модель для разбора текста;
+    :param model: готовая модель ответа.
+    """
+
+    __slots__ = "ok", "__text", "__resp_model", "__model"
+
+    def __init__(
+        self,
+        text: str | None,
+        ok: bool,
+        resp_model: type[BaseResponseModel] | None = None,
+        *,
+        model: BaseResponseModel | None = None,
+    ):
+        if text is None and model is None:
+            raise ValueError("text or model is required.")
+        self.ok = ok
+        self.__text = text
+        self.__resp_model = resp_model
+        self.__model = model
+
+    @classmethod
+    def from_model(cls, model: BaseResponseModel, ok: bool = True):
+        """
+        Ответ из готовой модели.
+
+        Используется обработчиками, которые завершают
+        запрос без отправки (например, кэшем).
+        """
+        return cls(None, ok, type(model), model=model)
+
+    @property
+    def text(self) -> str:
+        """Текст ответа в json."""
+        if self.__text is None:
+            assert self.__model is not None
+            self.__text = self.__model.model_dump_json(by_alias=True)
+        return self.__text
+
+    @property
+    def model(self) -> BaseResponseModel:
+        """Разобранная модель ответа."""
+        if self.__model is None:
+            if self.__resp_model is None:
+                raise BaseApiException("Не задана модель ответа.")
+            self.__model = self.__resp_model.model_validate_json(self.text)
+        return self.__model
+
+    async def load_model(
+        self,
+        validate: Callable[
+            [type[BaseResponseModel], str], Awaitable[BaseResponseModel]
+        ],
+    ) -> BaseResponseModel:
+        """
+        Разбор модели ответа функцией validate.
+
+        Используется для разбора вне событийного цикла
+        (см. ValidationOffload). Готовая модель не разбирается
+        повторно.
+
+        :param validate: Асинхронная функция разбора текста.
+        """
+        if self.__model is None:
+            if self.__resp_model is None:
+                raise BaseApiException("Не задана модель ответа.")
+            self.__model = await validate(self.__resp_model, self.text)
+        return self.__model
+
+    def __repr__(self) -> str:
+        """Строковое представление ответа."""
+        return f"ApiResponse(ok={self.ok!r}, text={self.__text!r})"
+
+
+Handler = Callable[[ApiRequest], Awaitable[ApiResponse]]
+
+
+class Middleware(ABC):
+    """
+    Промежуточный обработчик запросов.
+
+    Получает запрос и следующий обработчик цепочки. Может изменить
+    запрос, вызвать call_next и изменить или заменить ответ,
+    либо вернуть ответ без вызова call_next.
+    """
+
+    @abstractmethod
+    async def __call__(
+        self, request: ApiRequest, call_next: Handler
+    ) -> ApiResponse:
+        """
+        Обработка запроса.
+
+        :param request: Запрос;
+        :param call_next: следующий обработчик цепочки.
+
+        :return: Ответ.
+        """
+
+
+def build_pipeline(
+    handler: Handler, middlewares: Iterable[Middleware]
+) -> Handler:
+    """
+    Сборка цепочки обработчиков.
+
+    Первый обработчик в middlewares выполняется первым.
+    Пустая цепочка возвращает handler без оберток.
+
+    :param handler: Конечный обработчик, отправляющий запрос;
+    :param middlewares: промежуточные обработчики.
+
+    :return: Обработчик, запускающий цепочку.
+    """
+    for middleware in reversed(tuple(middlewares)):
+        handler = partial(middleware, call_next=handler)
+    return handler
+
+
+class RetryMiddleware(Middleware):
+    """
+    Повтор запросов при временных ошибках.
+
+    Повторяются только запросы с методами из methods: по
+    умолчанию GET, чтобы не отправить заявку дважды. Пауза
+    между попытками растет экспоненциально со случайным
+    разбросом. Попытка не начинается, если пауза выходит
+    за крайний срок запроса.
+
+    :param attempts: Максимальное количество попыток;
+    :param backoff: пауза перед второй попыткой (секунды);
+    :param max_backoff: максимальная пауза (секунды);
+    :param retry_on: типы исключений для повтора;
+    :param methods: методы запросов для повтора.
+    """
+
+    logger = logging.getLogger("finam_rest_client.RetryMiddleware")
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        *,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        retry_on: tuple[type[BaseException], ...] = (RequestTimeoutException,),
+        methods: Iterable[str] = ("get",),
+    ):
+        if attempts < 1:
+            raise ValueError("attempts must be greater than 0.")
+        self.__attempts = attempts
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__retry_on = retry_on
+        self.__methods = frozenset(method.lower() for method in methods)
+
+    async def __call__(
+        self, request: ApiRequest, call_next: Handler
+    ) -> ApiResponse:
+        """Выполнение запроса с повторами."""
+        if request.method.lower() not in self.__methods:
+            return await call_next(request)
+        attempt = 1
+        while True:
+            try:
+                return await call_next(request)
+            except DeadlineExceededException:
+                raise
+            except self.__retry_on as exc:
+                delay = min(
+                    self.__max_backoff, self.__backoff * 2 ** (attempt - 1)
+                ) * random.uniform(0.5, 1)
+                deadline = request.deadline
+                if attempt >= self.__attempts or (
+                    deadline is not None
+                    and time.monotonic() + delay >= deadline
+                ):
+                    raise
+                self.logger.warning(
+                    "Повтор запроса %s через %.3f с (попытка %s): %s.",
+                    request.path,
+                    delay,
+                    attempt + 1,
+                    exc,
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class CacheMiddleware(Middleware):
+    """
+    Кэш успешных ответов GET запросов.
+
+    Ответы хранятся ttl секунд по ключу из токена (ApiRequest.auth),
+    пути и параметров запроса: ответ одного токена не выдается
+    запросам другого, поэтому один кэш можно передать всем
+    клиентам ClientPool. Из кэша возвращается та же разобранная
+    модель, поэтому изменять ее не следует.
+
+    :param ttl: Время хранения ответа (секунды);
+    :param paths: пути запросов для кэширования.
+      None - все GET запросы;
+    :param max_size: максимальное количество ответов в кэше.
+    """
+
+    logger = logging.getLogger("finam_rest_client.CacheMiddleware")
+
+    def __init__(
+        self,
+        ttl: float,
+        *,
+        paths: Iterable[str] | None = None,
+        max_size: int = 1024,
+    ):
+        self.__ttl = ttl
+        self.__paths = None if paths is None else frozenset(paths)
+        self.__max_size = max_size
+        self.__entries: OrderedDict[tuple, tuple[float, ApiResponse]] = (
+            OrderedDict()
+        )
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Количество ответов из кэша."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Количество запросов, отправленных в Api."""
+        return self.__misses
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        self.__entries.clear()
+
+    async def __call__(
+        self, request: ApiRequest, call_next: Handler
+    ) -> ApiResponse:
+        """Ответ из кэша или запрос к Api."""
+        if request.method.lower() != "get" or (
+            self.__paths is not None and request.path not in self.__paths
+        ):
+            return await call_next(request)
+        params = request.kwargs.get("params") or {}
+        key = (request.auth, request.path, tuple(sorted(params.items())))
+        entry = self.__entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            self.logger.debug("Ответ из кэша: %s.", request.path)
+            return entry[1]
+        self.__misses += 1
+        response = await call_next(request)
+        if response.ok:
+            response = ApiResponse.from_model(response.model)
+            self.__entries[key] = now + self.__ttl, response
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+        return response
+
+
+class PathMetrics:
+    """
+    Метрики запросов одного пути.
+
+    :param count: Количество запросов;
+    :param errors: количество запросов, завершившихся исключением;
+    :param not_ok: количество ответов с ошибкой Api;
+    :param total_time: суммарная длительность (секунды);
+    :param max_time: максимальная длительность (секунды).
+    """
+
+    __slots__ = "count", "errors", "not_ok", "total_time", "max_time"
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.not_ok = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        """Средняя длительность запроса (секунды)."""
+        return self.total_time / self.count if self.count else 0.0
+
+    def __repr__(self) -> str:
+        """Строковое представление метрик."""
+        return (
+            f"PathMetrics(count={self.count}, errors={self.errors}, "
+            f"not_ok={self.not_ok}, mean_time={self.mean_time:.6f}, "
+            f"max_time={self.max_time:.6f})"
+        )
+
+
+class MetricsMiddleware(Middleware):
+    """Сбор количества и длительности запросов по путям."""
+
+    def __init__(self):
+        self.__paths: dict[str, PathMetrics] = {}
+
+    @property
+    def paths(self) -> dict[str, PathMetrics]:
+        """Метрики по путям запросов."""
+        return self.__paths
+
+    def reset(self) -> None:
+        """Сброс метрик."""
+        self.__paths.clear()
+
+    async def __call__(
+        self, request: ApiRequest, call_next: Handler
+    ) -> ApiResponse:
+        """Выполнение запроса с измерением длительности."""
+        metrics = self.__paths.get(request.path)
+        if metrics is None:
+            metrics = self.__paths[request.path] = PathMetrics()
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except Exception:
+            metrics.errors += 1
+            raise
+        else:
+            if not response.ok:
+                metrics.not_ok += 1
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.count += 1
+            metrics.total_time += elapsed
+            metrics.max_time = max(metrics.max_time, elapsed)
@@ -2,3 +2,4 @@
 
 from ._orders import Orders
 from ._stops import Stops
+from .templates import OrderTemplate
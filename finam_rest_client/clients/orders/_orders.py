@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Callable
 
 from finam_rest_client.models.request_models import (
     CancelOrderRequest,
@@ -9,6 +10,7 @@ from finam_rest_client.models.response_models import CancelOrder, NewOrder
 from finam_rest_client.models.response_models import Orders as Ord
 
 from .base import BaseOrders
+from .templates import OrderTemplate
 
 
 class Orders(BaseOrders):
@@ -19,48 +21,79 @@ class Orders(BaseOrders):
     _cancel_response_model = CancelOrder
     _get_response_model = Ord
     logger = logging.getLogger("finam_rest_client.Orders")
+    family = "orders"
 
-    async def get_orders(self, req_orders: GetOrdersRequest) -> Ord:
+    async def get_orders(
+        self, req_orders: GetOrdersRequest, deadline: float | None = None
+    ) -> Ord:
         """
         Получение списка ордеров.
 
         :param req_orders: Модель запроса на получение списка ордеров.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на запрос списка ордеров.
         """
         self.logger.debug(
             "Метод запущен с параметрами: req_orders=%s", req_orders
         )
-        result = await self._get(req_orders)
+        result = await self._get(req_orders, deadline)
         self.logger.debug("Метод вернул: %s", result)
         return result
 
-    async def create_order(self, req_order: CreateOrderRequest) -> NewOrder:
+    async def create_order(
+        self, req_order: CreateOrderRequest, deadline: float | None = None
+    ) -> NewOrder:
         """
         Создание нового ордера.
 
         :param req_order: Модель запроса на создание ордера.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на создание нового ордера.
         """
         self.logger.debug(
             "Метод запущен с параметрами: req_order=%s", req_order
         )
-        result = await self._create(req_order)
+        result = await self._create(req_order, deadline)
         self.logger.debug("Метод вернул: %s", result)
         return result
 
-    async def cancel_order(self, req_order: CancelOrderRequest) -> CancelOrder:
+    async def cancel_order(
+        self, req_order: CancelOrderRequest, deadline: float | None = None
+    ) -> CancelOrder:
         """
         Отмена ордера.
 
         :param req_order: Модель запроса на отмену ордера.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на отмену ордера.
         """
         self.logger.debug(
             "Метод запущен с параметрами: req_order=%s", req_order
         )
-        result = await self._cancel(req_order)
+        result = await self._cancel(req_order, deadline)
         self.logger.debug("Метод вернул: %s", result)
         return result
+
+    def template(
+        self,
+        req_order: CreateOrderRequest,
+        on_send: Callable[[], None] | None = None,
+    ) -> OrderTemplate:
+        """
+        Создание шаблона заявки.
+
+        :param req_order: Модель запроса на создание ордера;
+        :param on_send: функция, вызываемая после отправки заявки.
+
+        :return: Шаблон заявки.
+        """
+        self.logger.debug(
+            "Метод запущен с параметрами: req_order=%s", req_order
+        )
+        return OrderTemplate(self, req_order, on_send)
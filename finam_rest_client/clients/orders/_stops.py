@@ -19,44 +19,57 @@ class Stops(BaseOrders):
     _cancel_response_model = CancelStop
     _get_response_model = St
     logger = logging.getLogger("finam_rest_client.Stops")
+    family = "stops"
 
-    async def get_stops(self, req_stops: GetStopsRequest) -> St:
+    async def get_stops(
+        self, req_stops: GetStopsRequest, deadline: float | None = None
+    ) -> St:
         """
         Получение списка стоп-ордеров.
 
         :param req_stops: Модель запроса на получение списка стоп-ордеров.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на запрос списка стоп-ордеров.
         """
         self.logger.debug(
             "Метод запущен с параметрами: req_stops=%s", req_stops
         )
-        result = await self._get(req_stops)
+        result = await self._get(req_stops, deadline)
         self.logger.debug("Метод вернул: %s", result)
         return result
 
-    async def create_stop(self, req_stop: CreateStopRequest) -> NewStop:
+    async def create_stop(
+        self, req_stop: CreateStopRequest, deadline: float | None = None
+    ) -> NewStop:
         """
         Создание нового стоп-ордера.
 
         :param req_stop: Модель запроса на создание стоп-ордера.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на создание нового стоп-ордера.
         """
         self.logger.debug("Метод запущен с параметрами: req_stop=%s", req_stop)
-        result = await self._create(req_stop)
+        result = await self._create(req_stop, deadline)
         self.logger.debug("Метод вернул: %s", result)
         return result
 
-    async def cancel_stop(self, req_stop: CancelStopRequest) -> CancelStop:
+    async def cancel_stop(
+        self, req_stop: CancelStopRequest, deadline: float | None = None
+    ) -> CancelStop:
         """
         Отмена стоп-ордера.
 
         :param req_stop: Модель запроса на отмену стоп-ордера.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на отмену стоп-ордера.
         """
         self.logger.debug("Метод запущен с параметрами: req_stop=%s", req_stop)
-        result = await self._cancel(req_stop)
+        result = await self._cancel(req_stop, deadline)
         self.logger.debug("Метод вернул: %s", result)
         return result
@@ -4,7 +4,7 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Literal
 
-from finam_rest_client.clients.base import ApiClient, BaseObjClient
+from finam_rest_client.clients.base import ApiClient, BaseObjClient, Lane
 
 
 class BaseOrders(ABC):
@@ -15,6 +15,7 @@ class BaseOrders(ABC):
     """
 
     logger: logging.Logger
+    family: str | None = None
 
     def __init__(self, client: ApiClient):
         self.__get_orders = GetOrders(client, self, self._get_response_model)
@@ -45,40 +46,61 @@ class BaseOrders(ABC):
     def _cancel_response_model(self):
         """Модель для ответа отмену ордера."""
 
-    async def _get(self, req):
+    async def _get(self, req, deadline: float | None = None):
         """
         Получение списка ордеров.
 
         :param req: Модель запроса на получение списка ордеров.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на запрос списка ордеров.
         """
-        return await self.__get_orders.request_run(req)
+        return await self.__get_orders.request_run(req, deadline)
 
-    async def _create(self, req):
+    async def _create(self, req, deadline: float | None = None):
         """
         Создание нового ордера.
 
         :param req: Модель запроса на создание ордера.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на создание нового ордера.
         """
-        return await self.__create_order.request_run(req)
+        return await self.__create_order.request_run(req, deadline)
 
-    async def _cancel(self, req):
+    async def _create_raw(self, body: bytes, deadline: float | None = None):
+        """
+        Создание нового ордера по заранее сериализованному телу.
+
+        :param body: Тело запроса в json.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
+
+        :return: Модель ответа на создание нового ордера.
+        """
+        return await self.__create_order.request_raw(body, deadline)
+
+    async def _cancel(self, req, deadline: float | None = None):
         """
         Отмена ордера.
 
         :param req: Модель запроса на отмену ордера.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на отмену ордера.
         """
-        return await self.__cancel_order.request_run(req)
+        return await self.__cancel_order.request_run(req, deadline)
 
 
 class BaseSubOrders(BaseObjClient, ABC):
     """Абстрактный класс для реализации классов ордеров."""
 
+    lane = Lane.trading
+    timeout = 5.0
+
     def __new__(  # noqa
         cls, client, orders, *args, **kwargs
     ) -> "BaseSubOrders":
@@ -105,6 +127,11 @@ class BaseSubOrders(BaseObjClient, ABC):
         """Путь для отправки запросов."""
         return self.orders.path  # type: ignore
 
+    @property
+    def family(self) -> str | None:  # type: ignore
+        """Семейство запросов для автоматического выключателя."""
+        return self.orders.family
+
     @property
     def _response_model(self):
         """Модель ответа."""
@@ -114,12 +141,15 @@ class BaseSubOrders(BaseObjClient, ABC):
         self,
         req,
         arg_type_name: Literal["json", "params"] = "params",
+        deadline: float | None = None,
     ):
         """
         Отправка запроса.
 
         :param req: Модель запроса.
         :param arg_type_name: Имя типа аргумента для передачи.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на запрос.
         """
@@ -128,19 +158,22 @@ class BaseSubOrders(BaseObjClient, ABC):
         result = await self._execute_request(  # type: ignore
             resp_model=self._response_model,  # type: ignore
             path=self.path,
+            deadline=deadline,
             **my_kwargs,
         )
         return result  # type: ignore
 
-    async def request_run(self, req):
+    async def request_run(self, req, deadline: float | None = None):
         """
         Отправка запроса.
 
         :param req: Модель запроса.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на запрос.
         """
-        return await self._request_run(req=req)
+        return await self._request_run(req=req, deadline=deadline)
 
 
 class GetOrders(BaseSubOrders):
@@ -160,12 +193,34 @@ class CreateOrder(BaseSubOrders):
 
     method = "post"
 
-    async def request_run(self, req):
+    async def request_run(self, req, deadline: float | None = None):
         """
         Отправка запроса.
 
         :param req: Модель запроса.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель ответа на запрос.
         """
-        return await self._request_run(req=req, arg_type_name="json")
+        return await self._request_run(
+            req=req, arg_type_name="json", deadline=deadline
+        )
+
+    async def request_raw(self, body: bytes, deadline: float | None = None):
+        """
+        Отправка заранее сериализованного тела запроса.
+
+        :param body: Тело запроса в json.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
+
+        :return: Модель ответа на запрос.
+        """
+        return await self._execute_request(  # type: ignore
+            resp_model=self._response_model,  # type: ignore
+            path=self.path,
+            data=body,
+            deadline=deadline,
+            headers={"Content-Type": "application/json"},
+        )
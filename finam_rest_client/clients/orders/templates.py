@@ -0,0 +1,94 @@
+"""Шаблоны заявок с заранее сериализованным телом запроса."""
+
+import json
+import logging
+from collections.abc import Callable
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
+
+from finam_rest_client.models.request_models import CreateOrderRequest
+from finam_rest_client.models.response_models import NewOrder
+
+from .base import BaseOrders
+
+
+class OrderTemplate:
+    """
+    Шаблон заявки.
+
+    Постоянные поля заявки (клиент, инструмент, направление,
+    свойства исполнения, кредит, условие и срок действия)
+    проверяются и сериализуются в json один раз. При отправке
+    в готовое тело подставляются только цена и количество.
+
+    :param orders: Экземпляр класса для работы с заявками;
+    :param req_order: модель запроса на создание заявки. Значения
+      quantity и price в ней не используются;
+    :param on_send: функция, вызываемая после отправки заявки.
+    """
+
+    __slots__ = "__orders", "__prefix", "__on_send"
+    logger = logging.getLogger("finam_rest_client.OrderTemplate")
+    _quantity = TypeAdapter(int)
+    _price = TypeAdapter(Decimal)
+
+    def __init__(
+        self,
+        orders: BaseOrders,
+        req_order: CreateOrderRequest,
+        on_send: Callable[[], None] | None = None,
+    ):
+        self.__orders = orders
+        self.__on_send = on_send
+        data = req_order.model_dump(
+            mode="json", by_alias=True, exclude_none=True
+        )
+        data.pop("quantity", None)
+        data.pop("price", None)
+        body = json.dumps(data, separators=(",", ":"))
+        self.__prefix = body[:-1].encode()
+
+    def build_body(
+        self, quantity: int, price: Decimal | str | None = None
+    ) -> bytes:
+        """
+        Сборка тела запроса.
+
+        :param quantity: Объем заявки в лотах;
+        :param price: цена исполнения заявки. None для рыночной заявки.
+
+        :return: Тело запроса в json.
+        """
+        if type(quantity) is not int:
+            quantity = self._quantity.validate_python(quantity)
+        body = b'%s,"quantity":%d' % (self.__prefix, quantity)
+        if price is None:
+            return body + b"}"
+        if type(price) is not Decimal:
+            price = self._price.validate_python(price)
+        return b'%s,"price":"%s"}' % (body, to_jsonable_python(price).encode())
+
+    async def send(
+        self,
+        quantity: int,
+        price: Decimal | str | None = None,
+        deadline: float | None = None,
+    ) -> NewOrder:
+        """
+        Создание новой заявки по шаблону.
+
+        :param quantity: Объем заявки в лотах;
+        :param price: цена исполнения заявки. None для рыночной заявки;
+        :param deadline: крайний срок получения ответа,
+          момент по time.monotonic().
+
+        :return: Модель ответа на создание нового ордера.
+        """
+        body = self.build_body(quantity, price)
+        self.logger.debug("Отправка заявки: %s.", body)
+        result = await self.__orders._create_raw(body, deadline)
+        if self.__on_send:
+            self.__on_send()
+        return result
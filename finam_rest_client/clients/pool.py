@@ -0,0 +1,333 @@
+"""Пул клиентов для нескольких счетов с общим пулом соединений."""
+
+import asyncio
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Any, Self
+
+from finam_rest_client.models.response_models import Orders as GetOrders
+from finam_rest_client.models.response_models import Portfolio as Pf
+from finam_rest_client.models.response_models import Stops as GetStops
+
+from ._client import FinamRestClient
+from .access_token import TokenCheckMode
+from .base import DEFAULT_LANES, Lane, LaneOptions
+from .circuit_breaker import CircuitBreakers
+from .concurrency import AdaptiveConcurrencyLimiter
+from .hedging import HedgePolicy
+from .middleware import Middleware
+from .rate_limit import RateLimiter
+from .validation import ValidationOffload
+
+
+class ClientPool:
+    """
+    Пул клиентов для нескольких счетов.
+
+    Все клиенты отправляют запросы через сессии одного
+    транспортного клиента, поэтому сотни счетов используют
+    общий пул соединений. Заголовки с токеном передаются
+    с каждым запросом, у каждого токена свой ограничитель
+    частоты. Счета с одним токеном используют один клиент.
+
+    Транспортный клиент не имеет токена и соединения не
+    прогревает: прогрев по LaneOptions.prewarm и
+    keep_warm_interval выполняется запросами клиента
+    одного из счетов пула.
+
+    Перед использованием важно вызвать метод start(),
+    а по окончании использования close().
+
+    Либо можно воспользоваться асинхронным менеджером контекста.
+
+    :param accounts: Соответствие торгового кода клиента и токена.
+    :param rate: Количество запросов в секунду на один токен.
+      None - без ограничения.
+    :param capacity: Размер корзины ограничителя одного токена.
+    :param lanes: Настройки общих пулов соединений.
+    :param token_check: Способ проверки токенов при запуске.
+    :param timeouts: Время ожидания ответа по путям запросов
+      для всех клиентов пула.
+    :param circuit_breakers: Автоматические выключатели, общие
+      для всех клиентов пула.
+    :param hedge_policy: Политика дублирующих GET запросов,
+      общая для всех клиентов пула.
+    :param concurrency_limiter: Адаптивный ограничитель одновременных
+      запросов, общий для всех клиентов пула.
+    :param middlewares: Цепочка промежуточных обработчиков запросов,
+      общая для всех клиентов пула.
+    :param validation: Политика разбора больших ответов,
+      общая для всех клиентов пула.
+    """
+
+    logger = logging.getLogger("finam_rest_client.ClientPool")
+
+    def __init__(
+        self,
+        accounts: Mapping[str, str] | None = None,
+        *,
+        rate: float | None = None,
+        capacity: float | None = None,
+        lanes: dict[Lane, LaneOptions] | None = None,
+        token_check: TokenCheckMode = TokenCheckMode.pooled,
+        timeouts: dict[str, float] | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        middlewares: Iterable[Middleware] = (),
+        validation: ValidationOffload | None = None,
+    ):
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__token_check = TokenCheckMode(token_check)
+        self.__timeouts = timeouts
+        self.__circuit_breakers = circuit_breakers
+        self.__hedge_policy = hedge_policy
+        self.__concurrency_limiter = concurrency_limiter
+        self.__middlewares = tuple(middlewares)
+        self.__validation = validation
+        self.__lanes = lanes or DEFAULT_LANES
+        self.__transport = FinamRestClient(
+            "",
+            lanes={
+                lane: LaneOptions(
+                    options.limit, options.keepalive_timeout, options.priority
+                )
+                for lane, options in self.__lanes.items()
+            },
+            token_check=TokenCheckMode.skip,
+        )
+        self.__clients: dict[str, FinamRestClient] = {}
+        self.__accounts: dict[str, str] = {}
+        self.__keep_warm_tasks: list[asyncio.Task] = []
+        self.__started = False
+        for client_id, token in (accounts or {}).items():
+            self.__register(client_id, token)
+
+    @property
+    def transport(self) -> FinamRestClient:
+        """Клиент, сессии которого используют все клиенты пула."""
+        return self.__transport
+
+    @property
+    def client_ids(self) -> tuple[str, ...]:
+        """Торговые коды клиентов пула."""
+        return tuple(self.__accounts)
+
+    def __len__(self) -> int:
+        """Количество счетов в пуле."""
+        return len(self.__accounts)
+
+    def __contains__(self, client_id: object) -> bool:
+        """Проверка наличия счета в пуле."""
+        return client_id in self.__accounts
+
+    def __getitem__(self, client_id: str) -> FinamRestClient:
+        """Клиент счета."""
+        return self.__clients[self.__accounts[client_id]]
+
+    async def __aenter__(self) -> Self:
+        """Вход в менеджер контекста."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Выход из менеджера контекста."""
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Создание общих сессий и проверка токенов.
+
+        :raise AuthenticationException: Если какой-либо токен
+          не прошел проверку. Пул при этом закрывается.
+        """
+        self.logger.info(
+            "Запуск пула: %s счетов, %s токенов.",
+            len(self.__accounts),
+            len(self.__clients),
+        )
+        await self.__transport.__aenter__()
+        self.__started = True
+        results = await asyncio.gather(
+            *(client.__aenter__() for client in self.__clients.values()),
+            return_exceptions=True,
+        )
+        errors = [
+            result for result in results if isinstance(result, BaseException)
+        ]
+        if errors:
+            self.logger.error("Ошибка запуска пула: %s.", errors[0])
+            await self.close()
+            raise errors[0]
+        await asyncio.gather(
+            *(
+                self.__prewarm(lane, options.prewarm)
+                for lane, options in self.__lanes.items()
+            )
+        )
+        self.__keep_warm_tasks = [
+            asyncio.create_task(
+                self.__keep_warm(lane, options.keep_warm_interval)
+            )
+            for lane, options in self.__lanes.items()
+            if options.keep_warm_interval
+        ]
+
+    async def close(self) -> None:
+        """Остановка клиентов и закрытие общих сессий."""
+        self.logger.info("Остановка пула.")
+        self.__started = False
+        tasks, self.__keep_warm_tasks = self.__keep_warm_tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(
+            *(
+                client.__aexit__(None, None, None)
+                for client in self.__clients.values()
+            )
+        )
+        await self.__transport.__aexit__(None, None, None)
+
+    async def add(self, client_id: str, token: str) -> FinamRestClient:
+        """
+        Добавление счета в пул.
+
+        Если пул запущен, токен нового клиента проверяется.
+        Если счет был добавлен с другим токеном, клиент прежнего
+        токена останавливается, когда его не использует ни один
+        счет.
+
+        :param client_id: Торговый код клиента;
+        :param token: токен доступа к счету.
+
+        :return: Клиент счета.
+        """
+        previous = self.__accounts.get(client_id)
+        client, created = self.__register(client_id, token)
+        if previous is not None and previous != token:
+            await self.__release(previous)
+        if created and self.__started:
+            try:
+                await client.__aenter__()
+            except BaseException:
+                await self.remove(client_id)
+                raise
+        return client
+
+    async def remove(self, client_id: str) -> None:
+        """
+        Исключение счета из пула.
+
+        Клиент останавливается, если его токен больше
+        не используется другими счетами.
+
+        :param client_id: Торговый код клиента.
+        """
+        token = self.__accounts.pop(client_id, None)
+        if token is not None:
+            await self.__release(token)
+
+    async def fan_out(
+        self,
+        method: str,
+        client_ids: Iterable[str] | None = None,
+        *,
+        return_exceptions: bool = True,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """
+        Одновременный вызов метода клиента для нескольких счетов.
+
+        :param method: Имя метода FinamRestClient, принимающего
+          client_id, например "get_portfolio".
+        :param client_ids: Торговые коды клиентов. По умолчанию все.
+        :param return_exceptions: Возвращать исключения в результатах
+          вместо их выброса.
+        :param kwargs: Остальные аргументы метода.
+
+        :return: Результаты по торговым кодам клиентов.
+        """
+        client_ids = list(
+            self.__accounts if client_ids is None else client_ids
+        )
+        self.logger.debug("Вызов %s для %s счетов.", method, len(client_ids))
+        results = await asyncio.gather(
+            *(
+                getattr(self[client_id], method)(client_id=client_id, **kwargs)
+                for client_id in client_ids
+            ),
+            return_exceptions=return_exceptions,
+        )
+        return dict(zip(client_ids, results, strict=True))
+
+    async def get_portfolio(
+        self, client_ids: Iterable[str] | None = None, **kwargs
+    ) -> dict[str, Pf | BaseException]:
+        """
+        Получение портфелей счетов.
+
+        Аргументы описаны в FinamRestClient.get_portfolio и fan_out.
+        """
+        return await self.fan_out("get_portfolio", client_ids, **kwargs)
+
+    async def get_orders(
+        self, client_ids: Iterable[str] | None = None, **kwargs
+    ) -> dict[str, GetOrders | BaseException]:
+        """
+        Получение заявок счетов.
+
+        Аргументы описаны в FinamRestClient.get_orders и fan_out.
+        """
+        return await self.fan_out("get_orders", client_ids, **kwargs)
+
+    async def get_stops(
+        self, client_ids: Iterable[str] | None = None, **kwargs
+    ) -> dict[str, GetStops | BaseException]:
+        """
+        Получение стоп-заявок счетов.
+
+        Аргументы описаны в FinamRestClient.get_stops и fan_out.
+        """
+        return await self.fan_out("get_stops", client_ids, **kwargs)
+
+    def __register(
+        self, client_id: str, token: str
+    ) -> tuple[FinamRestClient, bool]:
+        self.__accounts[client_id] = token
+        client = self.__clients.get(token)
+        if client is not None:
+            return client, False
+        rate_limiter = None
+        if self.__rate:
+            rate_limiter = RateLimiter(self.__rate, self.__capacity)
+        client = self.__clients[token] = FinamRestClient(
+            token,
+            rate_limiter=rate_limiter,
+            token_check=self.__token_check,
+            transport=self.__transport,
+            timeouts=self.__timeouts,
+            circuit_breakers=self.__circuit_breakers,
+            hedge_policy=self.__hedge_policy,
+            concurrency_limiter=self.__concurrency_limiter,
+            middlewares=self.__middlewares,
+            validation=self.__validation,
+        )
+        return client, True
+
+    async def __release(self, token: str) -> None:
+        if token in self.__accounts.values():
+            return
+        client = self.__clients.pop(token)
+        if self.__started:
+            await client.__aexit__(None, None, None)
+
+    async def __prewarm(self, lane: Lane, connections: int) -> None:
+        if connections > 0 and self.__clients:
+            client = next(iter(self.__clients.values()))
+            await client.prewarm(lane, connections)
+
+    async def __keep_warm(self, lane: Lane, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.__prewarm(lane, max(self.__lanes[lane].prewarm, 1))
@@ -13,12 +13,18 @@ class Portfolio(BaseObjClient):
     path = "/public/api/v1/portfolio"
     method = "get"
     logger = logging.getLogger("finam_rest_client.Portfolio")
+    timeout = 10.0
+    family = "portfolio"
 
-    async def get_portfolio(self, req_portfolio: PortfolioRequest) -> Pf:
+    async def get_portfolio(
+        self, req_portfolio: PortfolioRequest, deadline: float | None = None
+    ) -> Pf:
         """
         Получение портфеля.
 
         :param req_portfolio: Модель запроса на получение портфеля.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель портфеля.
         """
@@ -30,6 +36,7 @@ class Portfolio(BaseObjClient):
             resp_model=Pf,
             params=data,
             path=self.path,
+            deadline=deadline,
         )
         self.logger.debug("Получена информация о портфеле: %s.", result)
         return result
@@ -0,0 +1,120 @@
+"""Ограничение частоты запросов к Api."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов по алгоритму token bucket.
+
+    Корзина пополняется со скоростью rate токенов в секунду
+    и вмещает не более capacity токенов. Каждый запрос
+    расходует один токен. Ожидающие запросы обслуживаются
+    по приоритету (меньшее значение - раньше), при равном
+    приоритете - в порядке очереди.
+
+    :param rate: Количество запросов в секунду.
+    :param capacity: Размер корзины (допустимый всплеск запросов).
+      По умолчанию равен max(1, rate).
+    """
+
+    __slots__ = (
+        "__rate",
+        "__capacity",
+        "__tokens",
+        "__updated",
+        "__waiters",
+        "__counter",
+        "__dispatcher",
+    )
+    logger = logging.getLogger("finam_rest_client.RateLimiter")
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.__rate = rate
+        self.__capacity = capacity or max(1.0, rate)
+        self.__tokens = self.__capacity
+        self.__updated = time.monotonic()
+        self.__waiters: list[tuple[int, int, asyncio.Future]] = []
+        self.__counter = itertools.count()
+        self.__dispatcher: asyncio.Task | None = None
+
+    @property
+    def rate(self) -> float:
+        """Количество запросов в секунду."""
+        return self.__rate
+
+    @property
+    def capacity(self) -> float:
+        """Размер корзины."""
+        return self.__capacity
+
+    @property
+    def available(self) -> float:
+        """Количество доступных в данный момент токенов."""
+        self.__refill()
+        return self.__tokens
+
+    @property
+    def waiting(self) -> int:
+        """Количество ожидающих токен запросов."""
+        return len(self.__waiters)
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.__tokens = min(
+            self.__capacity,
+            self.__tokens + (now - self.__updated) * self.__rate,
+        )
+        self.__updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        Забрать токен без ожидания.
+
+        :return: True, если токен получен, иначе False.
+        """
+        self.__refill()
+        if self.__tokens < 1:
+            return False
+        self.__tokens -= 1
+        return True
+
+    async def acquire(self, priority: int = 1) -> None:
+        """
+        Дождаться и забрать токен.
+
+        :param priority: Приоритет запроса. Меньшее значение
+          обслуживается раньше.
+        """
+        if not self.__waiters and self.try_acquire():
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self.__waiters, (priority, next(self.__counter), future)
+        )
+        if self.__dispatcher is None or self.__dispatcher.done():
+            self.__dispatcher = asyncio.create_task(self.__dispatch())
+        await future
+
+    async def __dispatch(self) -> None:
+        waiters = self.__waiters
+        while waiters:
+            if waiters[0][2].done():
+                heapq.heappop(waiters)
+                continue
+            if not self.try_acquire():
+                delay = (1 - self.__tokens) / self.__rate
+                self.logger.debug("Ожидание токена: %.3f с.", delay)
+                await asyncio.sleep(delay)
+                continue
+            _, _, future = heapq.heappop(waiters)
+            if future.done():
+                self.__tokens += 1
+                continue
+            future.set_result(None)
@@ -0,0 +1,331 @@
+"""Запись и воспроизведение запросов к Api."""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any
+
+from finam_rest_client import exceptions
+from finam_rest_client.exceptions import BaseApiException
+from finam_rest_client.models import response_models
+
+from .base import Lane
+from .middleware import ApiRequest, ApiResponse, Handler, Middleware
+
+logger = logging.getLogger("finam_rest_client.recording")
+
+
+def read_records(path: str | os.PathLike) -> Iterator[dict[str, Any]]:
+    """
+    Чтение файла записи.
+
+    Каждая запись - словарь с ключами:
+
+    - t - время начала запроса (секунды UTC);
+    - d - длительность запроса (секунды);
+    - m, p, l, f - метод, путь, полоса и семейство запроса;
+    - r - имя модели ответа;
+    - a - аргументы запроса (params, json, data);
+    - s, ok - текст ответа и признак кода 200;
+    - e - имя класса и текст исключения, если запрос
+      завершился ошибкой.
+
+    Если файл оборван (например, процесс записи аварийно
+    завершился), читаются записи до места обрыва.
+
+    :param path: Путь к файлу записи.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                if not line.endswith("\n"):
+                    logger.warning("Файл %s оборван на записи.", path)
+                    return
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error) as exc:
+            logger.warning("Файл %s оборван: %s.", path, exc)
+
+
+def _arguments(kwargs: dict[str, Any]) -> dict[str, Any]:
+    arguments = {}
+    for name in ("params", "json", "data"):
+        value = kwargs.get(name)
+        if isinstance(value, bytes):
+            value = value.decode()
+        if value is not None:
+            arguments[name] = value
+    return arguments
+
+
+def _request_key(method: str, path: str, arguments: dict) -> tuple:
+    return (
+        method.lower(),
+        path,
+        json.dumps(arguments, sort_keys=True, default=str),
+    )
+
+
+class TrafficRecorder(Middleware):
+    """
+    Запись запросов и ответов Api в файл.
+
+    Записи добавляются в файл gzip по одной строке json
+    на запрос (см. read_records). Заголовки запросов,
+    в том числе токен, не записываются.
+
+    Записи накапливаются в памяти и передаются на сжатие
+    и запись в отдельный поток, не занимая событийный цикл:
+    каждые flush_every записей или через flush_interval
+    секунд после первой несохраненной записи. После передачи
+    данные сбрасываются в файл, поэтому при аварийном
+    завершении теряются только записи последнего интервала.
+
+    Рекомендуется ставить последним в цепочку middleware,
+    чтобы записывались запросы, действительно отправленные в Api.
+
+    :param path: Путь к файлу записи.
+    :param compresslevel: Степень сжатия gzip.
+    :param flush_every: Количество записей, после которого
+      они передаются на запись.
+    :param flush_interval: Наибольшее время хранения записей
+      в памяти (секунды).
+    """
+
+    logger = logging.getLogger("finam_rest_client.TrafficRecorder")
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        compresslevel: int = 6,
+        *,
+        flush_every: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        if flush_every < 1:
+            raise ValueError("flush_every must be greater than 0.")
+        self.__path = path
+        self.__compresslevel = compresslevel
+        self.__flush_every = flush_every
+        self.__flush_interval = flush_interval
+        self.__file: IO[str] | None = None
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__pending: list[dict[str, Any]] = []
+        self.__timer: asyncio.TimerHandle | None = None
+        self.__count = 0
+
+    @property
+    def path(self) -> str | os.PathLike:
+        """Путь к файлу записи."""
+        return self.__path
+
+    @property
+    def count(self) -> int:
+        """Количество записанных запросов."""
+        return self.__count
+
+    def close(self) -> None:
+        """
+        Закрытие файла записи.
+
+        Накопленные записи сохраняются, метод ожидает
+        завершения записи. При следующем запросе файл
+        открывается снова и записи добавляются в конец.
+        """
+        self.flush()
+        executor, self.__executor = self.__executor, None
+        if executor is None:
+            return
+        executor.submit(self.__close_file)
+        executor.shutdown(wait=True)
+        self.logger.info(
+            "Запись закрыта: %s, запросов: %s.", self.__path, self.__count
+        )
+
+    def flush(self) -> None:
+        """Передача накопленных записей на запись в файл."""
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        records, self.__pending = self.__pending, []
+        if not records:
+            return
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="traffic-recorder"
+            )
+        # Один поток сохраняет порядок записей.
+        self.__executor.submit(self.__save, records)
+
+    async def __call__(
+        self, request: ApiRequest, call_next: Handler
+    ) -> ApiResponse:
+        """Выполнение запроса с записью."""
+        record: dict[str, Any] = {
+            "t": time.time(),
+            "m": request.method,
+            "p": request.path,
+            "l": getattr(request.lane, "value", request.lane),
+            "f": request.family,
+            "r": request.resp_model.__name__,
+            "a": _arguments(request.kwargs),
+        }
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except Exception as exc:
+            record["d"] = time.perf_counter() - started
+            record["e"] = [type(exc).__name__, str(exc)]
+            self.__write(record)
+            raise
+        record["d"] = time.perf_counter() - started
+        record["s"] = response.text
+        record["ok"] = response.ok
+        self.__write(record)
+        return response
+
+    def __write(self, record: dict[str, Any]) -> None:
+        self.__pending.append(record)
+        self.__count += 1
+        if len(self.__pending) >= self.__flush_every:
+            self.flush()
+        elif self.__timer is None:
+            self.__timer = asyncio.get_running_loop().call_later(
+                self.__flush_interval, self.flush
+            )
+
+    def __save(self, records: list[dict[str, Any]]) -> None:
+        try:
+            if self.__file is None:
+                self.logger.info("Запись запросов в %s.", self.__path)
+                self.__file = gzip.open(
+                    self.__path,
+                    "at",
+                    encoding="utf-8",
+                    compresslevel=self.__compresslevel,
+                )
+            self.__file.writelines(
+                json.dumps(record, ensure_ascii=False, default=str) + "\n"
+                for record in records
+            )
+            self.__file.flush()
+        except Exception:
+            self.logger.exception("Ошибка записи в %s.", self.__path)
+
+    def __close_file(self) -> None:
+        file, self.__file = self.__file, None
+        if file is not None:
+            file.close()
+
+
+class ReplayTransport(Middleware):
+    """
+    Воспроизведение записанных ответов Api.
+
+    Отвечает на запросы записанными ответами без обращения
+    к Api, поэтому клиенту не нужны сессии и токен. Ответ
+    выбирается по методу, пути и аргументам запроса в порядке
+    записи, последний ответ на запрос повторяется.
+
+    Ставится последним в цепочку middleware.
+
+    :param path: Путь к файлу записи.
+    :param speed: Скорость воспроизведения: ответ задерживается
+      на записанную длительность, деленную на speed.
+      None - отвечать без задержки.
+    """
+
+    logger = logging.getLogger("finam_rest_client.ReplayTransport")
+
+    def __init__(self, path: str | os.PathLike, speed: float | None = 1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be greater than 0.")
+        self.__speed = speed
+        self.__responses: dict[tuple, deque[dict[str, Any]]] = {}
+        for record in read_records(path):
+            key = _request_key(record["m"], record["p"], record["a"])
+            self.__responses.setdefault(key, deque()).append(record)
+        self.logger.info(
+            "Загружено ответов: %s.",
+            sum(map(len, self.__responses.values())),
+        )
+
+    async def __call__(
+        self, request: ApiRequest, call_next: Handler
+    ) -> ApiResponse:
+        """Записанный ответ на запрос."""
+        key = _request_key(
+            request.method, request.path, _arguments(request.kwargs)
+        )
+        records = self.__responses.get(key)
+        if not records:
+            raise BaseApiException(
+                f"Нет записанного ответа: {request.method} {request.path}."
+            )
+        record = records.popleft() if len(records) > 1 else records[0]
+        if self.__speed is not None:
+            await asyncio.sleep(record["d"] / self.__speed)
+        if "e" in record:
+            name, message = record["e"]
+            exc_type = getattr(exceptions, name, BaseApiException)
+            raise exc_type(message)
+        return ApiResponse(record["s"], record["ok"], request.resp_model)
+
+
+async def replay_traffic(
+    client, path: str | os.PathLike, speed: float | None = 1.0
+) -> list[tuple[float, BaseException | None]]:
+    """
+    Повторная отправка записанных запросов через клиента.
+
+    Запросы отправляются через цепочку middleware клиента
+    в моменты, записанные относительно первого запроса,
+    поэтому воспроизводится форма нагрузки (например,
+    всплеск запросов на открытии торгов).
+
+    :param client: Экземпляр клиента;
+    :param path: путь к файлу записи;
+    :param speed: скорость воспроизведения. None - отправить
+      все запросы сразу.
+
+    :return: Длительность каждого запроса (секунды) и исключение,
+      если запрос завершился ошибкой, в порядке записи.
+    """
+    records = list(read_records(path))
+    if not records:
+        return []
+    first = min(record["t"] for record in records)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def send(record: dict[str, Any]) -> tuple[float, Any]:
+        if speed is not None:
+            moment = started + (record["t"] - first) / speed
+            await asyncio.sleep(moment - loop.time())
+        kwargs = dict(record["a"])
+        if "data" in kwargs:
+            kwargs["data"] = kwargs["data"].encode()
+            kwargs["headers"] = {"Content-Type": "application/json"}
+        request = ApiRequest(
+            record["m"],
+            record["p"],
+            getattr(response_models, record["r"]),
+            lane=Lane(record["l"]),
+            family=record["f"],
+            kwargs=kwargs,
+        )
+        begin = time.perf_counter()
+        try:
+            await client.pipeline(request)
+        except Exception as exc:
+            return time.perf_counter() - begin, exc
+        return time.perf_counter() - begin, None
+
+    return list(await asyncio.gather(*(send(record) for record in records)))
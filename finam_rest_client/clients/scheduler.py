@@ -0,0 +1,278 @@
+"""Централизованный опрос портфеля, заявок и стоп-заявок."""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime
+from datetime import time as dt_time
+from typing import Literal
+from zoneinfo import ZoneInfo
+
+from finam_rest_client.models.common_types import OrderStatus, StopStatus
+from finam_rest_client.models.response_models.base import BaseResponseModel
+
+from .rate_limit import RateLimiter
+
+PollKind = Literal["portfolio", "orders", "stops"]
+Callback = Callable[[BaseResponseModel], Awaitable[None] | None]
+
+MOEX_SESSION_START = dt_time(6, 50)
+MOEX_SESSION_END = dt_time(23, 50)
+
+
+class TradingSession:
+    """
+    Расписание торговой сессии.
+
+    По умолчанию соответствует сессии Московской биржи.
+
+    :param start: Время начала сессии;
+    :param end: время окончания сессии;
+    :param time_zone: имя часового пояса расписания;
+    :param weekdays: торговые дни недели (0 - понедельник).
+    """
+
+    __slots__ = "__start", "__end", "__tz", "__weekdays"
+
+    def __init__(
+        self,
+        start: dt_time = MOEX_SESSION_START,
+        end: dt_time = MOEX_SESSION_END,
+        time_zone: str = "Europe/Moscow",
+        weekdays: Iterable[int] = (0, 1, 2, 3, 4),
+    ):
+        self.__start = start
+        self.__end = end
+        self.__tz = ZoneInfo(time_zone)
+        self.__weekdays = frozenset(weekdays)
+
+    def is_open(self, moment: datetime | None = None) -> bool:
+        """
+        Проверка, идет ли торговая сессия.
+
+        :param moment: Момент времени. По умолчанию текущий.
+
+        :return: True, если сессия идет.
+        """
+        moment = (moment or datetime.now(self.__tz)).astimezone(self.__tz)
+        if moment.weekday() not in self.__weekdays:
+            return False
+        return self.__start <= moment.time() < self.__end
+
+
+class _ClientState:
+    """Состояние опроса одного торгового кода клиента."""
+
+    __slots__ = "subscribers", "working", "last_activity", "wake", "task"
+
+    def __init__(self):
+        self.subscribers: dict[PollKind, list[Callback]] = {}
+        self.working: dict[PollKind, bool] = {}
+        self.last_activity = float("-inf")
+        self.wake = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
+class PollingScheduler:
+    """
+    Планировщик опроса портфеля, заявок и стоп-заявок.
+
+    Для каждого торгового кода клиента запускается одна задача,
+    результаты которой рассылаются всем подписчикам.
+    Интервал опроса подстраивается под активность:
+
+    - fast_interval - сразу после отправки заявки и пока
+      есть активные заявки;
+    - idle_interval - во время сессии без активности;
+    - off_session_interval - вне торговой сессии.
+
+    Все запросы проходят через общий ограничитель частоты.
+
+    :param client: Экземпляр клиента;
+    :param rate_limiter: ограничитель частоты запросов;
+    :param fast_interval: интервал опроса при активности (секунды);
+    :param idle_interval: интервал опроса без активности (секунды);
+    :param off_session_interval: интервал опроса вне сессии (секунды);
+    :param activity_timeout: сколько секунд после отправки заявки
+      сохраняется быстрый опрос;
+    :param trading_session: расписание торговой сессии.
+    """
+
+    logger = logging.getLogger("finam_rest_client.PollingScheduler")
+
+    def __init__(
+        self,
+        client,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        fast_interval: float = 1.0,
+        idle_interval: float = 10.0,
+        off_session_interval: float = 60.0,
+        activity_timeout: float = 30.0,
+        trading_session: TradingSession | None = None,
+    ):
+        self.__client = client
+        self.__rate_limiter = rate_limiter or RateLimiter(rate=2, capacity=3)
+        self.__fast_interval = fast_interval
+        self.__idle_interval = idle_interval
+        self.__off_session_interval = off_session_interval
+        self.__activity_timeout = activity_timeout
+        self.__trading_session = trading_session or TradingSession()
+        self.__states: dict[str, _ClientState] = {}
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Ограничитель частоты запросов."""
+        return self.__rate_limiter
+
+    def subscribe(
+        self, client_id: str, kind: PollKind, callback: Callback
+    ) -> None:
+        """
+        Подписка на результаты опроса.
+
+        Задача опроса запускается при первой подписке
+        на торговый код клиента.
+
+        :param client_id: Торговый код клиента;
+        :param kind: тип данных: portfolio, orders или stops;
+        :param callback: функция или корутина, принимающая
+          модель ответа.
+        """
+        self.logger.debug(
+            "Подписка: client_id=%s, kind=%s, callback=%s.",
+            client_id,
+            kind,
+            callback,
+        )
+        state = self.__states.setdefault(client_id, _ClientState())
+        state.subscribers.setdefault(kind, []).append(callback)
+        if state.task is None or state.task.done():
+            state.task = asyncio.create_task(self.__poll(client_id, state))
+        else:
+            state.wake.set()
+
+    def unsubscribe(
+        self, client_id: str, kind: PollKind, callback: Callback
+    ) -> None:
+        """
+        Отписка от результатов опроса.
+
+        Когда подписчиков не остается, задача опроса завершается.
+
+        :param client_id: Торговый код клиента;
+        :param kind: тип данных: portfolio, orders или stops;
+        :param callback: ранее переданный в subscribe объект.
+        """
+        state = self.__states.get(client_id)
+        if not state or callback not in state.subscribers.get(kind, ()):
+            return
+        state.subscribers[kind].remove(callback)
+        if not state.subscribers[kind]:
+            del state.subscribers[kind]
+            state.working.pop(kind, None)
+        if not state.subscribers:
+            del self.__states[client_id]
+            state.wake.set()
+
+    def notify_activity(self, client_id: str) -> None:
+        """
+        Сообщить об отправке заявки.
+
+        Переводит опрос торгового кода клиента в быстрый режим
+        и запускает внеочередной цикл опроса.
+
+        :param client_id: Торговый код клиента.
+        """
+        state = self.__states.get(client_id)
+        if not state:
+            return
+        state.last_activity = time.monotonic()
+        state.wake.set()
+
+    def interval(self, client_id: str) -> float:
+        """
+        Текущий интервал опроса торгового кода клиента.
+
+        :param client_id: Торговый код клиента.
+
+        :return: Интервал в секундах.
+        """
+        state = self.__states.get(client_id)
+        if state is None:
+            return self.__idle_interval
+        elapsed = time.monotonic() - state.last_activity
+        if elapsed < self.__activity_timeout:
+            return self.__fast_interval
+        if not self.__trading_session.is_open():
+            return self.__off_session_interval
+        if any(state.working.values()):
+            return self.__fast_interval
+        return self.__idle_interval
+
+    async def stop(self) -> None:
+        """Остановка всех задач опроса и удаление подписок."""
+        self.logger.info("Остановка планировщика.")
+        states, self.__states = self.__states, {}
+        tasks = [state.task for state in states.values() if state.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __poll(self, client_id: str, state: _ClientState) -> None:
+        self.logger.info("Запущен опрос: client_id=%s.", client_id)
+        while self.__states.get(client_id) is state:
+            state.wake.clear()
+            for kind, callbacks in list(state.subscribers.items()):
+                await self.__rate_limiter.acquire()
+                try:
+                    result = await self.__fetch(client_id, kind)
+                except Exception as exc:
+                    self.logger.warning(
+                        "Ошибка опроса %s для %s: %s.", kind, client_id, exc
+                    )
+                    continue
+                state.working[kind] = self.__is_working(result)
+                await self.__fan_out(list(callbacks), result)
+            try:
+                await asyncio.wait_for(
+                    state.wake.wait(), self.interval(client_id)
+                )
+            except TimeoutError:
+                pass
+        self.logger.info("Опрос завершен: client_id=%s.", client_id)
+
+    async def __fetch(
+        self, client_id: str, kind: PollKind
+    ) -> BaseResponseModel:
+        if kind == "portfolio":
+            return await self.__client.get_portfolio(client_id=client_id)
+        if kind == "orders":
+            return await self.__client.get_orders(client_id=client_id)
+        return await self.__client.get_stops(client_id=client_id)
+
+    @staticmethod
+    def __is_working(result) -> bool:
+        data = result.data
+        if data is None:
+            return False
+        for order in getattr(data, "orders", ()):
+            if order.status in (OrderStatus.none, OrderStatus.active):
+                return True
+        for stop in getattr(data, "stops", ()):
+            if stop.status == StopStatus.active:
+                return True
+        return False
+
+    async def __fan_out(
+        self, callbacks: list[Callback], result: BaseResponseModel
+    ) -> None:
+        for callback in callbacks:
+            try:
+                awaitable = callback(result)
+                if inspect.isawaitable(awaitable):
+                    await awaitable
+            except Exception:
+                self.logger.exception("Ошибка в подписчике %s.", callback)
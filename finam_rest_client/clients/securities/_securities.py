@@ -13,15 +13,20 @@ class Securities(BaseObjClient):
     path = "/public/api/v1/securities"
     method = "get"
     logger = logging.getLogger("finam_rest_api_client.Securities")
+    timeout = 60.0
+    family = "securities"
 
     async def get_securities(
         self,
         req_securities: SecuritiesRequest | None = None,
+        deadline: float | None = None,
     ) -> Sec:
         """
         Получение списка инструментов.
 
         :param req_securities: Модель запроса на получение дневных свечей.
+        :param deadline: Крайний срок получения ответа,
+          момент по time.monotonic().
 
         :return: Модель инструментов.
         """
@@ -35,6 +40,7 @@ class Securities(BaseObjClient):
             resp_model=Sec,
             params=data,
             path=self.path,
+            deadline=deadline,
         )
         self.logger.info("Данные получены из ответа Api.")
         return result
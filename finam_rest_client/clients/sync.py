@@ -0,0 +1,281 @@
+"""Синхронный клиент для потоков и кода без asyncio."""
+
+import asyncio
+import inspect
+import logging
+import threading
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+from finam_rest_client.exceptions import BaseApiException
+from finam_rest_client.models.response_models import (
+    CancelOrder,
+    CancelStop,
+    DayCandles,
+    IntraDayCandles,
+    NewOrder,
+    NewStop,
+)
+from finam_rest_client.models.response_models import Orders as GetOrders
+from finam_rest_client.models.response_models import Portfolio as Pf
+from finam_rest_client.models.response_models import Securities as Sec
+from finam_rest_client.models.response_models import Stops as GetStops
+
+from ._client import FinamRestClient
+
+T = TypeVar("T")
+Call = tuple[str, dict[str, Any]]
+
+
+class SyncFinamRestClient:
+    """
+    Синхронный клиент.
+
+    Владеет одним потоком с событийным циклом и одним экземпляром
+    FinamRestClient, поэтому соединения переиспользуются между
+    вызовами. Методы можно вызывать из любых потоков.
+
+    Перед использованием важно вызвать метод start(),
+    а по окончании использования close().
+
+    Либо можно воспользоваться менеджером контекста.
+
+    :param token: Токен доступа к Api.
+    :param timeout: Время ожидания результата вызова (секунды).
+      None - ждать без ограничения.
+    :param options: Остальные аргументы FinamRestClient.
+    """
+
+    logger = logging.getLogger("finam_rest_client.SyncFinamRestClient")
+
+    def __init__(
+        self, token: str, *, timeout: float | None = None, **options: Any
+    ):
+        self.__token = token
+        self.__timeout = timeout
+        self.__options = options
+        self.__lock = threading.Lock()
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__thread: threading.Thread | None = None
+        self.__client: FinamRestClient | None = None
+
+    @property
+    def client(self) -> FinamRestClient:
+        """
+        Асинхронный клиент, работающий в фоновом потоке.
+
+        :raise BaseApiException: Если клиент не запущен.
+        """
+        if self.__client is None:
+            raise self.__not_started()
+        return self.__client
+
+    def __enter__(self) -> "SyncFinamRestClient":
+        """Вход в менеджер контекста."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Выход из менеджера контекста."""
+        self.close()
+
+    def start(self) -> None:
+        """
+        Запуск потока событийного цикла и сессии клиента.
+
+        Повторный вызов ничего не делает.
+        """
+        with self.__lock:
+            if self.__client is not None:
+                return
+            self.logger.info("Запуск потока событийного цикла.")
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="finam-rest-client",
+                daemon=True,
+            )
+            thread.start()
+            future = asyncio.run_coroutine_threadsafe(self.__open(), loop)
+            try:
+                self.__client = self.__result(future)
+            except BaseException:
+                self.__stop_loop(loop, thread)
+                raise
+            self.__loop, self.__thread = loop, thread
+
+    def close(self) -> None:
+        """Закрытие сессии клиента и остановка потока."""
+        with self.__lock:
+            client, self.__client = self.__client, None
+            loop, self.__loop = self.__loop, None
+            thread, self.__thread = self.__thread, None
+            if client is None or loop is None or thread is None:
+                return
+            self.logger.info("Остановка потока событийного цикла.")
+            try:
+                self.__result(
+                    asyncio.run_coroutine_threadsafe(
+                        client.__aexit__(None, None, None), loop
+                    )
+                )
+            finally:
+                self.__stop_loop(loop, thread)
+
+    def submit(self, awaitable: Awaitable[T]) -> "Future[T]":
+        """
+        Запуск корутины в цикле клиента без ожидания результата.
+
+        :param awaitable: Корутина, например
+          client.get_portfolio(client_id="...").
+
+        :return: Future с результатом.
+        """
+        loop = self.__loop
+        if loop is None:
+            raise self.__not_started()
+        return asyncio.run_coroutine_threadsafe(self.__wrap(awaitable), loop)
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Выполнение корутины в цикле клиента.
+
+        Позволяет вызывать асинхронные объекты клиента, например
+        PreparedCandlesQuery.fetch или OrderTemplate.send.
+        Если результат не получен за timeout, корутина отменяется.
+
+        :param awaitable: Корутина.
+
+        :raise TimeoutError: Если истекло время ожидания.
+
+        :return: Результат корутины.
+        """
+        return self.__result(self.submit(awaitable))
+
+    def batch(
+        self, calls: Iterable[Call], *, return_exceptions: bool = False
+    ) -> list[Any]:
+        """
+        Одновременное выполнение нескольких вызовов.
+
+        Все вызовы запускаются в цикле клиента сразу и проходят
+        через его ограничитель частоты и пулы соединений.
+
+        :param calls: Пары (имя метода, именованные аргументы),
+          например ("get_portfolio", {"client_id": "..."}).
+        :param return_exceptions: Возвращать исключения в списке
+          результатов вместо их выброса.
+
+        :raise AttributeError: Если у клиента нет метода;
+        :raise TypeError: если аргументы не подходят методу.
+          В обоих случаях ни один вызов не выполняется.
+
+        :return: Результаты в порядке вызовов.
+        """
+        client = self.client
+        methods = []
+        for name, kwargs in calls:
+            method = getattr(client, name)
+            inspect.signature(method).bind(**kwargs)
+            methods.append((method, kwargs))
+        self.logger.debug("Пакетный вызов: %s методов.", len(methods))
+        return self.run(self.__gather(methods, return_exceptions))
+
+    def check_token(self) -> None:
+        """Синхронный вызов FinamRestClient.check_token."""
+        return self.run(self.client.check_token())
+
+    def get_candles(self, *args, **kwargs) -> DayCandles | IntraDayCandles:
+        """Синхронный вызов FinamRestClient.get_candles."""
+        return self.run(self.client.get_candles(*args, **kwargs))
+
+    def get_securities(self, *args, **kwargs) -> Sec:
+        """Синхронный вызов FinamRestClient.get_securities."""
+        return self.run(self.client.get_securities(*args, **kwargs))
+
+    def get_portfolio(self, *args, **kwargs) -> Pf:
+        """Синхронный вызов FinamRestClient.get_portfolio."""
+        return self.run(self.client.get_portfolio(*args, **kwargs))
+
+    def get_orders(self, *args, **kwargs) -> GetOrders:
+        """Синхронный вызов FinamRestClient.get_orders."""
+        return self.run(self.client.get_orders(*args, **kwargs))
+
+    def create_order(self, *args, **kwargs) -> NewOrder:
+        """Синхронный вызов FinamRestClient.create_order."""
+        return self.run(self.client.create_order(*args, **kwargs))
+
+    def cancel_order(self, *args, **kwargs) -> CancelOrder:
+        """Синхронный вызов FinamRestClient.cancel_order."""
+        return self.run(self.client.cancel_order(*args, **kwargs))
+
+    def get_stops(self, *args, **kwargs) -> GetStops:
+        """Синхронный вызов FinamRestClient.get_stops."""
+        return self.run(self.client.get_stops(*args, **kwargs))
+
+    def create_stop(self, *args, **kwargs) -> NewStop:
+        """Синхронный вызов FinamRestClient.create_stop."""
+        return self.run(self.client.create_stop(*args, **kwargs))
+
+    def cancel_stop(self, *args, **kwargs) -> CancelStop:
+        """Синхронный вызов FinamRestClient.cancel_stop."""
+        return self.run(self.client.cancel_stop(*args, **kwargs))
+
+    async def __open(self) -> FinamRestClient:
+        client = FinamRestClient(self.__token, **self.__options)
+        await client.__aenter__()
+        return client
+
+    def __result(self, future: "Future[T]") -> T:
+        try:
+            return future.result(self.__timeout)
+        except TimeoutError:
+            # Иначе корутина продолжит выполняться в цикле клиента.
+            future.cancel()
+            raise
+
+    @staticmethod
+    async def __gather(
+        methods: list[tuple[Callable[..., Awaitable[Any]], dict[str, Any]]],
+        return_exceptions: bool,
+    ) -> list[Any]:
+        # Корутины создаются в цикле клиента, поэтому при отмене
+        # до запуска не остается корутин без await.
+        return await asyncio.gather(
+            *(method(**kwargs) for method, kwargs in methods),
+            return_exceptions=return_exceptions,
+        )
+
+    @staticmethod
+    async def __wrap(awaitable: Awaitable[T]) -> T:
+        return await awaitable
+
+    @staticmethod
+    def __not_started() -> BaseApiException:
+        return BaseApiException(
+            "Клиент не запущен. "
+            "Воспользуйтесь методом start "
+            "или менеджером контекста."
+        )
+
+    def __stop_loop(
+        self, loop: asyncio.AbstractEventLoop, thread: threading.Thread
+    ) -> None:
+        try:
+            asyncio.run_coroutine_threadsafe(
+                self.__cancel_tasks(), loop
+            ).result(self.__timeout)
+        except TimeoutError:
+            self.logger.warning("Задачи цикла не завершились при отмене.")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    @staticmethod
+    async def __cancel_tasks() -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
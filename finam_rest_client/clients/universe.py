@@ -0,0 +1,477 @@
+"""Опрос последних свечей по большому набору инструментов."""
+
+import asyncio
+import logging
+import time
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import UTC, date, datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypeVar
+
+from finam_rest_client.models.common_types import FinamDecimal, OrderStatus
+from finam_rest_client.models.response_models import IntraDayCandle
+
+from .candles import PreparedCandlesQuery
+from .rate_limit import RateLimiter
+
+if TYPE_CHECKING:
+    from .bars import BarBuffers
+
+TimeFrame = Literal["M1", "M5", "M15", "H1", "D1", "W1"]
+T = TypeVar("T")
+
+#: Количество попыток согласованного чтения LastBarTable.
+READ_ATTEMPTS = 1000
+
+
+class BarKey(NamedTuple):
+    """Ключ инструмента: режим торгов, код и тайм-фрейм."""
+
+    board: str
+    code: str
+    time_frame: TimeFrame
+
+
+class LastBarSnapshot(NamedTuple):
+    """
+    Согласованный снимок таблицы последних свечей.
+
+    Элементы массивов с одинаковым индексом относятся к ключу
+    keys[i]. Время свечи хранится в секундах UTC, для ключей
+    без данных равно 0.
+    """
+
+    keys: tuple[BarKey, ...]
+    timestamp: array
+    open: array
+    high: array
+    low: array
+    close: array
+    volume: array
+    updated: array
+
+
+class LastBarTable:
+    """
+    Таблица последних свечей по инструментам.
+
+    Данные хранятся в колонках array, по строке на ключ.
+    Писатель (UniversePoller) увеличивает счетчик версии до
+    и после записи, поэтому читатели из любых потоков могут
+    получить согласованный снимок без блокировок. Если чтение
+    пересеклось с записью, читатель уступает поток писателю
+    и повторяет чтение, но не больше READ_ATTEMPTS раз.
+
+    :param capacity: Начальное количество строк.
+    """
+
+    __slots__ = "__index", "__keys", "__columns", "__version"
+    _columns = (
+        ("timestamp", "d"),
+        ("open", "d"),
+        ("high", "d"),
+        ("low", "d"),
+        ("close", "d"),
+        ("volume", "q"),
+        ("updated", "d"),
+    )
+
+    def __init__(self, capacity: int = 1024):
+        self.__index: dict[BarKey, int] = {}
+        self.__keys: list[BarKey] = []
+        self.__columns = self.__allocate(capacity)
+        self.__version = 0
+
+    def __len__(self) -> int:
+        """Количество ключей в таблице."""
+        return len(self.__keys)
+
+    @property
+    def version(self) -> int:
+        """Счетчик версии. Нечетное значение означает запись."""
+        return self.__version
+
+    def add(self, key: BarKey) -> int:
+        """
+        Добавление ключа в таблицу.
+
+        :param key: Ключ инструмента.
+
+        :return: Номер строки ключа.
+        """
+        if key in self.__index:
+            return self.__index[key]
+        row = len(self.__keys)
+        self.__version += 1
+        if row == len(self.__columns["timestamp"]):
+            columns = self.__allocate(max(row * 2, 1))
+            for name, column in self.__columns.items():
+                columns[name][:row] = column
+            self.__columns = columns
+        self.__keys.append(key)
+        self.__index[key] = row
+        self.__version += 1
+        return row
+
+    def update(
+        self,
+        key: BarKey,
+        timestamp: float,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+    ) -> None:
+        """Запись последней свечи по ключу."""
+        row = self.add(key)
+        columns = self.__columns
+        self.__version += 1
+        try:
+            columns["timestamp"][row] = timestamp
+            columns["open"][row] = open
+            columns["high"][row] = high
+            columns["low"][row] = low
+            columns["close"][row] = close
+            columns["volume"][row] = volume
+            columns["updated"][row] = time.time()
+        finally:
+            self.__version += 1
+
+    def snapshot(self) -> LastBarSnapshot:
+        """
+        Получение согласованной копии таблицы.
+
+        Если во время копирования произошла запись,
+        копирование повторяется.
+
+        :raise RuntimeError: Если за READ_ATTEMPTS попыток
+          не удалось получить согласованную копию.
+        """
+
+        def read() -> LastBarSnapshot:
+            size = len(self.__keys)
+            keys = tuple(self.__keys[:size])
+            columns = {
+                name: column[:size] for name, column in self.__columns.items()
+            }
+            return LastBarSnapshot(keys=keys, **columns)
+
+        return self.__read(read)
+
+    def get(self, key: BarKey) -> tuple[float, ...] | None:
+        """
+        Последняя свеча по ключу.
+
+        :raise RuntimeError: Если за READ_ATTEMPTS попыток
+          не удалось получить согласованные значения.
+
+        :return: (timestamp, open, high, low, close, volume) или None,
+          если данных нет.
+        """
+        row = self.__index.get(key)
+        if row is None:
+            return None
+
+        def read() -> tuple[float, ...]:
+            columns = self.__columns
+            return tuple(
+                columns[name][row]
+                for name in ("timestamp", "open", "high", "low", "close")
+            ) + (columns["volume"][row],)
+
+        result = self.__read(read)
+        return result if result[0] else None
+
+    def __read(self, read: Callable[[], T]) -> T:
+        for _ in range(READ_ATTEMPTS):
+            version = self.__version
+            if not version % 2:
+                result = read()
+                if version == self.__version:
+                    return result
+            # Уступить поток писателю вместо активного ожидания.
+            time.sleep(0)
+        raise RuntimeError("Не удалось прочитать таблицу последних свечей.")
+
+    @classmethod
+    def __allocate(cls, capacity: int) -> dict[str, array]:
+        return {
+            name: array(typecode, bytes(array(typecode).itemsize * capacity))
+            for name, typecode in cls._columns
+        }
+
+
+class UniversePoller:
+    """
+    Опрос последних свечей по набору инструментов.
+
+    Ключи обходятся по кругу (round-robin). Ключи инструментов,
+    по которым есть позиции или активные заявки, находятся в
+    приоритетной очереди и опрашиваются чаще: на priority_share
+    приоритетных запросов приходится один обычный.
+    Запросы равномерно распределяются ограничителем частоты,
+    каждый запрос ограничен request_timeout.
+
+    :param client: Экземпляр клиента;
+    :param keys: начальный набор ключей;
+    :param rate_limiter: ограничитель частоты запросов;
+    :param concurrency: количество одновременных запросов;
+    :param priority_share: доля приоритетных запросов;
+    :param request_timeout: таймаут одного запроса (секунды);
+    :param table: таблица для записи последних свечей;
+    :param buffers: кольцевые буферы, в которые записываются
+      ответы опроса (BarBuffers).
+    """
+
+    logger = logging.getLogger("finam_rest_client.UniversePoller")
+
+    def __init__(
+        self,
+        client,
+        keys: Iterable[tuple[str, str, TimeFrame]] = (),
+        *,
+        rate_limiter: RateLimiter | None = None,
+        concurrency: int = 4,
+        priority_share: int = 3,
+        request_timeout: float = 5.0,
+        table: LastBarTable | None = None,
+        buffers: "BarBuffers | None" = None,
+    ):
+        self.__client = client
+        self.__rate_limiter = rate_limiter or RateLimiter(rate=2, capacity=2)
+        self.__concurrency = concurrency
+        self.__priority_share = priority_share
+        self.__request_timeout = request_timeout
+        self.__table = table or LastBarTable()
+        self.__buffers = buffers
+        self.__keys: set[BarKey] = set()
+        self.__queries: dict[BarKey, PreparedCandlesQuery] = {}
+        self.__priority_codes: set[tuple[str, str]] = set()
+        self.__normal: deque[BarKey] = deque()
+        self.__priority: deque[BarKey] = deque()
+        self.__turn = 0
+        self.__tasks: list[asyncio.Task] = []
+        self.__followed: dict[str, tuple[Any, dict[str, Callable]]] = {}
+        for key in keys:
+            self.add(*key)
+
+    @property
+    def table(self) -> LastBarTable:
+        """Таблица последних свечей."""
+        return self.__table
+
+    @property
+    def buffers(self) -> "BarBuffers | None":
+        """Кольцевые буферы свечей."""
+        return self.__buffers
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Ограничитель частоты запросов."""
+        return self.__rate_limiter
+
+    def add(self, board: str, code: str, time_frame: TimeFrame) -> None:
+        """Добавление инструмента в опрос."""
+        key = BarKey(board, code, time_frame)
+        if key in self.__keys:
+            return
+        self.__keys.add(key)
+        self.__table.add(key)
+        self.__queue_for(key).append(key)
+
+    def remove(self, board: str, code: str, time_frame: TimeFrame) -> None:
+        """Исключение инструмента из опроса."""
+        key = BarKey(board, code, time_frame)
+        if key not in self.__keys:
+            return
+        self.__keys.remove(key)
+        self.__queries.pop(key, None)
+        # Ключ удаляется из очереди сразу: иначе повторное
+        # добавление оставило бы в очереди две его копии.
+        for queue in (self.__priority, self.__normal):
+            if key in queue:
+                queue.remove(key)
+
+    def set_priority(self, codes: Iterable[tuple[str, str]]) -> None:
+        """
+        Установка приоритетных инструментов.
+
+        :param codes: Пары (board, code). Пустой board означает
+          любой режим торгов.
+        """
+        self.__priority_codes = set(codes)
+        keys = [*self.__priority, *self.__normal]
+        self.__priority.clear()
+        self.__normal.clear()
+        for key in keys:
+            self.__queue_for(key).append(key)
+
+    def update_priority(self, portfolio=None, orders=None) -> None:
+        """
+        Обновление приоритетов по портфелю и заявкам.
+
+        Приоритетными становятся инструменты с ненулевой позицией
+        и с активными заявками.
+
+        :param portfolio: Модель ответа Portfolio;
+        :param orders: модель ответа Orders.
+        """
+        codes: set[tuple[str, str]] = set()
+        if portfolio is not None and portfolio.data is not None:
+            codes.update(
+                ("", position.security_code)
+                for position in portfolio.data.positions
+                if position.balance
+            )
+        if orders is not None and orders.data is not None:
+            codes.update(
+                (order.security_board, order.security_code)
+                for order in orders.data.orders
+                if order.status in (OrderStatus.none, OrderStatus.active)
+            )
+        self.set_priority(codes)
+
+    def follow(self, scheduler, client_id: str) -> None:
+        """
+        Подписка на планировщик для автоматической смены приоритетов.
+
+        Предыдущая подписка по торговому коду клиента отменяется.
+
+        :param scheduler: Экземпляр PollingScheduler;
+        :param client_id: торговый код клиента.
+        """
+        self.unfollow(client_id)
+        last: dict[str, object] = {}
+
+        def on_update(kind: str, result) -> None:
+            last[kind] = result
+            self.update_priority(last.get("portfolio"), last.get("orders"))
+
+        callbacks: dict[str, Callable] = {
+            kind: partial(on_update, kind) for kind in ("portfolio", "orders")
+        }
+        self.__followed[client_id] = scheduler, callbacks
+        for kind, callback in callbacks.items():
+            scheduler.subscribe(client_id, kind, callback)
+
+    def unfollow(self, client_id: str) -> None:
+        """
+        Отписка от планировщика, выполненная в follow.
+
+        :param client_id: Торговый код клиента.
+        """
+        followed = self.__followed.pop(client_id, None)
+        if followed is None:
+            return
+        scheduler, callbacks = followed
+        for kind, callback in callbacks.items():
+            scheduler.unsubscribe(client_id, kind, callback)
+
+    def start(self) -> None:
+        """Запуск задач опроса."""
+        if self.__tasks:
+            return
+        self.logger.info(
+            "Запуск опроса %s инструментов в %s потоков.",
+            len(self.__keys),
+            self.__concurrency,
+        )
+        self.__tasks = [
+            asyncio.create_task(self.__worker())
+            for _ in range(self.__concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Остановка задач опроса."""
+        tasks, self.__tasks = self.__tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.logger.info("Опрос остановлен.")
+
+    async def __aenter__(self):
+        """Вход в менеджер контекста."""
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Выход из менеджера контекста."""
+        await self.stop()
+
+    def __is_priority(self, key: BarKey) -> bool:
+        codes = self.__priority_codes
+        return (key.board, key.code) in codes or ("", key.code) in codes
+
+    def __queue_for(self, key: BarKey) -> deque[BarKey]:
+        if self.__is_priority(key):
+            return self.__priority
+        return self.__normal
+
+    def __next_key(self) -> BarKey | None:
+        if not self.__priority and not self.__normal:
+            return None
+        self.__turn = (self.__turn + 1) % (self.__priority_share + 1)
+        use_priority = self.__priority and (self.__turn or not self.__normal)
+        queue = self.__priority if use_priority else self.__normal
+        key = queue.popleft()
+        queue.append(key)
+        return key
+
+    async def __worker(self) -> None:
+        while True:
+            key = self.__next_key()
+            if key is None:
+                await asyncio.sleep(1 / self.__rate_limiter.rate)
+                continue
+            await self.__rate_limiter.acquire()
+            if key not in self.__keys:
+                self.logger.debug("Ключ %s исключен из опроса.", key)
+                continue
+            try:
+                await asyncio.wait_for(
+                    self.__poll(key), self.__request_timeout
+                )
+            except TimeoutError:
+                self.logger.warning("Превышено время ожидания: %s.", key)
+            except Exception as exc:
+                self.logger.warning("Ошибка опроса %s: %s.", key, exc)
+
+    async def __poll(self, key: BarKey) -> None:
+        if key.time_frame in ("D1", "W1"):
+            to: date | datetime = datetime.now(UTC).date()
+        else:
+            to = datetime.now(UTC)
+        query = self.__queries.get(key)
+        if query is None:
+            query = self.__queries[key] = self.__client.prepare_candles(
+                security_code=key.code,
+                security_board=key.board,
+                time_frame=key.time_frame,
+                count=1,
+            )
+        result = await query.fetch(to=to)
+        if result.data is None or not result.data.candles:
+            return
+        if self.__buffers is not None:
+            self.__buffers.feed(key.board, key.code, key.time_frame, result)
+        candle = result.data.candles[-1]
+        if isinstance(candle, IntraDayCandle):
+            moment = candle.timestamp
+        else:
+            moment = datetime.combine(candle.date, datetime.min.time(), UTC)
+        self.__table.update(
+            key,
+            timestamp=moment.timestamp(),
+            open=_to_float(candle.open),
+            high=_to_float(candle.high),
+            low=_to_float(candle.low),
+            close=_to_float(candle.close),
+            volume=candle.volume,
+        )
+
+
+def _to_float(value: FinamDecimal) -> float:
+    return value.num / 10**value.scale
@@ -0,0 +1,84 @@
+"""Разбор больших ответов Api вне событийного цикла."""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import TypeVar
+
+from finam_rest_client.models.response_models.base import BaseResponseModel
+
+M = TypeVar("M", bound=BaseResponseModel)
+
+
+def _validate(resp_model: type[M], text: str | bytes) -> M:
+    return resp_model.model_validate_json(text)
+
+
+class ValidationOffload:
+    """
+    Политика разбора ответов по размеру.
+
+    Ответы короче threshold символов разбираются сразу
+    в событийном цикле: передача в пул стоит дороже разбора.
+    Большие ответы (например, Securities) разбираются в executor,
+    чтобы цикл не останавливался на десятки миллисекунд.
+
+    Рекомендуется пул процессов (ProcessPoolExecutor): разбор
+    идет в другом процессе, а модель восстанавливается из pickle
+    в служебном потоке пула, который уступает GIL циклу.
+    Пул потоков (ThreadPoolExecutor) полезен, только если
+    разбор отпускает GIL: pydantic-core удерживает его на все
+    время model_validate_json, и цикл стоит так же, как при
+    разборе в нем самом (см. benchmarks/validation_offload.py).
+
+    :param executor: Пул для разбора;
+    :param threshold: размер ответа (символы), начиная с которого
+      разбор переносится в executor.
+    """
+
+    __slots__ = "__threshold", "__executor", "__offloaded"
+    logger = logging.getLogger("finam_rest_client.ValidationOffload")
+
+    def __init__(self, executor: Executor, threshold: int = 256 * 1024):
+        if threshold < 0:
+            raise ValueError("threshold must not be negative.")
+        self.__threshold = threshold
+        self.__executor = executor
+        self.__offloaded = 0
+
+    @property
+    def threshold(self) -> int:
+        """Размер ответа, начиная с которого используется executor."""
+        return self.__threshold
+
+    @property
+    def executor(self) -> Executor:
+        """Пул для разбора ответов."""
+        return self.__executor
+
+    @property
+    def offloaded(self) -> int:
+        """Количество ответов, разобранных в executor."""
+        return self.__offloaded
+
+    async def validate(self, resp_model: type[M], text: str) -> M:
+        """
+        Разбор ответа.
+
+        :param resp_model: Модель ответа;
+        :param text: текст ответа в json.
+
+        :return: Модель ответа.
+        """
+        if len(text) < self.__threshold:
+            return resp_model.model_validate_json(text)
+        self.__offloaded += 1
+        self.logger.debug(
+            "Разбор %s (%s символов) в executor.",
+            resp_model.__name__,
+            len(text),
+        )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.__executor, _validate, resp_model, text
+        )
@@ -0,0 +1,109 @@
+"""Разбиение интервалов истории на окна запросов свечей."""
+
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from typing import TYPE_CHECKING
+
+from finam_rest_client.models.request_models import (
+    DayCandlesRequest,
+    IntraDayCandlesRequest,
+)
+
+if TYPE_CHECKING:
+    from .calendar import SessionCalendar
+
+#: Длительность внутридневных свечей.
+INTRADAY_FRAMES = {
+    "M1": timedelta(minutes=1),
+    "M5": timedelta(minutes=5),
+    "M15": timedelta(minutes=15),
+    "H1": timedelta(hours=1),
+}
+#: Максимальное количество свечей в ответе.
+MAX_CANDLES = 500
+
+
+def plan_windows(
+    from_: date,
+    to: date,
+    max_days: int = DayCandlesRequest.max_interval_days,
+    calendar: "SessionCalendar | None" = None,
+) -> Iterator[tuple[date, date]]:
+    """
+    Разбиение интервала дат на окна запросов свечей.
+
+    Окна не пересекаются, обе границы включаются, разница
+    между границами окна не превышает max_days.
+
+    :param from_: Начало интервала;
+    :param to: конец интервала;
+    :param max_days: максимальная длина окна в днях;
+    :param calendar: календарь сессий. Окна, в которых
+      по календарю нет торговых дней, пропускаются.
+
+    :return: Пары (начало, конец) окон по возрастанию.
+    """
+    if max_days < 0:
+        raise ValueError("max_days must not be negative.")
+    start = from_
+    while start <= to:
+        end = min(to, start + timedelta(days=max_days))
+        if calendar is None or calendar.can_have_bars(start, end):
+            yield start, end
+        start = end + timedelta(days=1)
+
+
+def plan_intraday_windows(
+    from_: datetime,
+    to: datetime,
+    time_frame: str,
+    calendar: "SessionCalendar | None" = None,
+) -> Iterator[tuple[datetime, datetime]]:
+    """
+    Разбиение интервала на окна запросов внутридневных свечей.
+
+    Окно вмещает не больше MAX_CANDLES свечей тайм-фрейма
+    и не длиннее максимального интервала запроса. Окна
+    не пересекаются, обе границы включаются.
+
+    :param from_: Начало интервала;
+    :param to: конец интервала;
+    :param time_frame: тайм-фрейм M1, M5, M15 или H1;
+    :param calendar: календарь сессий. Окна, целиком
+      приходящиеся на неторговые дни и время вне сессии,
+      пропускаются.
+
+    :return: Пары (начало, конец) окон по возрастанию.
+    """
+    step = min(
+        INTRADAY_FRAMES[time_frame] * MAX_CANDLES,
+        timedelta(days=IntraDayCandlesRequest.max_interval_days),
+    )
+    start = from_
+    while start <= to:
+        end = min(to, start + step - timedelta(seconds=1))
+        if calendar is None or calendar.can_have_bars(start, end):
+            yield start, end
+        start += step
+
+
+def as_date(value: date | datetime) -> date:
+    """
+    Дата значения.
+
+    :param value: Дата или момент времени.
+    """
+    return value.date() if isinstance(value, datetime) else value
+
+
+def as_datetime(value: date | datetime, at: time) -> datetime:
+    """
+    Момент времени значения.
+
+    :param value: Дата или момент времени. Время без часового
+      пояса считается временем в UTC;
+    :param at: время суток для даты.
+    """
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=UTC)
+    return datetime.combine(value, at, UTC)
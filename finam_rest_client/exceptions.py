@@ -13,3 +13,40 @@ class AuthenticationException(BaseApiException):
     def __init__(self, message=None):
         message = message or self.message
         super().__init__(message)
+
+
+class RequestTimeoutException(BaseApiException):
+    """Исключение при превышении времени ожидания ответа."""
+
+    message = "Превышено время ожидания ответа."
+
+    def __init__(self, message=None):
+        message = message or self.message
+        super().__init__(message)
+
+
+class DeadlineExceededException(RequestTimeoutException):
+    """Исключение, если крайний срок запроса истек до его отправки."""
+
+    message = "Крайний срок запроса истек, запрос не отправлен."
+
+
+class CircuitOpenException(BaseApiException):
+    """
+    Исключение, если автоматический выключатель разомкнут.
+
+    :param family: Семейство запросов;
+    :param retry_after: через сколько секунд будет разрешен
+      пробный запрос.
+    """
+
+    message = "Запросы {family} временно не отправляются: Api недоступно."
+
+    def __init__(self, family: str, retry_after: float = 0.0):
+        self.family = family
+        self.retry_after = retry_after
+        super().__init__(family, retry_after)
+
+    def __str__(self) -> str:
+        """Текст ошибки."""
+        return self.message.format(family=self.family)
@@ -0,0 +1,14 @@
+"""Базовая модель."""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FinamBaseModel(BaseModel):
+    """
+    Базовая модель для запросов и ответов.
+
+    Схема валидации строится при первом использовании модели,
+    а не при импорте пакета.
+    """
+
+    model_config = ConfigDict(defer_build=True)
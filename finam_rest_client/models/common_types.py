@@ -4,7 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
-from pydantic import BaseModel
+from finam_rest_client.models.base import FinamBaseModel
 
 
 class BuySell(str, Enum):
@@ -21,7 +21,7 @@ class BuySell(str, Enum):
     sell = "Sell"
 
 
-class FinamDecimal(BaseModel):
+class FinamDecimal(FinamBaseModel):
     """
     Представляет десятичное число с плавающей запятой.
 
@@ -83,7 +83,7 @@ class OrderValidBeforeType(str, Enum):
     exact_time = "ExactTime"
 
 
-class OrderValidBefore(BaseModel):
+class OrderValidBefore(FinamBaseModel):
     """
     Условие по времени действия заявки.
 
@@ -217,7 +217,7 @@ class QuantityUnits(str, Enum):
     lots = "Lots"
 
 
-class StopQuantity(BaseModel):
+class StopQuantity(FinamBaseModel):
     """
     Объем стоп заявки.
 
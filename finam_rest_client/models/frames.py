@@ -0,0 +1,277 @@
+"""
+Преобразование списков моделей в таблицы pandas и Polars.
+
+Таблица собирается по столбцам: значения каждого поля
+выбираются из моделей одним проходом в массив numpy
+(числа - в непрерывные массивы int64, float64, даты -
+в datetime64), и массивы передаются в DataFrame без
+копирования, где это возможно. Словари строк не создаются.
+
+Преобразование значений:
+
+- FinamDecimal и Decimal - float64. С decimal_parts=True
+  FinamDecimal записывается столбцами <поле>_num и
+  <поле>_scale без потери точности;
+- вложенные модели - столбцы <поле>.<вложенное поле>;
+- datetime - время в UTC, date - дата;
+- перечисления - значения;
+- отсутствующие значения - NaN, NaT или None.
+
+Требуются numpy и pandas или polars:
+poetry install --with frames.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from itertools import repeat
+from operator import attrgetter, is_
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from .common_types import FinamDecimal
+
+Columns = dict[str, Any]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_MICROSECOND = timedelta(microseconds=1)
+_num = attrgetter("num")
+_scale = attrgetter("scale")
+
+
+def _import(name: str) -> Any:
+    try:
+        return __import__(name)
+    except ImportError as exc:
+        raise ImportError(
+            f"Для преобразования в таблицы установите {name}: "
+            "poetry install --with frames."
+        ) from exc
+
+
+def frame_columns(
+    items: Sequence[BaseModel],
+    model: type[BaseModel],
+    *,
+    decimal_parts: bool = False,
+) -> tuple[Columns, set[str]]:
+    """
+    Столбцы таблицы из списка моделей.
+
+    :param items: Модели одного типа;
+    :param model: тип моделей;
+    :param decimal_parts: записывать FinamDecimal мантиссой
+      и степенью.
+
+    :return: Массивы numpy по именам столбцов и имена
+      столбцов времени в UTC.
+    """
+    np = _import("numpy")
+    columns: Columns = {}
+    utc: set[str] = set()
+    _add_model(np, columns, utc, "", list(items), model, decimal_parts)
+    return columns, utc
+
+
+def to_pandas(
+    items: Sequence[BaseModel],
+    model: type[BaseModel],
+    *,
+    decimal_parts: bool = False,
+) -> Any:
+    """
+    Таблица pandas из списка моделей.
+
+    :param items: Модели одного типа;
+    :param model: тип моделей;
+    :param decimal_parts: записывать FinamDecimal мантиссой
+      и степенью.
+
+    :return: DataFrame.
+    """
+    pd = _import("pandas")
+    columns, utc = frame_columns(items, model, decimal_parts=decimal_parts)
+    frame = pd.DataFrame(columns, copy=False)
+    for name in utc:
+        frame[name] = frame[name].dt.tz_localize("UTC")
+    return frame
+
+
+def to_polars(
+    items: Sequence[BaseModel],
+    model: type[BaseModel],
+    *,
+    decimal_parts: bool = False,
+) -> Any:
+    """
+    Таблица Polars из списка моделей.
+
+    :param items: Модели одного типа;
+    :param model: тип моделей;
+    :param decimal_parts: записывать FinamDecimal мантиссой
+      и степенью.
+
+    :return: DataFrame.
+    """
+    pl = _import("polars")
+    columns, utc = frame_columns(items, model, decimal_parts=decimal_parts)
+    frame = pl.DataFrame(columns, nan_to_null=True)
+    if utc:
+        frame = frame.with_columns(
+            pl.col(name).dt.replace_time_zone("UTC") for name in utc
+        )
+    return frame
+
+
+class FrameMixin(ABC):
+    """
+    Методы to_pandas и to_polars для модели ответа.
+
+    Модель определяет _frame_items: список строк таблицы
+    и их тип.
+    """
+
+    @abstractmethod
+    def _frame_items(self) -> tuple[Sequence[BaseModel], type[BaseModel]]:
+        """Строки таблицы и их тип."""
+
+    def to_pandas(self, *, decimal_parts: bool = False) -> Any:
+        """
+        Таблица pandas. Для ответа с ошибкой таблица пустая.
+
+        :param decimal_parts: Записывать FinamDecimal
+          мантиссой и степенью.
+        """
+        items, model = self._frame_items()
+        return to_pandas(items, model, decimal_parts=decimal_parts)
+
+    def to_polars(self, *, decimal_parts: bool = False) -> Any:
+        """
+        Таблица Polars. Для ответа с ошибкой таблица пустая.
+
+        :param decimal_parts: Записывать FinamDecimal
+          мантиссой и степенью.
+        """
+        items, model = self._frame_items()
+        return to_polars(items, model, decimal_parts=decimal_parts)
+
+
+def _add_model(
+    np: Any,
+    columns: Columns,
+    utc: set[str],
+    prefix: str,
+    items: list[Any],
+    model: type[BaseModel],
+    decimal_parts: bool,
+) -> None:
+    for name, field in model.model_fields.items():
+        key = prefix + name
+        kind = _kind(field.annotation)
+        if _has_none(items):
+            values = [
+                None if item is None else getattr(item, name) for item in items
+            ]
+        else:
+            values = list(map(attrgetter(name), items))
+        if isinstance(kind, type) and issubclass(kind, FinamDecimal):
+            _add_finam_decimal(np, columns, key, values, decimal_parts)
+        elif isinstance(kind, type) and issubclass(kind, BaseModel):
+            _add_model(
+                np, columns, utc, key + ".", values, kind, decimal_parts
+            )
+        else:
+            columns[key] = _column(np, kind, values)
+            if kind is datetime:
+                utc.add(key)
+
+
+def _kind(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        return args[0] if len(args) == 1 else object
+    return annotation
+
+
+def _add_finam_decimal(
+    np: Any, columns: Columns, key: str, values: list, parts: bool
+) -> None:
+    size = len(values)
+    if _has_none(values):
+        nums = [None if v is None else v.num for v in values]
+        scales = [None if v is None else v.scale for v in values]
+        if parts:
+            columns[f"{key}_num"] = _column(np, int, nums)
+            columns[f"{key}_scale"] = _column(np, int, scales)
+            return
+        columns[key] = np.array(
+            [None if v is None else v.num / 10**v.scale for v in values],
+            dtype=np.float64,
+        )
+        return
+    num = np.fromiter(map(_num, values), np.int64, size)
+    scale = np.fromiter(map(_scale, values), np.int64, size)
+    if parts:
+        columns[f"{key}_num"] = num
+        columns[f"{key}_scale"] = scale
+    else:
+        columns[key] = num / np.power(10.0, scale)
+
+
+def _column(np: Any, kind: Any, values: list) -> Any:
+    size = len(values)
+    missing = _has_none(values)
+    if kind is bool:
+        if missing:
+            return np.fromiter(values, object, size)
+        return np.fromiter(values, np.bool_, size)
+    if isinstance(kind, type) and issubclass(kind, Enum):
+        return np.fromiter(
+            (None if v is None else v.value for v in values), object, size
+        )
+    if kind is int:
+        if missing:
+            return np.array(values, dtype=np.float64)
+        return np.fromiter(values, np.int64, size)
+    if kind in (float, Decimal):
+        return np.array(values, dtype=np.float64)
+    if kind is datetime:
+        if missing:
+            return np.array(
+                [None if v is None else _naive_utc(v) for v in values],
+                dtype="datetime64[us]",
+            )
+        return (
+            np.fromiter(map(_microseconds, values), np.int64, size)
+        ).astype("datetime64[us]")
+    if kind is date:
+        if missing:
+            return np.array(values, dtype="datetime64[D]")
+        return (
+            np.fromiter(map(date.toordinal, values), np.int64, size)
+            - _EPOCH_ORDINAL
+        ).astype("datetime64[D]")
+    return np.fromiter(values, object, size)
+
+
+def _has_none(values: list) -> bool:
+    # "None in values" вызывает __eq__ моделей, что на порядок
+    # медленнее проверки идентичности.
+    return any(map(is_, values, repeat(None)))
+
+
+def _microseconds(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Self
+from typing import ClassVar, Self
 
 from pydantic import Field, model_validator
 
@@ -34,6 +34,7 @@ class DayCandlesRequest(BaseCandleRequest):
      - Для дневных свечей максимальный интервал 365 дней;
     """
 
+    max_interval_days: ClassVar[int] = 365
     time_frame: DayTimeFrames = Field(serialization_alias="timeFrame")
     from_: date | None = Field(
         serialization_alias="Interval.From", default=None
@@ -44,11 +45,7 @@ class DayCandlesRequest(BaseCandleRequest):
     def __validate_interval(self) -> Self:
         if not self.from_ or not self.to:
             return self
-        result = (self.to - self.from_).days
-        if result > 365:
-            raise ValueError(
-                "The interval between from_ and to cannot exceed 365 days."
-            )
+        self.check_interval(self.from_, self.to)
         return self
 
 
@@ -79,6 +76,7 @@ class IntraDayCandlesRequest(BaseCandleRequest):
      - Для внутридневных свечей максимальный интервал 30 дней.
     """
 
+    max_interval_days: ClassVar[int] = 30
     time_frame: IntraDayTimeFrames = Field(serialization_alias="timeFrame")
     from_: datetime | None = Field(
         serialization_alias="Interval.From", default=None
@@ -91,9 +89,5 @@ class IntraDayCandlesRequest(BaseCandleRequest):
     def __validate_interval(self) -> Self:
         if not self.from_ or not self.to:
             return self
-        result = (self.to - self.from_).days
-        if result > 30:
-            raise ValueError(
-                "The interval between from_ and to cannot exceed 30 days."
-            )
+        self.check_interval(self.from_, self.to)
         return self
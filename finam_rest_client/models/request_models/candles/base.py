@@ -1,13 +1,33 @@
 """Базовая модель для отправки запросов на получение свечей."""
 
-from pydantic import BaseModel, Field
+from datetime import date
+from typing import ClassVar
 
+from pydantic import Field
 
-class BaseCandleRequest(BaseModel):
+from finam_rest_client.models.base import FinamBaseModel
+
+
+class BaseCandleRequest(FinamBaseModel):
     """Базовая модель для отправки запросов на получение свечей."""
 
+    max_interval_days: ClassVar[int]
+
     security_board: str = Field(serialization_alias="securityBoard")
     security_code: str = Field(serialization_alias="securityCode")
     count: int | None = Field(
         serialization_alias="Interval.Count", default=None, le=500, ge=1
     )
+
+    @classmethod
+    def check_interval(cls, from_: date, to: date) -> None:
+        """
+        Проверка длины интервала запроса.
+
+        :raise ValueError: Если интервал больше max_interval_days.
+        """
+        if (to - from_).days > cls.max_interval_days:
+            raise ValueError(
+                "The interval between from_ and to cannot exceed "
+                f"{cls.max_interval_days} days."
+            )
@@ -2,8 +2,9 @@
 
 from decimal import Decimal
 
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import Field, field_serializer
 
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import (
     BuySell,
     OrderValidBefore,
@@ -11,7 +12,7 @@ from finam_rest_client.models.common_types import (
 )
 
 
-class BaseOrderRequest(BaseModel):
+class BaseOrderRequest(FinamBaseModel):
     """Базовый класс запроса ордера."""
 
     client_id: str = Field(serialization_alias="ClientId")
@@ -40,7 +41,7 @@ class BaseGetOrdersRequest(BaseOrderRequest):
         return str(elem).lower()
 
 
-class BaseCreateOrder(BaseModel):
+class BaseCreateOrder(FinamBaseModel):
     """Базовая модель создания ордера."""
 
     client_id: str = Field(serialization_alias="clientId")
@@ -52,7 +53,7 @@ class BaseCreateOrder(BaseModel):
     )
 
 
-class BaseStopOrderRequestModel(BaseModel):
+class BaseStopOrderRequestModel(FinamBaseModel):
     """Базовая модель стоп-ордера для отправки запроса."""
 
     activation_price: Decimal = Field(serialization_alias="activationPrice")
@@ -3,12 +3,11 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
-
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import OrderConditionType
 
 
-class OrderCondition(BaseModel):
+class OrderCondition(FinamBaseModel):
     """
     Свойства выставления заявок.
 
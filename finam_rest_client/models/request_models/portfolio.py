@@ -1,11 +1,13 @@
 """Модель запроса на получение портфеля."""
 
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import Field, field_serializer
+
+from finam_rest_client.models.base import FinamBaseModel
 
 __all__ = ("PortfolioRequest",)
 
 
-class PortfolioRequest(BaseModel):
+class PortfolioRequest(FinamBaseModel):
     """
     Модель запроса на получение портфеля.
 
@@ -1,11 +1,11 @@
 """Модель запроса инструментов."""
 
-from pydantic import BaseModel
+from finam_rest_client.models.base import FinamBaseModel
 
 __all__ = ("SecuritiesRequest",)
 
 
-class SecuritiesRequest(BaseModel):
+class SecuritiesRequest(FinamBaseModel):
     """
     Модель запроса инструментов.
 
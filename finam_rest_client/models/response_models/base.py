@@ -1,11 +1,11 @@
 """Базовая модель ответа сервера."""
 
-from pydantic import BaseModel
+from finam_rest_client.models.base import FinamBaseModel
 
 from .web_error import WebError
 
 
-class BaseResponseModel(BaseModel):
+class BaseResponseModel(FinamBaseModel):
     """Базовая модель ответа сервера."""
 
     error: WebError | None = None
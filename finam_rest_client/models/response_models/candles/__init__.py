@@ -1,3 +1,3 @@
 """Модели ответов на запрос свечей."""
 
-from ._candles import DayCandles, IntraDayCandles
+from ._candles import DayCandle, DayCandles, IntraDayCandle, IntraDayCandles
@@ -1,6 +1,7 @@
 from datetime import date, datetime
 
-from pydantic import BaseModel
+from finam_rest_client.models.base import FinamBaseModel
+from finam_rest_client.models.frames import FrameMixin
 
 from ..base import BaseResponseModel
 from .base import BaseCandle
@@ -16,21 +17,27 @@ class IntraDayCandle(BaseCandle):
     timestamp: datetime
 
 
-class DayCandlesResponseData(BaseModel):
+class DayCandlesResponseData(FinamBaseModel):
     candles: list[DayCandle]
 
 
-class IntraDayCandlesResponseData(BaseModel):
+class IntraDayCandlesResponseData(FinamBaseModel):
     candles: list[IntraDayCandle]
 
 
-class DayCandles(BaseResponseModel):
+class DayCandles(FrameMixin, BaseResponseModel):
     """Свечи с интервалом от 1 дня."""
 
     data: DayCandlesResponseData | None = None
 
+    def _frame_items(self):
+        return [] if self.data is None else self.data.candles, DayCandle
 
-class IntraDayCandles(BaseResponseModel):
+
+class IntraDayCandles(FrameMixin, BaseResponseModel):
     """Свечи с внутридневным интервалом."""
 
     data: IntraDayCandlesResponseData | None = None
+
+    def _frame_items(self):
+        return [] if self.data is None else self.data.candles, IntraDayCandle
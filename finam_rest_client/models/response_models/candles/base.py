@@ -1,11 +1,10 @@
 """Базовая модель для ответа на запрос свечей."""
 
-from pydantic import BaseModel
-
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import FinamDecimal
 
 
-class BaseCandle(BaseModel):
+class BaseCandle(FinamBaseModel):
     """Базовая модель для ответа на запрос свечей."""
 
     open: FinamDecimal
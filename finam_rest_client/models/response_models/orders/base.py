@@ -3,8 +3,9 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import (
     BuySell,
     Market,
@@ -13,7 +14,7 @@ from finam_rest_client.models.common_types import (
 )
 
 
-class BaseOrder(BaseModel):
+class BaseOrder(FinamBaseModel):
     """Базовая модель ордера из ответа."""
 
     client_id: str = Field(alias="clientId")
@@ -30,7 +31,7 @@ class BaseOrder(BaseModel):
     currency: str | None = None
 
 
-class BaseStopOrderResponseModel(BaseModel):
+class BaseStopOrderResponseModel(FinamBaseModel):
     """Базовая модель стоп-ордера для результата."""
 
     activation_price: Decimal = Field(alias="activationPrice")
@@ -3,9 +3,11 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import OrderStatus
+from finam_rest_client.models.frames import FrameMixin
 
 from ..base import BaseResponseModel
 from .base import BaseOrder
@@ -55,20 +57,23 @@ class Order(BaseOrder):
     balance: int
 
 
-class OrdersData(BaseModel):
+class OrdersData(FinamBaseModel):
     """Данные ордеров."""
 
     client_id: str | None = Field(alias="clientId", default=None)
     orders: list[Order]
 
 
-class Orders(BaseResponseModel):
+class Orders(FrameMixin, BaseResponseModel):
     """Модель ответа на запрос списка ордеров."""
 
     data: OrdersData | None = None
 
+    def _frame_items(self):
+        return [] if self.data is None else self.data.orders, Order
 
-class CancelOrderData(BaseModel):
+
+class CancelOrderData(FinamBaseModel):
     """Данные ответа на отмену ордера."""
 
     client_id: str | None = Field(alias="clientId", default=None)
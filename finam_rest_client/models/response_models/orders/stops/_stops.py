@@ -1,9 +1,11 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import StopStatus
+from finam_rest_client.models.frames import FrameMixin
 
 from ...base import BaseResponseModel
 from ..base import BaseOrder
@@ -54,20 +56,23 @@ class Stop(BaseOrder):
     take_profit: TakeProfit | None = Field(alias="takeProfit", default=None)
 
 
-class StopsData(BaseModel):
+class StopsData(FinamBaseModel):
     """Данные стоп-заявок."""
 
     client_id: str | None = Field(alias="clientId", default=None)
     stops: list[Stop]
 
 
-class Stops(BaseResponseModel):
+class Stops(FrameMixin, BaseResponseModel):
     """Модель ответа на запрос списка стоп-заявок."""
 
     data: StopsData | None = None
 
+    def _frame_items(self):
+        return [] if self.data is None else self.data.stops, Stop
 
-class CancelStopData(BaseModel):
+
+class CancelStopData(FinamBaseModel):
     """Модель данных при отмене стоп-заявки."""
 
     client_id: str | None = Field(alias="clientId", default=None)
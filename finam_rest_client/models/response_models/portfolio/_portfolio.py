@@ -1,6 +1,9 @@
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+
+from finam_rest_client.models.base import FinamBaseModel
+from finam_rest_client.models.frames import FrameMixin
 
 from ..base import BaseResponseModel
 from .content import Content
@@ -9,7 +12,7 @@ from .money import Money
 from .positions import Position
 
 
-class PortfolioData(BaseModel):
+class PortfolioData(FinamBaseModel):
     """
     Информация о портфеле.
 
@@ -36,7 +39,15 @@ class PortfolioData(BaseModel):
     money: list[Money]
 
 
-class Portfolio(BaseResponseModel):
-    """Результат запроса информации о портфеле."""
+class Portfolio(FrameMixin, BaseResponseModel):
+    """
+    Результат запроса информации о портфеле.
+
+    to_pandas и to_polars возвращают таблицу позиций
+    портфеля (data.positions).
+    """
 
     data: PortfolioData | None = None
+
+    def _frame_items(self):
+        return [] if self.data is None else self.data.positions, Position
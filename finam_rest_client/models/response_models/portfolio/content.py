@@ -1,9 +1,11 @@
 """Наполнение портфеля."""
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from finam_rest_client.models.base import FinamBaseModel
 
-class Content(BaseModel):
+
+class Content(FinamBaseModel):
     """
     Наполнение портфеля.
 
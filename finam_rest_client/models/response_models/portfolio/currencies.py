@@ -2,10 +2,12 @@
 
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from finam_rest_client.models.base import FinamBaseModel
 
-class Currency(BaseModel):
+
+class Currency(FinamBaseModel):
     """
     Валюта портфеля.
 
@@ -2,12 +2,11 @@
 
 from decimal import Decimal
 
-from pydantic import BaseModel
-
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import Market
 
 
-class Money(BaseModel):
+class Money(FinamBaseModel):
     """
     Денежная позиция.
 
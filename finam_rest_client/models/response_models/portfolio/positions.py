@@ -2,12 +2,13 @@
 
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import Market
 
 
-class Position(BaseModel):
+class Position(FinamBaseModel):
     """
     Позиция по инструменту.
 
@@ -2,16 +2,18 @@
 
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from finam_rest_client.models.base import FinamBaseModel
 from finam_rest_client.models.common_types import Market, PriceSign
+from finam_rest_client.models.frames import FrameMixin
 
 from .base import BaseResponseModel
 
 __all__ = ("Securities",)
 
 
-class Security(BaseModel):
+class Security(FinamBaseModel):
     """
     Модель биржевого инструмента.
 
@@ -53,13 +55,16 @@ class Security(BaseModel):
     lot_divider: int = Field(alias="lotDivider")
 
 
-class SecuritiesData(BaseModel):
+class SecuritiesData(FinamBaseModel):
     """Данные инструментов."""
 
     securities: list[Security]
 
 
-class Securities(BaseResponseModel):
+class Securities(FrameMixin, BaseResponseModel):
     """Результат ответа на запрос инструментов."""
 
     data: SecuritiesData | None = None
+
+    def _frame_items(self):
+        return [] if self.data is None else self.data.securities, Security
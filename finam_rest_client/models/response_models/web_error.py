@@ -1,9 +1,9 @@
 """Ошибка запроса на сервер."""
 
-from pydantic import BaseModel
+from finam_rest_client.models.base import FinamBaseModel
 
 
-class WebError(BaseModel):
+class WebError(FinamBaseModel):
     """
     Представление ошибки в ответе сервера.
 
@@ -1,14 +1,18 @@
 import pytest
 
-from finam_rest_client.clients import FinamRestClient
+from finam_rest_client.clients import FinamRestClient, SyncFinamRestClient
 
 token = ""
 c_id = ""
 
-if not token or not c_id:
-    pytest.exit(
-        "Не установлен token или client_id. Установите их в файле conftest.py"
-    )
+
+@pytest.fixture(scope="session")
+def credentials() -> None:
+    if not token or not c_id:
+        pytest.skip(
+            "Не установлен token или client_id. "
+            "Установите их в файле conftest.py"
+        )
 
 
 @pytest.fixture(scope="session")
@@ -17,11 +21,17 @@ def anyio_backend() -> str:
 
 
 @pytest.fixture(scope="session")
-async def client():
+async def client(credentials):
     async with FinamRestClient(token) as client:
         yield client
 
 
 @pytest.fixture(scope="session")
-async def client_id():
+def client_id(credentials):
     return c_id
+
+
+@pytest.fixture(scope="session")
+def sync_client(credentials):
+    with SyncFinamRestClient(token) as client:
+        yield client
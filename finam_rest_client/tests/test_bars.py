@@ -0,0 +1,123 @@
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from finam_rest_client.models.response_models.candles import (
+    DayCandle,
+    IntraDayCandle,
+)
+
+np = pytest.importorskip("numpy")
+
+from finam_rest_client.clients.bars import (  # noqa: E402
+    BULK_SIZE,
+    BarBuffer,
+    BarBuffers,
+)
+
+START = datetime(2024, 1, 2, 7, tzinfo=UTC)
+
+
+def candle(index: int, close: int | None = None) -> IntraDayCandle:
+    price = {"num": 10000 + index, "scale": 2}
+    return IntraDayCandle.model_validate(
+        {
+            "timestamp": (START + timedelta(minutes=index)).isoformat(),
+            "open": price,
+            "close": price if close is None else {"num": close, "scale": 2},
+            "high": price,
+            "low": price,
+            "volume": index,
+        }
+    )
+
+
+def closes(buffer: BarBuffer, size: int | None = None) -> list[float]:
+    return buffer.window(size)["close"].tolist()
+
+
+def test_append_wraps_around():
+    buffer = BarBuffer(3)
+    for index in range(5):
+        moment = START + timedelta(minutes=index)
+        assert buffer.append(moment, 1, 1, 1, index, index)
+    assert len(buffer) == 3
+    assert closes(buffer) == [2, 3, 4]
+    assert closes(buffer, 2) == [3, 4]
+    assert buffer.last_time == START + timedelta(minutes=4)
+
+
+def test_append_updates_last_and_skips_older():
+    buffer = BarBuffer(3)
+    buffer.append(START, 1, 1, 1, 1, 1)
+    assert not buffer.append(START, 1, 1, 1, 2, 2)
+    assert not buffer.append(START - timedelta(minutes=1), 1, 1, 1, 3, 3)
+    assert closes(buffer) == [2]
+
+
+def test_window_is_read_only():
+    buffer = BarBuffer(3)
+    buffer.append(START, 1, 1, 1, 1, 1)
+    with pytest.raises(ValueError):
+        buffer.window()["close"][0] = 0
+
+
+@pytest.mark.parametrize("count", (BULK_SIZE - 1, BULK_SIZE, 50))
+def test_extend_matches_append(count):
+    candles = [candle(index) for index in range(count)]
+    bulk = BarBuffer(20)
+    single = BarBuffer(20)
+    assert bulk.extend(candles) == count
+    for item in candles:
+        single.extend([item])
+    assert bulk.window().tolist() == single.window().tolist()
+    assert closes(bulk)[-1] == 100 + (count - 1) / 100
+
+
+def test_bulk_extend_wraps_around():
+    buffer = BarBuffer(20)
+    buffer.extend([candle(index) for index in range(15)])
+    assert buffer.extend([candle(index) for index in range(15, 40)]) == 25
+    assert len(buffer) == 20
+    assert buffer.window()["volume"].tolist() == list(range(20, 40))
+
+
+def test_bulk_extend_updates_forming_candle():
+    buffer = BarBuffer(50)
+    buffer.extend([candle(index) for index in range(10)])
+    new = [candle(index) for index in range(5, 5 + BULK_SIZE)]
+    new[4] = candle(9, close=1)
+    assert buffer.extend(new) == BULK_SIZE - 5
+    assert buffer.window()["volume"].tolist() == list(range(5 + BULK_SIZE))
+    assert closes(buffer)[9] == 0.01
+
+
+def test_extend_day_candles():
+    price = {"num": 1, "scale": 0}
+    candles = [
+        DayCandle.model_validate(
+            {
+                "date": date(2024, 1, day).isoformat(),
+                "open": price,
+                "close": price,
+                "high": price,
+                "low": price,
+                "volume": day,
+            }
+        )
+        for day in (2, 3)
+    ]
+    buffer = BarBuffer(5)
+    buffer.extend(candles)
+    assert buffer.last_time == datetime(2024, 1, 3, tzinfo=UTC)
+
+
+def test_buffers_by_key():
+    buffers = BarBuffers(5)
+    buffer = buffers.buffer("TQBR", "SBER", "M1")
+    assert buffers.buffer("TQBR", "SBER", "M1") is buffer
+    assert buffers["TQBR", "SBER", "M1"] is buffer
+    assert ("TQBR", "SBER", "M1") in buffers
+    buffers.remove("TQBR", "SBER", "M1")
+    assert buffers.get(("TQBR", "SBER", "M1")) is None
+    assert len(buffers) == 0
@@ -0,0 +1,92 @@
+from datetime import UTC, date, datetime, time, timedelta
+
+from finam_rest_client.clients.calendar import (
+    DEFAULT_TIME_ZONE,
+    SessionCalendar,
+    security_time_zone,
+)
+
+# 2 - 5 и 8 - 9 января 2024 - рабочие дни, 6 и 7 - выходные.
+TRADING_DAYS = [date(2024, 1, day) for day in (2, 3, 4, 5, 8, 9)]
+
+
+def weekday_calendar() -> SessionCalendar:
+    calendar = SessionCalendar("UTC")
+    calendar.observe_days(TRADING_DAYS, date(2024, 1, 1), date(2024, 1, 9))
+    return calendar
+
+
+def test_empty_calendar_allows_everything():
+    calendar = SessionCalendar()
+    assert calendar.weekdays is None
+    assert calendar.session is None
+    assert calendar.can_have_bars(date(2024, 1, 6), date(2024, 1, 7))
+
+
+def test_observed_days():
+    calendar = weekday_calendar()
+    assert calendar.is_trading_day(date(2024, 1, 5))
+    assert not calendar.is_trading_day(date(2024, 1, 6))
+    assert not calendar.can_have_bars(date(2024, 1, 6), date(2024, 1, 7))
+    assert calendar.can_have_bars(date(2024, 1, 6), date(2024, 1, 8))
+    assert calendar.weekdays == frozenset(range(5))
+
+
+def test_weekdays_outside_observed_span():
+    calendar = weekday_calendar()
+    assert calendar.can_have_bars(date(2024, 1, 15), date(2024, 1, 15))
+    assert not calendar.can_have_bars(date(2024, 1, 13), date(2024, 1, 14))
+
+
+def test_observed_span_starts_at_first_candle():
+    calendar = SessionCalendar("UTC")
+    calendar.observe_days(
+        [date(2024, 1, 2)], date(2020, 1, 1), date(2024, 1, 10)
+    )
+    assert calendar.can_have_bars(date(2021, 3, 3), date(2021, 3, 10))
+    assert calendar.can_have_bars(date(2024, 1, 5), date(2024, 1, 10))
+
+
+def test_days_outside_request_are_ignored():
+    calendar = SessionCalendar("UTC")
+    calendar.observe_days(
+        [date(2023, 12, 1), date(2024, 1, 2), date(2024, 1, 4)],
+        date(2024, 1, 1),
+        date(2024, 1, 10),
+    )
+    assert not calendar.is_trading_day(date(2024, 1, 3))
+    assert calendar.can_have_bars(date(2023, 12, 5), date(2023, 12, 5))
+
+
+def test_no_candles_observe_nothing():
+    calendar = SessionCalendar("UTC")
+    calendar.observe_days([], date(2024, 1, 1), date(2024, 1, 10))
+    assert calendar.can_have_bars(date(2024, 1, 6), date(2024, 1, 6))
+
+
+def test_session_bounds():
+    calendar = weekday_calendar()
+    moments = [
+        datetime(2024, 1, 2, 7, tzinfo=UTC) + timedelta(hours=hour)
+        for hour in range(9)
+    ]
+    calendar.observe_bars(moments, timedelta(hours=1))
+    assert calendar.session == (time(7), time(16))
+    day = datetime(2024, 1, 3, tzinfo=UTC)
+    assert not calendar.can_have_bars(day, day + timedelta(hours=6))
+    assert calendar.can_have_bars(day, day + timedelta(hours=7))
+    assert not calendar.can_have_bars(
+        day + timedelta(hours=16), day + timedelta(hours=23)
+    )
+
+
+def test_session_in_local_time():
+    calendar = SessionCalendar("Russian Standard Time")
+    calendar.observe_bars(
+        [datetime(2024, 1, 2, 7, tzinfo=UTC)], timedelta(minutes=1)
+    )
+    assert calendar.session == (time(10), time(10, 1))
+
+
+def test_unknown_time_zone():
+    assert str(security_time_zone("Unknown")) == DEFAULT_TIME_ZONE
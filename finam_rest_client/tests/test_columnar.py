@@ -0,0 +1,179 @@
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from finam_rest_client.models.response_models.candles import (
+    DayCandle,
+    IntraDayCandle,
+)
+from finam_rest_client.models.response_models.securities import Security
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from finam_rest_client.clients.columnar import (  # noqa: E402
+    ColumnarWriter,
+    candles_batch,
+    candles_schema,
+    securities_batch,
+)
+
+START = datetime(2024, 1, 2, 7, tzinfo=UTC)
+
+
+def price(num: int, scale: int = 2) -> dict:
+    return {"num": num, "scale": scale}
+
+
+def day_candle(day: int) -> DayCandle:
+    return DayCandle.model_validate(
+        {
+            "date": date(2024, 1, day).isoformat(),
+            "open": price(100 + day),
+            "close": price(200 + day),
+            "high": price(300 + day),
+            "low": price(1, 0),
+            "volume": day,
+        }
+    )
+
+
+def minute_candle(index: int) -> IntraDayCandle:
+    return IntraDayCandle.model_validate(
+        {
+            "timestamp": (START + timedelta(minutes=index)).isoformat(),
+            "open": price(index),
+            "close": price(index),
+            "high": price(index),
+            "low": price(index),
+            "volume": index,
+        }
+    )
+
+
+def security(code: str, bp_cost: str, accrued_interest: str) -> Security:
+    return Security.model_validate(
+        {
+            "code": code,
+            "board": "TQBR",
+            "market": "Stock",
+            "decimals": 2,
+            "lotSize": 10,
+            "minStep": 1,
+            "currency": "RUB",
+            "shortName": code,
+            "properties": 0,
+            "timeZoneName": "Russian Standard Time",
+            "bpCost": bp_cost,
+            "accruedInterest": accrued_interest,
+            "priceSign": "Positive",
+            "ticker": code,
+            "lotDivider": 1,
+        }
+    )
+
+
+def test_day_candles_batch():
+    batch = candles_batch([day_candle(2), day_candle(3)])
+    assert batch.schema == candles_schema()
+    assert batch.column("date").to_pylist() == [
+        date(2024, 1, 2),
+        date(2024, 1, 3),
+    ]
+    assert batch.column("open_num").to_pylist() == [102, 103]
+    assert batch.column("open_scale").to_pylist() == [2, 2]
+    assert batch.column("low_scale").to_pylist() == [0, 0]
+    assert batch.column("volume").to_pylist() == [2, 3]
+
+
+def test_intraday_candles_batch_with_instrument():
+    batch = candles_batch(
+        [minute_candle(0), minute_candle(1)], board="TQBR", code="SBER"
+    )
+    assert batch.schema == candles_schema(intraday=True, instrument=True)
+    assert batch.column("board").to_pylist() == ["TQBR", "TQBR"]
+    assert batch.column("code").to_pylist() == ["SBER", "SBER"]
+    assert batch.column("timestamp").to_pylist() == [
+        START,
+        START + timedelta(minutes=1),
+    ]
+    assert str(batch.schema.field("timestamp").type) == "timestamp[s, tz=UTC]"
+
+
+def test_empty_candles_batch():
+    assert candles_batch([]).schema == candles_schema()
+    batch = candles_batch([], intraday=True)
+    assert batch.num_rows == 0
+    assert batch.schema == candles_schema(intraday=True)
+
+
+def test_securities_batch():
+    batch = securities_batch(
+        [security("SBER", "1", "0"), security("SU26238", "10.5", "12.345")]
+    )
+    assert batch.column("market").to_pylist() == ["Stock", "Stock"]
+    assert batch.column("price_sign").to_pylist() == ["Positive", "Positive"]
+    assert batch.column("lot_size").to_pylist() == [10, 10]
+    assert batch.column("bp_cost_num").to_pylist() == [1, 105]
+    assert batch.column("bp_cost_scale").to_pylist() == [0, 1]
+    assert batch.column("accrued_interest_num").to_pylist() == [0, 12345]
+    assert batch.column("accrued_interest_scale").to_pylist() == [0, 3]
+
+
+def test_securities_batch_rejects_infinite_decimal():
+    item = security("SBER", "1", "0")
+    item.bp_cost = Decimal("Infinity")
+    with pytest.raises(ValueError):
+        securities_batch([item])
+
+
+@pytest.mark.parametrize("fmt", ("parquet", "arrow"))
+def test_writer_round_trip(tmp_path, fmt):
+    path = tmp_path / f"candles.{fmt}"
+    with ColumnarWriter(path, fmt, chunk_rows=4) as writer:
+        for index in range(0, 10, 3):
+            writer.write(
+                candles_batch(
+                    [minute_candle(i) for i in range(index, index + 3)]
+                )
+            )
+    assert writer.rows == 12
+    if fmt == "parquet":
+        table = pq.read_table(path)
+    else:
+        with pa.ipc.open_file(path) as reader:
+            table = reader.read_all()
+    # Parquet не хранит секунды: timestamp читается в миллисекундах.
+    assert table.schema.names == candles_schema(intraday=True).names
+    assert table.column("timestamp").to_pylist()[-1] == START + timedelta(
+        minutes=11
+    )
+    assert table.column("volume").to_pylist() == list(range(12))
+
+
+def test_writer_groups_rows_by_chunk(tmp_path):
+    path = tmp_path / "candles.parquet"
+    with ColumnarWriter(path, chunk_rows=4) as writer:
+        for index in range(10):
+            writer.write(candles_batch([minute_candle(index)]))
+    metadata = pq.ParquetFile(path).metadata
+    assert [
+        metadata.row_group(group).num_rows
+        for group in range(metadata.num_row_groups)
+    ] == [4, 4, 2]
+
+
+def test_writer_without_batches_creates_no_file(tmp_path):
+    path = tmp_path / "candles.parquet"
+    with ColumnarWriter(path) as writer:
+        pass
+    assert writer.schema is None
+    assert not path.exists()
+
+
+def test_writer_rejects_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarWriter(tmp_path / "candles.csv", "csv")
+    with pytest.raises(ValueError):
+        ColumnarWriter(tmp_path / "candles.parquet", chunk_rows=0)
@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+
+import pytest
+from pydantic import BaseModel
+
+from finam_rest_client.clients.export import (
+    ShardedWriter,
+    model_columns,
+    model_row,
+)
+from finam_rest_client.models.common_types import FinamDecimal
+
+
+class Inner(BaseModel):
+    price: FinamDecimal
+    lots: int
+
+
+class Outer(BaseModel):
+    code: str
+    ratio: float
+    active: bool
+    inner: Inner | None = None
+
+
+FILLED = Outer(
+    code="SBER",
+    ratio=0.5,
+    active=True,
+    inner=Inner(price=FinamDecimal(num=12345, scale=2), lots=10),
+)
+EMPTY = Outer(code="GAZP", ratio=1.0, active=False)
+
+
+def read_csv(path: str) -> list[dict[str, str]]:
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def test_model_columns():
+    assert model_columns(Outer) == [
+        ("code", str),
+        ("ratio", float),
+        ("active", bool),
+        ("inner.price", str),
+        ("inner.lots", int),
+    ]
+
+
+def test_model_row_fills_absent_nested_model():
+    assert model_row(FILLED) == {
+        "code": "SBER",
+        "ratio": 0.5,
+        "active": True,
+        "inner.price": "123.45",
+        "inner.lots": 10,
+    }
+    assert model_row(EMPTY) == {
+        "code": "GAZP",
+        "ratio": 1.0,
+        "active": False,
+        "inner.price": None,
+        "inner.lots": None,
+    }
+
+
+def test_fixed_csv_header(tmp_path):
+    with ShardedWriter(
+        tmp_path, "outer", columns=model_columns(Outer)
+    ) as writer:
+        writer.write([model_row(EMPTY)])
+        writer.write([model_row(FILLED)])
+    [path] = writer.files
+    rows = read_csv(path)
+    assert list(rows[0]) == [name for name, _ in model_columns(Outer)]
+    assert rows[0]["inner.lots"] == ""
+    assert rows[1]["inner.lots"] == "10"
+
+
+def test_rotation_by_max_rows(tmp_path):
+    rows = [{"n": n} for n in range(7)]
+    with ShardedWriter(tmp_path, "t", max_rows=3) as writer:
+        writer.write(rows[:2])
+        writer.write(rows[2:])
+    assert [os.path.basename(path) for path in writer.files] == [
+        "t-00000.csv",
+        "t-00001.csv",
+        "t-00002.csv",
+    ]
+    assert [len(read_csv(path)) for path in writer.files] == [3, 3, 1]
+    assert writer.rows == 7
+
+
+def test_existing_files_are_not_overwritten(tmp_path):
+    (tmp_path / "t-00000.csv").write_text("old")
+    with ShardedWriter(tmp_path, "t") as writer:
+        writer.write([{"n": 1}])
+    assert os.path.basename(writer.files[0]) == "t-00001.csv"
+    assert (tmp_path / "t-00000.csv").read_text() == "old"
+
+
+def test_least_recently_used_file_is_closed(tmp_path):
+    with ShardedWriter(
+        tmp_path, "t", "jsonl", shard_by="code", max_open=2
+    ) as writer:
+        writer.write([{"code": "A", "n": 1}, {"code": "B", "n": 2}])
+        writer.write([{"code": "A", "n": 3}])
+        writer.write([{"code": "C", "n": 4}])
+        writer.write([{"code": "B", "n": 5}])
+    assert [os.path.basename(path) for path in writer.files] == [
+        "t-A-00000.jsonl",
+        "t-B-00000.jsonl",
+        "t-C-00000.jsonl",
+        "t-B-00001.jsonl",
+    ]
+    with open(writer.files[0], encoding="utf-8") as file:
+        assert [json.loads(line)["n"] for line in file] == [1, 3]
+
+
+def test_fixed_arrow_schema(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    with ShardedWriter(
+        tmp_path, "outer", "parquet", max_rows=1, columns=model_columns(Outer)
+    ) as writer:
+        writer.write([model_row(EMPTY), model_row(FILLED)])
+    schemas = [pq.read_schema(path) for path in writer.files]
+    assert len(schemas) == 2
+    assert schemas[0] == schemas[1]
+    assert str(schemas[0].field("inner.lots").type) == "int64"
+
+
+def test_flush_makes_rows_readable(tmp_path):
+    with ShardedWriter(tmp_path, "t", "jsonl") as writer:
+        writer.write([{"n": 1}])
+        writer.flush()
+        with open(writer.files[0], encoding="utf-8") as file:
+            assert [json.loads(line) for line in file] == [{"n": 1}]
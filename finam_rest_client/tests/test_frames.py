@@ -0,0 +1,131 @@
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from pydantic import BaseModel
+
+from finam_rest_client.models.common_types import FinamDecimal, Market
+from finam_rest_client.models.response_models.base import BaseResponseModel
+from finam_rest_client.models.response_models.candles import IntraDayCandles
+
+np = pytest.importorskip("numpy")
+
+from finam_rest_client.models.frames import (  # noqa: E402
+    FrameMixin,
+    frame_columns,
+    to_pandas,
+    to_polars,
+)
+
+MOMENT = datetime(2024, 1, 2, 10, tzinfo=UTC)
+
+
+class Inner(BaseModel):
+    price: FinamDecimal
+    lots: int
+
+
+class Row(BaseModel):
+    code: str
+    market: Market
+    day: date
+    moment: datetime
+    price: FinamDecimal
+    change: FinamDecimal | None = None
+    volume: int | None = None
+    inner: Inner | None = None
+
+
+FILLED = Row(
+    code="SBER",
+    market=Market.stock,
+    day=date(2024, 1, 2),
+    moment=MOMENT,
+    price=FinamDecimal(num=12345, scale=2),
+    change=FinamDecimal(num=-5, scale=1),
+    volume=10,
+    inner=Inner(price=FinamDecimal(num=7, scale=0), lots=3),
+)
+EMPTY = Row(
+    code="GAZP",
+    market=Market.forts,
+    day=date(2024, 1, 3),
+    moment=MOMENT + timedelta(hours=1),
+    price=FinamDecimal(num=1, scale=0),
+)
+ROWS = [FILLED, EMPTY]
+
+
+def test_frame_columns():
+    columns, utc = frame_columns(ROWS, Row)
+    assert list(columns) == [
+        "code",
+        "market",
+        "day",
+        "moment",
+        "price",
+        "change",
+        "volume",
+        "inner.price",
+        "inner.lots",
+    ]
+    assert utc == {"moment"}
+    assert columns["price"].tolist() == [123.45, 1.0]
+    assert columns["market"].tolist() == ["Stock", "Forts"]
+    assert columns["day"].dtype == np.dtype("datetime64[D]")
+
+
+def test_frame_columns_with_missing_values():
+    columns, _ = frame_columns(ROWS, Row)
+    assert columns["change"][0] == -0.5
+    assert np.isnan(columns["change"][1])
+    assert columns["volume"].dtype == np.float64
+    assert np.isnan(columns["volume"][1])
+    assert columns["inner.lots"][0] == 3
+    assert np.isnan(columns["inner.lots"][1])
+    assert np.isnan(columns["inner.price"][1])
+
+
+def test_frame_columns_decimal_parts():
+    columns, _ = frame_columns(ROWS, Row, decimal_parts=True)
+    assert "price" not in columns
+    assert columns["price_num"].tolist() == [12345, 1]
+    assert columns["price_scale"].tolist() == [2, 0]
+    assert columns["price_num"].dtype == np.int64
+    assert columns["change_num"][0] == -5
+    assert np.isnan(columns["change_num"][1])
+
+
+def test_to_pandas():
+    pytest.importorskip("pandas")
+    frame = to_pandas(ROWS, Row)
+    assert len(frame) == 2
+    assert str(frame["moment"].dt.tz) == "UTC"
+    assert frame["moment"][1].to_pydatetime() == MOMENT + timedelta(hours=1)
+    assert frame["volume"].isna().tolist() == [False, True]
+    assert frame["inner.price"].tolist()[0] == 7.0
+
+
+def test_to_polars():
+    pl = pytest.importorskip("polars")
+    frame = to_polars(ROWS, Row, decimal_parts=True)
+    assert frame.height == 2
+    assert frame.schema["moment"] == pl.Datetime("us", "UTC")
+    assert frame["moment"].to_list()[0] == MOMENT
+    assert frame["volume"].null_count() == 1
+    assert frame["change_num"].to_list() == [-5, None]
+    assert frame["price_num"].dtype == pl.Int64
+
+
+def test_empty_response_frame():
+    pytest.importorskip("pandas")
+    frame = IntraDayCandles(error=None).to_pandas()
+    assert len(frame) == 0
+    assert "timestamp" in frame.columns
+
+
+def test_frame_items_is_abstract():
+    class Response(FrameMixin, BaseResponseModel):
+        pass
+
+    with pytest.raises(TypeError):
+        Response()
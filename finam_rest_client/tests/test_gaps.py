@@ -0,0 +1,180 @@
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from finam_rest_client.clients.calendar import SessionCalendar
+from finam_rest_client.clients.gaps import (
+    CandleGap,
+    find_gaps,
+    plan_gap_requests,
+    splice_candles,
+)
+from finam_rest_client.models.request_models import (
+    DayCandlesRequest,
+    IntraDayCandlesRequest,
+)
+from finam_rest_client.models.response_models.candles import (
+    DayCandle,
+    IntraDayCandle,
+)
+
+PRICE = {"num": 100, "scale": 0}
+
+
+def day_candle(day: date, volume: int = 1) -> DayCandle:
+    return DayCandle.model_validate(
+        {
+            "date": day.isoformat(),
+            "open": PRICE,
+            "close": PRICE,
+            "high": PRICE,
+            "low": PRICE,
+            "volume": volume,
+        }
+    )
+
+
+def minute_candle(moment: datetime, volume: int = 1) -> IntraDayCandle:
+    return IntraDayCandle.model_validate(
+        {
+            "timestamp": moment.isoformat(),
+            "open": PRICE,
+            "close": PRICE,
+            "high": PRICE,
+            "low": PRICE,
+            "volume": volume,
+        }
+    )
+
+
+def minute(hour: int, minute: int = 0, day: int = 2) -> datetime:
+    return datetime(2024, 1, day, hour, minute, tzinfo=UTC)
+
+
+def test_find_gaps_day_candles():
+    candles = [day_candle(date(2024, 1, day)) for day in (2, 3, 6, 7)]
+    gaps = find_gaps(
+        candles, "D1", from_=date(2024, 1, 1), to=date(2024, 1, 9)
+    )
+    assert gaps == [
+        CandleGap(date(2024, 1, 1), date(2024, 1, 1)),
+        CandleGap(date(2024, 1, 4), date(2024, 1, 5)),
+        CandleGap(date(2024, 1, 8), date(2024, 1, 9)),
+    ]
+
+
+def test_find_gaps_week_candles():
+    candles = [day_candle(date(2024, 1, day)) for day in (1, 8, 22, 29)]
+    assert find_gaps(candles, "W1") == [
+        CandleGap(date(2024, 1, 15), date(2024, 1, 15))
+    ]
+
+
+def test_find_gaps_intraday_date_bounds():
+    candles = [minute_candle(minute(0, 1)), minute_candle(minute(23, 58))]
+    gaps = find_gaps(
+        candles, "M1", from_=date(2024, 1, 2), to=date(2024, 1, 2)
+    )
+    assert gaps == [
+        CandleGap(minute(0, 0), minute(0, 0)),
+        CandleGap(minute(0, 2), minute(23, 57)),
+        CandleGap(minute(23, 59), minute(23, 59) + timedelta(seconds=59)),
+    ]
+
+
+def test_find_gaps_without_candles():
+    assert find_gaps([], "D1") == []
+    assert find_gaps(
+        [], "D1", from_=date(2024, 1, 1), to=date(2024, 1, 3)
+    ) == [CandleGap(date(2024, 1, 1), date(2024, 1, 3))]
+
+
+def test_find_gaps_requires_sorted_candles():
+    candles = [day_candle(date(2024, 1, 3)), day_candle(date(2024, 1, 2))]
+    with pytest.raises(ValueError):
+        find_gaps(candles, "D1")
+
+
+def test_find_gaps_skips_closed_days():
+    calendar = SessionCalendar("UTC")
+    # 6 и 7 января 2024 - выходные.
+    trading = [date(2024, 1, day) for day in (2, 3, 4, 5, 8, 9)]
+    calendar.observe_days(trading, date(2024, 1, 1), date(2024, 1, 9))
+    candles = [day_candle(date(2024, 1, day)) for day in (4, 5, 8)]
+    gaps = find_gaps(
+        candles,
+        "D1",
+        from_=date(2024, 1, 4),
+        to=date(2024, 1, 10),
+        calendar=calendar,
+    )
+    assert gaps == [CandleGap(date(2024, 1, 9), date(2024, 1, 10))]
+
+
+def test_plan_gap_requests_merges_close_gaps():
+    gaps = [
+        CandleGap(minute(10, 0), minute(10, 5)),
+        CandleGap(minute(11, 0), minute(11, 5)),
+    ]
+    requests = plan_gap_requests("TQBR", "SBER", "M1", gaps)
+    assert len(requests) == 1
+    assert isinstance(requests[0], IntraDayCandlesRequest)
+    assert requests[0].from_ == minute(10, 0)
+    assert requests[0].to == minute(11, 5)
+
+
+def test_plan_gap_requests_limits_candles():
+    gaps = [CandleGap(minute(0, 0), minute(0, 0) + timedelta(minutes=999))]
+    requests = plan_gap_requests("TQBR", "SBER", "M1", gaps)
+    assert [(r.from_, r.to) for r in requests] == [
+        (minute(0, 0), minute(0, 0) + timedelta(minutes=500, seconds=-1)),
+        (minute(0, 0) + timedelta(minutes=500), gaps[0].end),
+    ]
+
+
+def test_plan_gap_requests_separates_distant_gaps():
+    gaps = [
+        CandleGap(minute(1, 0), minute(1, 0)),
+        CandleGap(minute(10, 0), minute(10, 0)),
+    ]
+    requests = plan_gap_requests("TQBR", "SBER", "M1", gaps)
+    assert [(r.from_, r.to) for r in requests] == [
+        (minute(1, 0), minute(1, 0)),
+        (minute(10, 0), minute(10, 0)),
+    ]
+
+
+def test_plan_gap_requests_limits_day_interval():
+    gaps = [CandleGap(date(2020, 1, 1), date(2021, 12, 31))]
+    requests = plan_gap_requests("TQBR", "SBER", "D1", gaps)
+    assert all(isinstance(r, DayCandlesRequest) for r in requests)
+    assert requests[0].from_ == date(2020, 1, 1)
+    assert requests[-1].to == date(2021, 12, 31)
+    for previous, current in zip(requests, requests[1:]):
+        assert current.from_ == previous.to + timedelta(days=1)
+    assert all(
+        (r.to - r.from_).days <= DayCandlesRequest.max_interval_days
+        for r in requests
+    )
+
+
+def test_plan_gap_requests_skips_closed_windows():
+    calendar = SessionCalendar("UTC")
+    trading = [date(2024, 1, day) for day in (2, 3, 4, 5, 8, 9)]
+    calendar.observe_days(trading, date(2024, 1, 1), date(2024, 1, 9))
+    gaps = [CandleGap(date(2024, 1, 6), date(2024, 1, 7))]
+    assert plan_gap_requests("TQBR", "SBER", "D1", gaps, calendar) == []
+
+
+def test_splice_candles():
+    candles = [day_candle(date(2024, 1, day)) for day in (2, 5)]
+    new = [
+        day_candle(date(2024, 1, 4)),
+        day_candle(date(2024, 1, 5), volume=2),
+        day_candle(date(2024, 1, 3)),
+        day_candle(date(2024, 1, 3), volume=2),
+    ]
+    assert splice_candles(candles, new) == 2
+    assert [c.date.day for c in candles] == [2, 3, 4, 5]
+    assert [c.volume for c in candles] == [1, 1, 1, 1]
+    assert splice_candles(candles, new) == 0
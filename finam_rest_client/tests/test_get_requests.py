@@ -179,3 +179,32 @@ async def test_get_many_request_securities_from_api(client):
     assert result.data is None
     assert result.error is not None
     assert isinstance(result, Securities)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "time_frame, moment",
+    (
+        ("D1", date.today()),
+        ("M1", datetime.now()),
+    ),
+)
+async def test_prepared_candles(client, time_frame, moment):
+    query = client.prepare_candles(
+        security_board="TQBR",
+        security_code="SBER",
+        time_frame=time_frame,
+        count=5,
+    )
+    expected = await client.get_candles(
+        security_board="TQBR",
+        security_code="SBER",
+        time_frame=time_frame,
+        count=5,
+        to=moment,
+    )
+    result = await query.fetch(to=moment)
+    assert result.error is None
+    assert result == expected
+    result = await query.fetch(to=moment, count=2)
+    assert len(result.data.candles) <= 2
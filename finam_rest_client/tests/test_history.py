@@ -0,0 +1,32 @@
+from datetime import date
+
+from finam_rest_client.clients.history import HistoryCheckpoint, HistoryWindow
+
+WINDOWS = [
+    HistoryWindow("TQBR", "SBER", date(2024, 1, 1), date(2024, 1, 31)),
+    HistoryWindow("TQBR", "GAZP", date(2024, 1, 1), date(2024, 1, 31)),
+]
+
+
+def test_checkpoint_resume(tmp_path):
+    path = tmp_path / "checkpoint"
+    checkpoint = HistoryCheckpoint(path)
+    checkpoint.mark(WINDOWS[0])
+    checkpoint.mark(WINDOWS[0])
+    checkpoint.close()
+    checkpoint = HistoryCheckpoint(path)
+    assert len(checkpoint) == 1
+    assert WINDOWS[0] in checkpoint
+    assert WINDOWS[1] not in checkpoint
+    assert WINDOWS[0].key not in checkpoint
+
+
+def test_checkpoint_ignores_truncated_line(tmp_path):
+    path = tmp_path / "checkpoint"
+    path.write_text(WINDOWS[0].key + "\n" + WINDOWS[1].key[:10])
+    checkpoint = HistoryCheckpoint(path)
+    assert len(checkpoint) == 1
+    assert WINDOWS[1] not in checkpoint
+    checkpoint.mark(WINDOWS[1])
+    checkpoint.close()
+    assert WINDOWS[1] in HistoryCheckpoint(path)
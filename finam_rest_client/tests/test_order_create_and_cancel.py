@@ -473,3 +473,41 @@ async def test_cancel_all_orders(client, client_id):
         if order.status == OrderStatus.active
     ]
     assert len(idx) == 0
+
+
+@pytest.mark.anyio
+async def test_create_and_cancel_order_from_template(client, client_id):
+    candles = await client.get_candles(
+        security_board="TQBR",
+        security_code="VTBR",
+        time_frame="M1",
+        count=1,
+        to=datetime.now(),
+    )
+    assert isinstance(candles, IntraDayCandles)
+    high_price_finam = candles.data.candles[0].high
+    high_price = high_price_finam.num * 10**-high_price_finam.scale
+    price = str(round(high_price * 1.03, high_price_finam.scale))
+
+    template = client.create_order_template(
+        client_id=client_id,
+        security_board="TQBR",
+        security_code="VTBR",
+        buy_sell="Buy",
+        use_condition=True,
+        condition_type="LastUp",
+        condition_price=price,
+    )
+    new_order = await template.send(quantity=1, price=price)
+    assert isinstance(new_order, NewOrder)
+    assert new_order.data is not None
+    assert new_order.error is None
+    assert new_order.data.client_id == client_id
+    await asyncio.sleep(1)  # Чтобы успела обработаться информация о заявках.
+
+    result = await client.cancel_order(
+        client_id=client_id, transaction_id=new_order.data.transaction_id
+    )
+    assert isinstance(result, CancelOrder)
+    assert result.error is None
+    assert result.data.transaction_id == new_order.data.transaction_id
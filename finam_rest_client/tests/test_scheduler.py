@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from finam_rest_client.models.response_models import Orders, Portfolio
+
+
+@pytest.mark.anyio
+async def test_scheduler_fan_out(client, client_id):
+    portfolios, orders = [], []
+    orders_received = asyncio.Event()
+
+    async def on_orders(result):
+        orders.append(result)
+        orders_received.set()
+
+    client.scheduler.subscribe(client_id, "portfolio", portfolios.append)
+    client.scheduler.subscribe(client_id, "orders", on_orders)
+    try:
+        await asyncio.wait_for(orders_received.wait(), 10)
+    finally:
+        client.scheduler.unsubscribe(client_id, "portfolio", portfolios.append)
+        client.scheduler.unsubscribe(client_id, "orders", on_orders)
+    assert len(portfolios) >= 1
+    assert isinstance(portfolios[0], Portfolio)
+    assert isinstance(orders[0], Orders)
+    assert orders[0].data.client_id == client_id
+
+
+@pytest.mark.anyio
+async def test_scheduler_interval_after_activity(client, client_id):
+    orders = []
+    client.scheduler.subscribe(client_id, "orders", orders.append)
+    try:
+        idle = client.scheduler.interval(client_id)
+        client.scheduler.notify_activity(client_id)
+        assert client.scheduler.interval(client_id) <= idle
+        for _ in range(100):
+            if orders:
+                break
+            await asyncio.sleep(0.1)
+    finally:
+        client.scheduler.unsubscribe(client_id, "orders", orders.append)
+    assert orders
+    assert isinstance(orders[0], Orders)
+    assert orders[0].data.client_id == client_id
@@ -0,0 +1,18 @@
+from finam_rest_client.models.response_models import Orders, Portfolio
+
+
+def test_sync_get_portfolio(sync_client, client_id):
+    result = sync_client.get_portfolio(client_id=client_id)
+    assert isinstance(result, Portfolio)
+    assert result.data.client_id == client_id
+
+
+def test_sync_batch(sync_client, client_id):
+    results = sync_client.batch(
+        [
+            ("get_portfolio", {"client_id": client_id}),
+            ("get_orders", {"client_id": client_id}),
+        ]
+    )
+    assert isinstance(results[0], Portfolio)
+    assert isinstance(results[1], Orders)
@@ -0,0 +1,74 @@
+from datetime import UTC, date, datetime, time, timedelta
+
+import pytest
+
+from finam_rest_client.clients.calendar import SessionCalendar
+from finam_rest_client.clients.windows import (
+    as_date,
+    as_datetime,
+    plan_intraday_windows,
+    plan_windows,
+)
+
+START = datetime(2024, 1, 2, tzinfo=UTC)
+
+
+def test_plan_windows():
+    assert list(plan_windows(date(2024, 1, 1), date(2024, 1, 10), 3)) == [
+        (date(2024, 1, 1), date(2024, 1, 4)),
+        (date(2024, 1, 5), date(2024, 1, 8)),
+        (date(2024, 1, 9), date(2024, 1, 10)),
+    ]
+
+
+def test_plan_windows_bounds():
+    day = date(2024, 1, 1)
+    assert list(plan_windows(day, day)) == [(day, day)]
+    assert list(plan_windows(day, day + timedelta(days=2), 0)) == [
+        (day + timedelta(days=n), day + timedelta(days=n)) for n in range(3)
+    ]
+    assert list(plan_windows(day, day - timedelta(days=1))) == []
+    with pytest.raises(ValueError):
+        list(plan_windows(day, day, -1))
+
+
+def test_plan_windows_skips_closed_days():
+    calendar = SessionCalendar("UTC")
+    # 6 и 7 января 2024 - выходные.
+    trading = [date(2024, 1, day) for day in (2, 3, 4, 5, 8, 9)]
+    calendar.observe_days(trading, date(2024, 1, 1), date(2024, 1, 9))
+    windows = plan_windows(date(2024, 1, 4), date(2024, 1, 9), 1, calendar)
+    assert list(windows) == [
+        (date(2024, 1, 4), date(2024, 1, 5)),
+        (date(2024, 1, 8), date(2024, 1, 9)),
+    ]
+
+
+def test_plan_intraday_windows():
+    to = START + timedelta(minutes=1199)
+    windows = list(plan_intraday_windows(START, to, "M1"))
+    assert windows == [
+        (START, START + timedelta(minutes=500, seconds=-1)),
+        (
+            START + timedelta(minutes=500),
+            START + timedelta(minutes=1000, seconds=-1),
+        ),
+        (START + timedelta(minutes=1000), to),
+    ]
+
+
+def test_plan_intraday_windows_step_by_time_frame():
+    to = START + timedelta(days=30)
+    windows = list(plan_intraday_windows(START, to, "H1"))
+    assert windows[0] == (START, START + timedelta(hours=500, seconds=-1))
+    assert windows[1] == (START + timedelta(hours=500), to)
+    assert list(plan_intraday_windows(START, START, "M5")) == [(START, START)]
+
+
+def test_as_date_and_datetime():
+    assert as_date(START) == date(2024, 1, 2)
+    assert as_date(date(2024, 1, 2)) == date(2024, 1, 2)
+    assert as_datetime(date(2024, 1, 2), time(23, 59, 59)) == START.replace(
+        hour=23, minute=59, second=59
+    )
+    assert as_datetime(START.replace(tzinfo=None), time.min) == START